@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Banc d'essai des étapes du pipeline ETL sur des données synthétiques
+
+Exemples:
+    python -m benchmarks.run_benchmarks --scales small medium --output baseline.json
+    python -m benchmarks.run_benchmarks --scales small medium --compare baseline.json
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.synthetic_data import write_dataset
+from etl.extractors.csv_extractor import CSVExtractor
+from etl.transformers.data_transformer import DataTransformer
+from etl.transformers.schema_transformer import SchemaTransformer
+from etl.loaders.csv_loader import CSVLoader
+from etl.utils.metrics import PipelineMetrics
+
+# Échelles: (pays, jours, provinces par pays)
+SCALES = {
+    'tiny': (10, 30, 2),
+    'small': (50, 180, 3),
+    'medium': (200, 500, 4),
+    'large': (500, 1000, 6)
+}
+
+COMPONENTS = [
+    'CSVExtractor',
+    'CovidTransformer.transform_covid_clean_complete',
+    'CovidTransformer.derive_daily_counts',
+    'CovidTransformer.transform_worldometer_covid',
+    'MonkeypoxTransformer.transform_monkeypox_data',
+    'SchemaTransformer.prepare_tables',
+    'CSVLoader',
+    'DBLoader'
+]
+
+def run_scale(scale, n_countries, n_days, n_provinces, work_dir, seed=0):
+    """
+    Mesure chaque composant du pipeline pour une échelle de données
+    
+    Args:
+        scale (str): Nom de l'échelle
+        n_countries (int): Nombre de pays
+        n_days (int): Nombre de jours
+        n_provinces (int): Nombre de provinces par pays
+        work_dir (str): Répertoire de travail
+        seed (int): Graine du générateur aléatoire
+        
+    Returns:
+        dict: Mesures par composant
+    """
+    input_dir = os.path.join(work_dir, scale, 'input')
+    output_dir = os.path.join(work_dir, scale, 'output')
+    input_files = write_dataset(input_dir, n_countries, n_days, n_provinces, seed)
+    
+    metrics = PipelineMetrics(trace_memory_stages=COMPONENTS)
+    
+    with metrics.measure('CSVExtractor') as record:
+        raw_dataframes = CSVExtractor().extract_data(input_files)
+        record['rows_out'] = sum(len(df) for _, df in raw_dataframes)
+    
+    transformer = DataTransformer()
+    transformed_dataframes = []
+    for df_name, df in raw_dataframes:
+        source = transformer.registry.detect(df_name, df.columns)
+        transformer_func = transformer.registry.get(source, 'transform')
+        with metrics.measure(transformer_func.__qualname__, rows_in=len(df)) as record:
+            df_transformed = transformer_func(df)
+            record['rows_out'] = len(df_transformed)
+        derive_func = transformer.registry.get(source, 'daily_counts')
+        if derive_func:
+            with metrics.measure(derive_func.__qualname__, rows_in=len(df_transformed)) as record:
+                df_transformed = derive_func(df_transformed)
+                record['rows_out'] = len(df_transformed)
+        transformed_dataframes.append((df_name, df_transformed))
+    
+    with metrics.measure('SchemaTransformer.prepare_tables') as record:
+        tables = SchemaTransformer().prepare_tables(transformed_dataframes)
+        record['rows_out'] = sum(len(df) for df in tables.values())
+    
+    with metrics.measure('CSVLoader') as record:
+        CSVLoader().save_tables(tables, output_dir)
+        record['rows_out'] = sum(len(df) for df in tables.values())
+    
+    try:
+        from etl.loaders.db_loader import DBLoader
+    except ImportError as e:
+        print(f"DBLoader non mesuré ({e})")
+    else:
+        # Base SQLite embarquée en mémoire, à la place d'un serveur MySQL
+        db_loader = DBLoader({'backend': 'sqlite', 'bulk_load': 'insert'})
+        with metrics.measure('DBLoader') as record:
+            record['rows_out'] = sum(db_loader.load_data(tables).values())
+    
+    return {
+        record['stage']: {
+            'rows_in': record['rows_in'],
+            'rows_out': record['rows_out'],
+            'wall_time': record['wall_time'],
+            'rows_per_sec': record['rows_per_sec'],
+            'peak_memory_mb': record.get('traced_peak_mb')
+        }
+        for record in metrics.records
+    }
+
+def compare(results, baseline, tolerance):
+    """
+    Compare les débits mesurés à ceux d'un fichier de référence
+    
+    Args:
+        results (dict): Mesures de l'exécution courante
+        baseline (dict): Mesures de référence
+        tolerance (float): Baisse relative de débit tolérée (0.2 = 20 %)
+        
+    Returns:
+        list: Régressions détectées (échelle, composant, ratio)
+    """
+    regressions = []
+    print("\n=== COMPARAISON AVEC LA RÉFÉRENCE ===")
+    for scale, components in results['scales'].items():
+        for component, current in components.items():
+            reference = baseline.get('scales', {}).get(scale, {}).get(component)
+            if not reference or not reference.get('rows_per_sec') or not current.get('rows_per_sec'):
+                continue
+            ratio = current['rows_per_sec'] / reference['rows_per_sec']
+            flag = ''
+            if ratio < 1 - tolerance:
+                regressions.append((scale, component, ratio))
+                flag = '  <-- RÉGRESSION'
+            print(f"  {scale:>6} {component:<50} x{ratio:.2f}{flag}")
+    return regressions
+
+def main():
+    """Point d'entrée du banc d'essai"""
+    parser = argparse.ArgumentParser(description="Banc d'essai du pipeline ETL sur données synthétiques")
+    parser.add_argument("--scales", nargs='+', default=['tiny', 'small'], choices=list(SCALES), help="Échelles à mesurer")
+    parser.add_argument("--output", type=str, default=None, help="Fichier JSON des mesures")
+    parser.add_argument("--compare", type=str, default=None, help="Fichier JSON de référence à comparer")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Baisse de débit tolérée avant de signaler une régression")
+    parser.add_argument("--seed", type=int, default=0, help="Graine du générateur de données")
+    parser.add_argument("--work-dir", type=str, default=None, help="Répertoire des fichiers générés (temporaire par défaut)")
+    args = parser.parse_args()
+    
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='etl_bench_')
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'seed': args.seed,
+        'scales': {}
+    }
+    try:
+        for scale in args.scales:
+            n_countries, n_days, n_provinces = SCALES[scale]
+            print(f"\n=== ÉCHELLE {scale}: {n_countries} pays x {n_days} jours x {n_provinces} provinces ===")
+            results['scales'][scale] = run_scale(scale, n_countries, n_days, n_provinces, work_dir, args.seed)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    
+    print("\n=== RÉSULTATS ===")
+    for scale, components in results['scales'].items():
+        for component, record in components.items():
+            throughput = f"{record['rows_per_sec']:>12.0f} lignes/s" if record['rows_per_sec'] else ''
+            memory = f"{record['peak_memory_mb']:>8.1f} Mo" if record['peak_memory_mb'] is not None else ''
+            print(f"  {scale:>6} {component:<50} {record['wall_time']:>8.3f} s {throughput} {memory}")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+        print(f"\nMesures sauvegardées: {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Génération de données épidémiologiques synthétiques au format des fichiers sources
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+COVID_CLEAN_FILE = 'covid_19_clean_complete.csv'
+WORLDOMETER_FILE = 'worldometer_coronavirus_daily_data.csv'
+MONKEYPOX_FILE = 'owid-monkeypox-data.csv'
+
+WHO_REGIONS = ['Europe', 'Americas', 'Eastern Mediterranean', 'Western Pacific', 'Africa', 'South-East Asia']
+
+def _country_names(n_countries):
+    """Retourne des noms de pays synthétiques (les premiers sont des pays connus)"""
+    known = ['US', 'China', 'France', 'Germany', 'Italy', 'Spain', 'Brazil', 'India',
+             'Japan', 'Canada', 'Mexico', 'Nigeria', 'Egypt', 'Australia', 'Russia']
+    return (known + [f"Country {i:04d}" for i in range(len(known), n_countries)])[:n_countries]
+
+def _cumulative(rng, n_series, n_days, daily_max):
+    """
+    Génère des séries cumulées croissantes (une ligne par série)
+    
+    Returns:
+        tuple: (valeurs journalières, valeurs cumulées), tableaux (n_series, n_days)
+    """
+    daily = rng.integers(0, daily_max, size=(n_series, n_days))
+    return daily, daily.cumsum(axis=1)
+
+def generate_covid_clean(n_countries, n_days, n_provinces, start_date='2020-01-22', seed=0):
+    """
+    Génère un DataFrame au format de covid_19_clean_complete.csv (trié par date)
+    
+    Args:
+        n_countries (int): Nombre de pays
+        n_days (int): Nombre de jours
+        n_provinces (int): Nombre de provinces par pays (0 = ligne nationale seule)
+        start_date (str): Première date
+        seed (int): Graine du générateur aléatoire
+        
+    Returns:
+        DataFrame: Données synthétiques
+    """
+    rng = np.random.default_rng(seed)
+    countries = _country_names(n_countries)
+    provinces = [np.nan] if n_provinces == 0 else [f"Province {i}" for i in range(n_provinces)]
+    n_series = n_countries * len(provinces)
+    
+    daily, confirmed = _cumulative(rng, n_series, n_days, 500)
+    deaths = confirmed // rng.integers(20, 60, size=(n_series, 1))
+    recovered = confirmed // 2
+    dates = pd.date_range(start_date, periods=n_days).strftime('%Y-%m-%d')
+    
+    # Ordre du fichier d'origine: par date, puis par pays et province
+    series_country = np.repeat(np.array(countries, dtype=object), len(provinces))
+    series_province = np.tile(np.array(provinces, dtype=object), n_countries)
+    df = pd.DataFrame({
+        'Province/State': np.tile(series_province, n_days),
+        'Country/Region': np.tile(series_country, n_days),
+        'Lat': np.round(np.tile(rng.uniform(-60, 70, n_series), n_days), 4),
+        'Long': np.round(np.tile(rng.uniform(-180, 180, n_series), n_days), 4),
+        'Date': np.repeat(np.asarray(dates), n_series),
+        'Confirmed': confirmed.T.ravel(),
+        'Deaths': deaths.T.ravel(),
+        'Recovered': recovered.T.ravel(),
+        'Active': (confirmed - deaths - recovered).T.ravel(),
+        'WHO Region': np.tile(np.array(WHO_REGIONS, dtype=object)[np.arange(n_series) % len(WHO_REGIONS)], n_days)
+    })
+    return df
+
+def generate_worldometer(n_countries, n_days, start_date='2020-02-15', seed=1):
+    """
+    Génère un DataFrame au format de worldometer_coronavirus_daily_data.csv
+    
+    Args:
+        n_countries (int): Nombre de pays
+        n_days (int): Nombre de jours
+        start_date (str): Première date
+        seed (int): Graine du générateur aléatoire
+        
+    Returns:
+        DataFrame: Données synthétiques (triées par pays puis date)
+    """
+    rng = np.random.default_rng(seed)
+    countries = _country_names(n_countries)
+    
+    new_cases, total_cases = _cumulative(rng, n_countries, n_days, 2000)
+    new_deaths, total_deaths = _cumulative(rng, n_countries, n_days, 40)
+    dates = pd.date_range(start_date, periods=n_days).strftime('%Y-%m-%d')
+    
+    df = pd.DataFrame({
+        'date': np.tile(np.asarray(dates), n_countries),
+        'country': np.repeat(np.array(countries, dtype=object), n_days),
+        'cumulative_total_cases': total_cases.ravel().astype(float),
+        'daily_new_cases': new_cases.ravel().astype(float),
+        'active_cases': (total_cases - total_deaths).ravel().astype(float),
+        'cumulative_total_deaths': total_deaths.ravel().astype(float),
+        'daily_new_deaths': new_deaths.ravel().astype(float)
+    })
+    # Valeurs manquantes comme dans la source
+    missing = rng.random(len(df)) < 0.02
+    df.loc[missing, 'daily_new_deaths'] = np.nan
+    return df
+
+def generate_monkeypox(n_countries, n_days, start_date='2022-05-01', seed=2):
+    """
+    Génère un DataFrame au format de owid-monkeypox-data.csv
+    
+    Args:
+        n_countries (int): Nombre de pays
+        n_days (int): Nombre de jours
+        start_date (str): Première date
+        seed (int): Graine du générateur aléatoire
+        
+    Returns:
+        DataFrame: Données synthétiques (triées par pays puis date)
+    """
+    rng = np.random.default_rng(seed)
+    countries = _country_names(n_countries)
+    
+    new_cases, total_cases = _cumulative(rng, n_countries, n_days, 20)
+    new_deaths, total_deaths = _cumulative(rng, n_countries, n_days, 2)
+    population = rng.integers(1_000_000, 300_000_000, size=(n_countries, 1))
+    smoothed = pd.DataFrame(new_cases.T).rolling(7, min_periods=1).mean().to_numpy().T
+    smoothed_deaths = pd.DataFrame(new_deaths.T).rolling(7, min_periods=1).mean().to_numpy().T
+    dates = pd.date_range(start_date, periods=n_days).strftime('%Y-%m-%d')
+    
+    df = pd.DataFrame({
+        'location': np.repeat(np.array(countries, dtype=object), n_days),
+        'date': np.tile(np.asarray(dates), n_countries),
+        'iso_code': np.repeat(np.array([f"X{i:02d}"[:3] for i in range(n_countries)], dtype=object), n_days),
+        'total_cases': total_cases.ravel().astype(float),
+        'total_deaths': total_deaths.ravel().astype(float),
+        'new_cases': new_cases.ravel().astype(float),
+        'new_deaths': new_deaths.ravel().astype(float),
+        'new_cases_smoothed': smoothed.ravel(),
+        'new_deaths_smoothed': smoothed_deaths.ravel(),
+        'new_cases_per_million': (new_cases / population * 1e6).ravel(),
+        'total_cases_per_million': (total_cases / population * 1e6).ravel(),
+        'new_cases_smoothed_per_million': (smoothed / population * 1e6).ravel(),
+        'new_deaths_smoothed_per_million': (smoothed_deaths / population * 1e6).ravel(),
+        'total_deaths_per_million': (total_deaths / population * 1e6).ravel(),
+        'new_deaths_per_million': (new_deaths / population * 1e6).ravel()
+    })
+    return df
+
+def write_dataset(output_dir, n_countries, n_days, n_provinces, seed=0):
+    """
+    Écrit les trois fichiers sources synthétiques dans un répertoire
+    
+    Args:
+        output_dir (str): Répertoire de sortie
+        n_countries (int): Nombre de pays
+        n_days (int): Nombre de jours
+        n_provinces (int): Nombre de provinces par pays pour covid_19_clean_complete
+        seed (int): Graine du générateur aléatoire
+        
+    Returns:
+        list: Chemins des fichiers écrits
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    frames = {
+        COVID_CLEAN_FILE: generate_covid_clean(n_countries, n_days, n_provinces, seed=seed),
+        WORLDOMETER_FILE: generate_worldometer(n_countries, n_days, seed=seed + 1),
+        MONKEYPOX_FILE: generate_monkeypox(n_countries, n_days, seed=seed + 2)
+    }
+    paths = []
+    for file_name, df in frames.items():
+        path = os.path.join(output_dir, file_name)
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
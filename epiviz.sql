@@ -39,6 +39,7 @@ CREATE TABLE IF NOT EXISTS `data` (
   `id_pandemie` int(30) NOT NULL,
   `id_calendar` int(30) NOT NULL,
   PRIMARY KEY (`id`),
+  UNIQUE KEY `data_location_pandemie_calendar` (`id_location`,`id_pandemie`,`id_calendar`),
   KEY `id_pandemie` (`id_pandemie`),
   KEY `id_localisation` (`id_location`) USING BTREE,
   KEY `id_calendrier` (`id_calendar`) USING BTREE,
@@ -68,6 +69,76 @@ CREATE TABLE IF NOT EXISTS `pandemie` (
 
 -- Les données exportées n'étaient pas sélectionnées.
 
+-- Listage de la structure de table epiviz. rollup_week
+CREATE TABLE IF NOT EXISTS `rollup_week` (
+  `id_location` int(30) NOT NULL,
+  `id_pandemie` int(30) NOT NULL,
+  `week` int(11) NOT NULL,
+  `total_cases` int(30) NOT NULL,
+  `total_deaths` int(30) NOT NULL,
+  `new_cases` int(30) NOT NULL,
+  `new_deaths` int(30) NOT NULL,
+  `days` int(11) NOT NULL,
+  PRIMARY KEY (`id_location`,`id_pandemie`,`week`),
+  KEY `rollup_week_pandemie` (`id_pandemie`,`week`),
+  CONSTRAINT `rollup_week_localisation` FOREIGN KEY (`id_location`) REFERENCES `location` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION,
+  CONSTRAINT `rollup_week_pandemie` FOREIGN KEY (`id_pandemie`) REFERENCES `pandemie` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Les données exportées n'étaient pas sélectionnées.
+
+-- Listage de la structure de table epiviz. rollup_month
+CREATE TABLE IF NOT EXISTS `rollup_month` (
+  `id_location` int(30) NOT NULL,
+  `id_pandemie` int(30) NOT NULL,
+  `month` int(11) NOT NULL,
+  `total_cases` int(30) NOT NULL,
+  `total_deaths` int(30) NOT NULL,
+  `new_cases` int(30) NOT NULL,
+  `new_deaths` int(30) NOT NULL,
+  `days` int(11) NOT NULL,
+  PRIMARY KEY (`id_location`,`id_pandemie`,`month`),
+  KEY `rollup_month_pandemie` (`id_pandemie`,`month`),
+  CONSTRAINT `rollup_month_localisation` FOREIGN KEY (`id_location`) REFERENCES `location` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION,
+  CONSTRAINT `rollup_month_pandemie` FOREIGN KEY (`id_pandemie`) REFERENCES `pandemie` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Les données exportées n'étaient pas sélectionnées.
+
+-- Listage de la structure de table epiviz. rollup_continent
+CREATE TABLE IF NOT EXISTS `rollup_continent` (
+  `continent` char(50) NOT NULL,
+  `id_pandemie` int(30) NOT NULL,
+  `id_calendar` int(30) NOT NULL,
+  `total_cases` bigint(20) NOT NULL,
+  `total_deaths` bigint(20) NOT NULL,
+  `new_cases` bigint(20) NOT NULL,
+  `new_deaths` bigint(20) NOT NULL,
+  PRIMARY KEY (`continent`,`id_pandemie`,`id_calendar`),
+  KEY `rollup_continent_calendrier` (`id_calendar`),
+  CONSTRAINT `rollup_continent_calendrier` FOREIGN KEY (`id_calendar`) REFERENCES `calendar` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION,
+  CONSTRAINT `rollup_continent_pandemie` FOREIGN KEY (`id_pandemie`) REFERENCES `pandemie` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Les données exportées n'étaient pas sélectionnées.
+
+-- Listage de la structure de table epiviz. rollup_pandemie
+CREATE TABLE IF NOT EXISTS `rollup_pandemie` (
+  `id_pandemie` int(30) NOT NULL,
+  `id_calendar` int(30) NOT NULL,
+  `total_cases` bigint(20) NOT NULL,
+  `total_deaths` bigint(20) NOT NULL,
+  `new_cases` bigint(20) NOT NULL,
+  `new_deaths` bigint(20) NOT NULL,
+  `countries` int(11) NOT NULL,
+  PRIMARY KEY (`id_pandemie`,`id_calendar`),
+  KEY `rollup_pandemie_calendrier` (`id_calendar`),
+  CONSTRAINT `rollup_pandemie_calendrier` FOREIGN KEY (`id_calendar`) REFERENCES `calendar` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION,
+  CONSTRAINT `rollup_pandemie_pandemie` FOREIGN KEY (`id_pandemie`) REFERENCES `pandemie` (`id`) ON DELETE NO ACTION ON UPDATE NO ACTION
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- Les données exportées n'étaient pas sélectionnées.
+
 /*!40103 SET TIME_ZONE=IFNULL(@OLD_TIME_ZONE, 'system') */;
 /*!40101 SET SQL_MODE=IFNULL(@OLD_SQL_MODE, '') */;
 /*!40014 SET FOREIGN_KEY_CHECKS=IFNULL(@OLD_FOREIGN_KEY_CHECKS, 1) */;
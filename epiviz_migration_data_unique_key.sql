@@ -0,0 +1,24 @@
+-- --------------------------------------------------------
+-- Migration des bases epiviz créées avant le chargement par fusion
+--
+-- epiviz.sql crée les tables avec CREATE TABLE IF NOT EXISTS: une base
+-- existante ne reçoit pas la clé unique data_location_pandemie_calendar de
+-- la table data, sans laquelle le chargement par fusion (load_mode "merge")
+-- insérerait les faits en double. Le chargeur vérifie la clé et, si elle
+-- manque, vide puis recharge les tables.
+--
+-- Les faits en double (même pays, pandémie et date) sont d'abord supprimés
+-- en conservant la ligne la plus récente (id le plus grand), puis la clé
+-- unique est ajoutée.
+-- --------------------------------------------------------
+
+USE `epiviz`;
+
+DELETE `d` FROM `data` `d`
+  JOIN `data` `k`
+    ON `k`.`id_location` = `d`.`id_location`
+   AND `k`.`id_pandemie` = `d`.`id_pandemie`
+   AND `k`.`id_calendar` = `d`.`id_calendar`
+   AND `k`.`id` > `d`.`id`;
+
+ALTER TABLE `data` ADD UNIQUE KEY `data_location_pandemie_calendar` (`id_location`,`id_pandemie`,`id_calendar`);
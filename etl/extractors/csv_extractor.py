@@ -6,30 +6,177 @@ Module d'extraction des données CSV pour le processus ETL
 """
 
 import os
+import json
 import pandas as pd
+from etl.utils.file_formats import read_table, write_table
 
 class CSVExtractor:
     """Classe responsable de l'extraction des données à partir de fichiers CSV"""
     
+    def __init__(self, cache_dir=None, schema_provider=None):
+        """
+        Initialise l'extracteur
+        
+        Args:
+            cache_dir (str): Répertoire du cache Feather des fichiers sources
+                (None pour désactiver le cache)
+            schema_provider (callable): Fonction retournant le schéma de lecture
+                d'un fichier à partir de son chemin (DataTransformer.get_read_schema)
+        """
+        self.cache_dir = cache_dir
+        self.schema_provider = schema_provider
+    
     @staticmethod
-    def extract_file(file_path):
+    def extract_file(file_path, read_schema=None):
         """
         Extrait les données d'un fichier CSV
         
         Args:
             file_path (str): Chemin du fichier CSV à extraire
+            read_schema (dict): Arguments de lecture (usecols, dtype, parse_dates);
+                si le fichier ne correspond pas au schéma, il est lu entièrement
             
         Returns:
             DataFrame: DataFrame pandas contenant les données extraites
         """
         try:
-            df = pd.read_csv(file_path)
+            if read_schema:
+                try:
+                    df = pd.read_csv(file_path, **read_schema)
+                except (ValueError, TypeError) as e:
+                    # Colonnes absentes, ou valeur non entière dans une colonne Int32/Int64
+                    print(f"Schéma de lecture non applicable à {file_path} ({e}), lecture complète")
+                    df = pd.read_csv(file_path)
+            else:
+                df = pd.read_csv(file_path)
             print(f"Extraction réussie: {file_path}, {len(df)} lignes")
             return df
         except Exception as e:
             print(f"Erreur lors de l'extraction de {file_path}: {e}")
             return pd.DataFrame()
     
+    def get_read_schema(self, file_path):
+        """
+        Retourne le schéma de lecture d'un fichier
+        
+        Args:
+            file_path (str): Chemin du fichier CSV
+            
+        Returns:
+            dict: Arguments de lecture ou None
+        """
+        if self.schema_provider is None:
+            return None
+        return self.schema_provider(file_path)
+    
+    def extract_file_cached(self, file_path, read_schema=None):
+        """
+        Extrait un fichier CSV en réutilisant sa copie Feather si le fichier
+        n'a pas changé (même taille et même date de modification) et qu'il
+        a été lu avec le même schéma
+        
+        Args:
+            file_path (str): Chemin du fichier CSV à extraire
+            read_schema (dict): Arguments de lecture
+            
+        Returns:
+            DataFrame: DataFrame pandas contenant les données extraites
+        """
+        file_name = os.path.basename(file_path)
+        cache_path = os.path.join(self.cache_dir, f"{file_name}.feather")
+        meta_path = os.path.join(self.cache_dir, f"{file_name}.json")
+        
+        try:
+            stat = os.stat(file_path)
+            signature = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'schema': repr(read_schema)}
+        except OSError as e:
+            print(f"Erreur lors de l'extraction de {file_path}: {e}")
+            return pd.DataFrame()
+        
+        try:
+            if os.path.exists(cache_path) and os.path.exists(meta_path):
+                with open(meta_path, 'r') as f:
+                    if json.load(f) == signature:
+                        df = read_table(cache_path, 'feather')
+                        print(f"Extraction depuis le cache: {file_path}, {len(df)} lignes")
+                        return df
+        except Exception as e:
+            print(f"Cache illisible pour {file_path}: {e}")
+        
+        df = self.extract_file(file_path, read_schema)
+        if not df.empty:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                write_table(df, cache_path, 'feather')
+                with open(meta_path, 'w') as f:
+                    json.dump(signature, f)
+            except Exception as e:
+                print(f"Impossible de mettre en cache {file_path}: {e}")
+        return df
+    
+    @staticmethod
+    def extract_file_chunks(file_path, chunk_size, read_schema=None):
+        """
+        Extrait les données d'un fichier CSV par blocs de taille fixe
+        
+        Comme pour extract_file, si un bloc ne correspond pas au schéma de
+        lecture, la suite du fichier est lue entièrement, à partir de la
+        première ligne non encore transmise. Un fichier illisible est ignoré,
+        mais une erreur de lecture après les premiers blocs est relancée.
+        
+        Args:
+            file_path (str): Chemin du fichier CSV à extraire
+            chunk_size (int): Nombre de lignes par bloc
+            read_schema (dict): Arguments de lecture (usecols, dtype, parse_dates)
+            
+        Yields:
+            DataFrame: Bloc de lignes du fichier
+        """
+        try:
+            row_count = 0
+            offset = 0
+            schema = read_schema or {}
+            while True:
+                try:
+                    reader = pd.read_csv(
+                        file_path, chunksize=chunk_size,
+                        skiprows=range(1, offset + 1) if offset else None, **schema
+                    )
+                    for chunk in reader:
+                        if offset:
+                            chunk.index += offset
+                        row_count += len(chunk)
+                        yield chunk
+                    break
+                except (ValueError, TypeError) as e:
+                    if not schema:
+                        raise
+                    print(f"Schéma de lecture non applicable à {file_path} ({e}), lecture complète à partir de la ligne {row_count + 1}")
+                    schema = {}
+                    offset = row_count
+            print(f"Extraction réussie: {file_path}, {row_count} lignes")
+        except Exception as e:
+            print(f"Erreur lors de l'extraction de {file_path}: {e}")
+            if row_count:
+                # Des blocs ont déjà été transmis: l'exécution doit échouer plutôt
+                # que traiter le fichier comme complet
+                raise
+    
+    def extract_data_chunks(self, input_files, chunk_size):
+        """
+        Extrait les données de plusieurs fichiers CSV par blocs
+        
+        Args:
+            input_files (list): Liste des chemins de fichiers CSV
+            chunk_size (int): Nombre de lignes par bloc
+            
+        Yields:
+            tuple: (nom_fichier, générateur de blocs)
+        """
+        for file_path in input_files:
+            file_name = os.path.basename(file_path)
+            yield file_name, self.extract_file_chunks(file_path, chunk_size, self.get_read_schema(file_path))
+    
     def extract_data(self, input_files):
         """
         Extrait les données de plusieurs fichiers CSV
@@ -44,7 +191,11 @@ class CSVExtractor:
         
         for file_path in input_files:
             file_name = os.path.basename(file_path)
-            df = self.extract_file(file_path)
+            read_schema = self.get_read_schema(file_path)
+            if self.cache_dir:
+                df = self.extract_file_cached(file_path, read_schema)
+            else:
+                df = self.extract_file(file_path, read_schema)
             
             if not df.empty:
                 dataframes.append((file_name, df))
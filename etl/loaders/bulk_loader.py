@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de chargement en masse des tables dans la base de données
+"""
+
+import os
+import csv
+import tempfile
+from etl.loaders.db_errors import Error
+from etl.loaders.db_connection import CONNECTION_ERRORS
+
+# Colonnes chargées pour chaque table, dans l'ordre du schéma epiviz.sql
+TABLE_COLUMNS = {
+    'calendar': ['id', 'date_value'],
+    'location': ['id', 'country', 'continent'],
+    'pandemie': ['id', 'type'],
+    'data': [
+        'id', 'total_cases', 'total_deaths', 'new_cases', 'new_deaths',
+        'id_location', 'id_pandemie', 'id_calendar'
+    ],
+    'rollup_week': [
+        'id_location', 'id_pandemie', 'week', 'total_cases', 'total_deaths',
+        'new_cases', 'new_deaths', 'days'
+    ],
+    'rollup_month': [
+        'id_location', 'id_pandemie', 'month', 'total_cases', 'total_deaths',
+        'new_cases', 'new_deaths', 'days'
+    ],
+    'rollup_continent': [
+        'continent', 'id_pandemie', 'id_calendar', 'total_cases', 'total_deaths',
+        'new_cases', 'new_deaths'
+    ],
+    'rollup_pandemie': [
+        'id_pandemie', 'id_calendar', 'total_cases', 'total_deaths',
+        'new_cases', 'new_deaths', 'countries'
+    ]
+}
+
+class BulkLoader:
+    """Classe responsable du chargement en masse d'une table (LOAD DATA ou INSERT multi-lignes)"""
+    
+    @staticmethod
+    def import_table(db_connection, table_name, df, method='infile', rows_per_statement=5000):
+        """
+        Importe une table complète et valide la transaction une seule fois
+        
+        Si le serveur refuse LOAD DATA LOCAL INFILE, la table est chargée par
+        INSERT multi-lignes.
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+            df (DataFrame): DataFrame contenant les données
+            method (str): 'infile' pour LOAD DATA LOCAL INFILE, 'insert' pour INSERT multi-lignes
+            rows_per_statement (int): Nombre de lignes par instruction INSERT
+            
+        Returns:
+            int: Nombre de lignes importées
+        """
+        columns = [col for col in TABLE_COLUMNS.get(table_name, list(df.columns)) if col in df.columns]
+        
+        def load():
+            count = None
+            if db_connection.embedded:
+                count = db_connection.insert_frame(table_name, df, columns)
+            elif method == 'infile':
+                count = BulkLoader.load_infile(db_connection, table_name, df, columns)
+            if count is None:
+                count = BulkLoader.insert_multirow(
+                    db_connection, table_name, df, columns, rows_per_statement)
+            
+            db_connection.commit()
+            return count
+        
+        try:
+            # La table entière est rejouée si la connexion est perdue; si elle est
+            # perdue pendant la validation, ses ids sont d'abord supprimés
+            replay_range = (table_name, df['id'].min(), df['id'].max()) if 'id' in df.columns and len(df) else None
+            count = db_connection.run_with_retry(load, replay_range=replay_range)
+            print(f"{count} lignes importées dans {table_name}")
+            return count
+        except Error as e:
+            db_connection.conn.rollback()
+            print(f"Erreur lors de l'importation dans {table_name}: {e}")
+            return 0
+    
+    @staticmethod
+    def load_infile(db_connection, table_name, df, columns):
+        """
+        Écrit la table dans un fichier TSV intermédiaire et la charge par LOAD DATA LOCAL INFILE
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+            df (DataFrame): DataFrame contenant les données
+            columns (list): Colonnes à charger
+            
+        Returns:
+            int: Nombre de lignes importées, ou None si le serveur refuse LOAD DATA LOCAL
+        """
+        fd, staging_path = tempfile.mkstemp(prefix=f"epiviz_{table_name}_", suffix='.tsv')
+        os.close(fd)
+        try:
+            df[columns].to_csv(
+                staging_path, sep='\t', header=False, index=False, na_rep='NULL',
+                quoting=csv.QUOTE_MINIMAL, lineterminator='\n'
+            )
+            query = (
+                f"LOAD DATA LOCAL INFILE '{staging_path.replace(os.sep, '/')}' "
+                f"INTO TABLE {table_name} CHARACTER SET utf8mb4 "
+                "FIELDS TERMINATED BY '\\t' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+                "LINES TERMINATED BY '\\n' "
+                f"({', '.join(columns)})"
+            )
+            db_connection.cursor.execute(query)
+            return len(df)
+        except CONNECTION_ERRORS:
+            raise
+        except Error as e:
+            print(f"LOAD DATA LOCAL INFILE indisponible pour {table_name} ({e}), utilisation d'INSERT multi-lignes")
+            return None
+        finally:
+            os.remove(staging_path)
+    
+    @staticmethod
+    def insert_multirow(db_connection, table_name, df, columns, rows_per_statement=5000):
+        """
+        Charge une table par instructions INSERT de plusieurs milliers de lignes
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+            df (DataFrame): DataFrame contenant les données
+            columns (list): Colonnes à charger
+            rows_per_statement (int): Nombre de lignes par instruction
+            
+        Returns:
+            int: Nombre de lignes importées
+        """
+        # Conversion en types Python natifs en une seule passe
+        frame = df[columns].astype(object)
+        values = frame.where(frame.notna(), None).to_numpy()
+        
+        placeholders = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        prefix = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES "
+        
+        total_rows = len(values)
+        for i in range(0, total_rows, rows_per_statement):
+            batch = values[i:i + rows_per_statement]
+            query = prefix + ', '.join([placeholders] * len(batch))
+            db_connection.cursor.execute(query, batch.ravel().tolist())
+        
+        return total_rows
@@ -7,10 +7,48 @@ Module de chargement des données vers des fichiers CSV
 
 import os
 import pandas as pd
+from etl.utils.file_formats import FORMAT_EXTENSIONS, write_table
+from etl.utils.column_store import ColumnStore
+
+# Répertoire du stockage en colonnes de la table data, dans le répertoire de sortie
+DATA_STORE_DIR = "data_store"
 
 class CSVLoader:
     """Classe responsable du chargement des données vers des fichiers CSV"""
     
+    def __init__(self, output_format='csv', format_options=None, data_store=False):
+        """
+        Initialise le chargeur de fichiers
+        
+        Args:
+            output_format (str): Format des tables écrites: 'csv', 'parquet' ou 'feather'
+            format_options (dict): Options du format (compression, row_group_size)
+            data_store (bool): Écrit aussi la table data dans un stockage en
+                colonnes projeté en mémoire (voir ColumnStore)
+        """
+        self.output_format = output_format
+        self.format_options = format_options or {}
+        self.data_store = data_store
+    
+    def open_data_store(self, output_dir, reset=False):
+        """
+        Ouvre le stockage en colonnes de la table data
+        
+        Args:
+            output_dir (str): Répertoire de sortie
+            reset (bool): Vide le stockage existant
+            
+        Returns:
+            ColumnStore: Stockage ouvert, ou None s'il n'est pas activé ou
+                n'a pas pu être vidé
+        """
+        if not self.data_store:
+            return None
+        store = ColumnStore(os.path.join(output_dir, DATA_STORE_DIR))
+        if reset and not store.reset():
+            return None
+        return store
+    
     @staticmethod
     def save_to_csv(df, output_path, index=False):
         """
@@ -36,6 +74,27 @@ class CSVLoader:
             print(f"Erreur lors de la sauvegarde de {output_path}: {e}")
             return False
     
+    @staticmethod
+    def append_to_csv(df, output_path, header=False):
+        """
+        Ajoute un DataFrame à la fin d'un fichier CSV
+        
+        Args:
+            df (DataFrame): DataFrame pandas à ajouter
+            output_path (str): Chemin du fichier CSV de sortie
+            header (bool): Indique si l'en-tête doit être écrit (premier bloc)
+            
+        Returns:
+            bool: True si l'écriture a réussi, False sinon
+        """
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            df.to_csv(output_path, mode='w' if header else 'a', header=header, index=False)
+            return True
+        except Exception as e:
+            print(f"Erreur lors de l'écriture dans {output_path}: {e}")
+            return False
+    
     @staticmethod
     def save_tables_to_csv(tables_dict, output_dir='./processed'):
         """
@@ -59,3 +118,32 @@ class CSVLoader:
                 output_paths[table_name] = output_path
         
         return output_paths
+    
+    def save_tables(self, tables_dict, output_dir='./processed'):
+        """
+        Sauvegarde plusieurs DataFrames dans le format de sortie configuré
+        
+        Args:
+            tables_dict (dict): Dictionnaire de DataFrames à sauvegarder
+            output_dir (str): Répertoire de sortie
+            
+        Returns:
+            dict: Dictionnaire des chemins de fichiers sauvegardés
+        """
+        if self.output_format == 'csv':
+            return CSVLoader.save_tables_to_csv(tables_dict, output_dir)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        
+        output_paths = {}
+        extension = FORMAT_EXTENSIONS.get(self.output_format, '')
+        for table_name, df in tables_dict.items():
+            output_path = os.path.join(output_dir, f"sql_{table_name}{extension}")
+            try:
+                write_table(df, output_path, self.output_format, self.format_options)
+                print(f"Sauvegarde réussie: {output_path}, {len(df)} lignes")
+                output_paths[table_name] = output_path
+            except Exception as e:
+                print(f"Erreur lors de la sauvegarde de {output_path}: {e}")
+        
+        return output_paths
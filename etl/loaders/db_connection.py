@@ -5,32 +5,129 @@
 Module de gestion des connexions à la base de données
 """
 
-import mysql.connector
-from mysql.connector import Error
+import time
+import threading
+from etl.loaders.db_errors import Error, InterfaceError, OperationalError, PoolError
+
+# Clés de configuration propres au pipeline, non transmises à mysql.connector
+LOADER_OPTIONS = (
+    'batch_size', 'bulk_load', 'rows_per_statement',
+    'pool_size', 'pool_timeout', 'max_retries', 'retry_delay',
+    'load_workers', 'schema_file', 'load_mode', 'backend'
+)
+
+# Erreurs indiquant une connexion perdue (délai du serveur dépassé, serveur redémarré...)
+CONNECTION_ERRORS = (OperationalError, InterfaceError)
 
 class DBConnection:
     """Classe responsable de la gestion des connexions à la base de données"""
     
+    # Base embarquée (voir EmbeddedConnection): les tables sont insérées par insert_frame
+    embedded = False
+    
+    # Pools de connexions partagés, par nom de pool
+    _pools = {}
+    _pools_lock = threading.Lock()
+    
     def __init__(self, db_config):
         """
         Initialise la connexion à la base de données
         
         Args:
-            db_config (dict): Configuration de la base de données
+            db_config (dict): Configuration de la base de données. Les clés
+                pool_size (0 = sans pool), pool_timeout, max_retries et
+                retry_delay règlent le pool et les reprises.
         """
         self.db_config = db_config
         self.conn = None
         self.cursor = None
+        self.pool_size = db_config.get('pool_size', 0)
+        self.pool_timeout = db_config.get('pool_timeout', 30)
+        self.max_retries = db_config.get('max_retries', 3)
+        self.retry_delay = db_config.get('retry_delay', 1)
+        self.bulk_session = False
+        self.committing = False
+    
+    def _connect_args(self):
+        """
+        Retourne les paramètres de connexion transmis à mysql.connector
+        
+        Returns:
+            dict: Paramètres de connexion
+        """
+        connect_args = {
+            key: value for key, value in self.db_config.items()
+            if key not in LOADER_OPTIONS
+        }
+        if self.db_config.get('bulk_load') == 'infile':
+            connect_args.setdefault('allow_local_infile', True)
+        return connect_args
+    
+    def _get_pool(self):
+        """
+        Retourne le pool de connexions de cette configuration, créé au premier appel
+        
+        Returns:
+            MySQLConnectionPool: Pool de connexions partagé
+        """
+        from mysql.connector import pooling
+        
+        connect_args = self._connect_args()
+        pool_name = connect_args.pop('pool_name', None) or "epiviz_{}_{}".format(
+            connect_args.get('host', 'localhost'), connect_args.get('database', ''))
+        with DBConnection._pools_lock:
+            if pool_name not in DBConnection._pools:
+                DBConnection._pools[pool_name] = pooling.MySQLConnectionPool(
+                    pool_name=pool_name,
+                    pool_size=self.pool_size,
+                    pool_reset_session=True,
+                    **connect_args
+                )
+                print(f"Pool de {self.pool_size} connexions créé: {pool_name}")
+            return DBConnection._pools[pool_name]
+    
+    def _checkout_pooled(self):
+        """
+        Emprunte une connexion au pool, en attendant qu'une connexion se libère
+        
+        Returns:
+            PooledMySQLConnection: Connexion vérifiée
+        """
+        pool = self._get_pool()
+        deadline = time.monotonic() + self.pool_timeout
+        while True:
+            try:
+                conn = pool.get_connection()
+                break
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+        
+        # Vérification de la connexion empruntée, reconnexion si elle a expiré
+        conn.ping(reconnect=True, attempts=self.max_retries, delay=self.retry_delay)
+        return conn
     
     def connect(self):
         """
-        Établit la connexion à la base de données
+        Établit la connexion à la base de données (empruntée au pool si
+        pool_size est configuré)
         
         Returns:
             bool: True si la connexion a réussi, False sinon
         """
         try:
-            self.conn = mysql.connector.connect(**self.db_config)
+            # Pilote MySQL importé à la connexion: la base embarquée s'en passe
+            import mysql.connector
+        except ImportError as e:
+            print(f"Pilote MySQL indisponible ({e})")
+            return False
+        
+        try:
+            if self.pool_size:
+                self.conn = self._checkout_pooled()
+            else:
+                self.conn = mysql.connector.connect(**self._connect_args())
             if self.conn.is_connected():
                 self.cursor = self.conn.cursor()
                 print("Connexion à la base de données MySQL établie")
@@ -40,13 +137,105 @@ class DBConnection:
             print(f"Erreur lors de la connexion à MySQL: {e}")
             return False
     
+    def checkout(self):
+        """
+        Ouvre une connexion supplémentaire avec la même configuration, pour
+        qu'un autre chargeur travaille en même temps que celle-ci
+        
+        Returns:
+            DBConnection: Nouvelle connexion établie, ou None en cas d'échec
+        """
+        connection = DBConnection(self.db_config)
+        if connection.connect():
+            return connection
+        return None
+    
     def disconnect(self):
-        """Ferme la connexion à la base de données"""
+        """Ferme la connexion à la base de données (ou la rend au pool)"""
         if self.cursor:
             self.cursor.close()
+            self.cursor = None
         if self.conn and self.conn.is_connected():
             self.conn.close()
             print("Connexion à MySQL fermée")
+        self.conn = None
+        self.bulk_session = False
+    
+    def is_healthy(self):
+        """
+        Vérifie que la connexion répond encore
+        
+        Returns:
+            bool: True si le serveur répond, False sinon
+        """
+        try:
+            self.conn.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+    
+    def reconnect(self):
+        """
+        Rétablit une connexion perdue et les réglages de session en cours
+        
+        Returns:
+            bool: True si la reconnexion a réussi, False sinon
+        """
+        try:
+            self.conn.reconnect(attempts=self.max_retries, delay=self.retry_delay)
+            self.cursor = self.conn.cursor()
+            print("Connexion à MySQL rétablie")
+            if self.bulk_session:
+                self.begin_bulk_session()
+            return True
+        except Error as e:
+            print(f"Erreur lors de la reconnexion à MySQL: {e}")
+            return False
+    
+    def commit(self):
+        """
+        Valide la transaction en cours en notant qu'une validation est en
+        cours: si la connexion est perdue pendant la validation, le serveur a
+        pu l'appliquer (voir run_with_retry)
+        """
+        self.committing = True
+        self.conn.commit()
+        self.committing = False
+    
+    def run_with_retry(self, operation, *args, replay_range=None):
+        """
+        Exécute une opération (un lot et sa validation) et la relance après
+        reconnexion si la connexion a été perdue
+        
+        Les écritures non validées sont annulées par le serveur à la perte de
+        connexion. Si la connexion est perdue pendant la validation (commit),
+        le serveur a pu l'appliquer: les lignes de la plage d'ids du lot sont
+        alors supprimées avant de rejouer l'opération, et une opération sans
+        plage d'ids n'est pas rejouée.
+        
+        Args:
+            operation (callable): Opération à exécuter (validée par commit())
+            *args: Arguments de l'opération
+            replay_range (tuple): (table, premier id, dernier id) des lignes
+                écrites par l'opération, ou None
+            
+        Returns:
+            Résultat de l'opération
+        """
+        for attempt in range(self.max_retries + 1):
+            self.committing = False
+            try:
+                return operation(*args)
+            except CONNECTION_ERRORS as e:
+                during_commit = self.committing
+                self.committing = False
+                if attempt == self.max_retries or (during_commit and replay_range is None):
+                    raise
+                print(f"Connexion perdue ({e}), nouvelle tentative {attempt + 1}/{self.max_retries}")
+                time.sleep(self.retry_delay)
+                self.reconnect()
+                if during_commit and not self.delete_id_range(*replay_range):
+                    raise
     
     def verify_table_structure(self, table_name):
         """
@@ -69,6 +258,24 @@ class DBConnection:
             print(f"Erreur lors de la vérification de la structure de {table_name}: {e}")
             return []
     
+    def has_index(self, table_name, index_name):
+        """
+        Vérifie qu'une table possède un index (ou une clé) donné
+        
+        Args:
+            table_name (str): Nom de la table
+            index_name (str): Nom de l'index
+            
+        Returns:
+            bool: True si l'index existe, False sinon
+        """
+        try:
+            self.cursor.execute(f"SHOW INDEX FROM {table_name} WHERE Key_name = %s", (index_name,))
+            return bool(self.cursor.fetchall())
+        except Error as e:
+            print(f"Erreur lors de la vérification de l'index {index_name} de {table_name}: {e}")
+            return False
+    
     def truncate_tables(self, tables):
         """
         Vide les tables spécifiées
@@ -90,6 +297,63 @@ class DBConnection:
             print(f"Erreur lors du vidage des tables: {e}")
             return False
     
+    def delete_id_range(self, table_name, first_id, last_id):
+        """
+        Supprime les lignes d'une plage d'ids (lignes d'un lot partiellement validé)
+        
+        Args:
+            table_name (str): Nom de la table
+            first_id (int): Premier id de la plage
+            last_id (int): Dernier id de la plage
+            
+        Returns:
+            bool: True si l'opération a réussi, False sinon
+        """
+        try:
+            self.cursor.execute(
+                f"DELETE FROM {table_name} WHERE id BETWEEN %s AND %s",
+                (int(first_id), int(last_id))
+            )
+            self.conn.commit()
+            return True
+        except Error as e:
+            print(f"Erreur lors de la suppression des ids {first_id}-{last_id} de {table_name}: {e}")
+            return False
+    
+    def begin_bulk_session(self):
+        """
+        Prépare la session pour un chargement en masse: transaction explicite,
+        vérifications d'unicité et de clés étrangères désactivées
+        
+        Returns:
+            bool: True si l'opération a réussi, False sinon
+        """
+        try:
+            self.conn.autocommit = False
+            self.cursor.execute("SET UNIQUE_CHECKS = 0")
+            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            self.bulk_session = True
+            return True
+        except Error as e:
+            print(f"Erreur lors de la préparation du chargement en masse: {e}")
+            return False
+    
+    def end_bulk_session(self):
+        """
+        Rétablit les vérifications de la session après un chargement en masse
+        
+        Returns:
+            bool: True si l'opération a réussi, False sinon
+        """
+        try:
+            self.bulk_session = False
+            self.cursor.execute("SET UNIQUE_CHECKS = 1")
+            self.cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+            return True
+        except Error as e:
+            print(f"Erreur lors du rétablissement des vérifications: {e}")
+            return False
+    
     def count_rows(self, table_name):
         """
         Compte le nombre de lignes dans une table
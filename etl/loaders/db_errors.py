@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module des erreurs de base de données communes aux chargeurs
+
+Les erreurs de mysql.connector sont reprises si le pilote est installé;
+sinon des classes de même nom les remplacent, pour que la base embarquée
+fonctionne sans le pilote MySQL.
+"""
+
+try:
+    from mysql.connector import Error
+    from mysql.connector.errors import (
+        DatabaseError, InterfaceError, NotSupportedError, OperationalError, PoolError
+    )
+except ImportError:  # Pilote MySQL absent (base embarquée uniquement)
+    class Error(Exception):
+        """Erreur de base de données"""
+        
+        def __init__(self, msg=None):
+            super().__init__(msg)
+            self.msg = msg
+    
+    class InterfaceError(Error):
+        """Erreur de l'interface avec la base de données"""
+    
+    class DatabaseError(Error):
+        """Erreur signalée par la base de données"""
+    
+    class OperationalError(DatabaseError):
+        """Erreur de fonctionnement de la base (connexion perdue...)"""
+    
+    class NotSupportedError(DatabaseError):
+        """Opération non disponible avec cette base"""
+    
+    class PoolError(Error):
+        """Erreur du pool de connexions"""
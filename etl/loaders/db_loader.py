@@ -6,21 +6,50 @@ Module de chargement des données vers une base de données MySQL
 """
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from etl.loaders.db_connection import DBConnection
-from etl.loaders.table_loaders import CalendrierLoader, LocalisationLoader, PandemieLoader, DataLoader
+from etl.loaders.embedded_connection import EmbeddedConnection, EMBEDDED_BACKENDS
+from etl.loaders.table_loaders import CalendrierLoader, LocalisationLoader, PandemieLoader, DataLoader, RollupLoader
+from etl.transformers.rollup_tables import ROLLUP_TABLES
+from etl.loaders.bulk_loader import BulkLoader
+from etl.loaders.merge_loader import MergeLoader
+from etl.loaders.load_scheduler import LoadScheduler
+from etl.utils.metrics import measure
 
 class DBLoader:
     """Classe responsable du chargement des données vers une base de données MySQL"""
     
-    def __init__(self, db_config):
+    def __init__(self, db_config, metrics=None):
         """
         Initialise le chargeur de base de données
         
         Args:
             db_config (dict): Configuration de la base de données
+            metrics (PipelineMetrics): Collecte des mesures (optionnel)
         """
         self.db_config = db_config
-        self.connection = DBConnection(db_config)
+        # Base MySQL, ou base embarquée SQLite/DuckDB (clé backend)
+        if db_config.get('backend', 'mysql') in EMBEDDED_BACKENDS:
+            self.connection = EmbeddedConnection(db_config)
+        else:
+            self.connection = DBConnection(db_config)
+        # Méthode de chargement en masse: 'infile', 'insert' ou None (chargeurs ligne par ligne);
+        # une base embarquée est chargée en masse par défaut
+        self.bulk_method = db_config.get('bulk_load') or ('insert' if self.connection.embedded else None)
+        self.batch_size = db_config.get('batch_size', 1000)
+        self.rows_per_statement = db_config.get('rows_per_statement', 5000)
+        # Nombre de connexions chargeant des tables (ou des plages de data) en parallèle
+        # (une base embarquée n'accepte qu'un écrivain à la fois)
+        self.load_workers = 1 if self.connection.embedded else db_config.get('load_workers', 1)
+        self.scheduler = LoadScheduler(db_config.get('schema_file')) if self.load_workers > 1 else None
+        # Mode de chargement: 'truncate' (tables vidées puis rechargées) ou 'merge'
+        # (tables intermédiaires fusionnées, seules les lignes modifiées sont écrites)
+        self.load_mode = db_config.get('load_mode', 'truncate')
+        if self.load_mode == 'merge' and db_config.get('backend') == 'duckdb':
+            print("Chargement par fusion non disponible avec duckdb, tables vidées puis rechargées")
+            self.load_mode = 'truncate'
+        self.metrics = metrics
+        self._staged = []
     
     def load_data(self, tables_dict):
         """
@@ -44,35 +73,405 @@ class DBLoader:
             for table in tables_list:
                 self.connection.verify_table_structure(table)
             
-            # Vidage des tables
-            self.connection.truncate_tables(tables_list)
+            if self._can_merge(tables_list):
+                # Fusion: les lignes absentes du chargement sont supprimées
+                results = self._merge(tables_dict, delete_missing=True)
+            else:
+                # Vidage des tables
+                self.connection.truncate_tables(tables_list)
+                
+                # Importation des données
+                results = self._import(tables_dict)
             
-            # Importation des données
-            if 'calendar' in tables_dict:
-                results['calendar'] = CalendrierLoader.import_data(
-                    self.connection, tables_dict['calendar'])
+            # Vérification du nombre de lignes
+            self.verify_row_counts(tables_list)
             
-            if 'location' in tables_dict:
-                results['location'] = LocalisationLoader.import_data(
-                    self.connection, tables_dict['location'])
+        finally:
+            # Fermeture de la connexion
+            self.connection.disconnect()
+        
+        return results
+    
+    def append_tables(self, tables_dict):
+        """
+        Ajoute des lignes aux tables sans les vider (exécutions incrémentales)
+        
+        Args:
+            tables_dict (dict): Dictionnaire des DataFrames contenant uniquement
+                les lignes nouvelles
             
-            if 'pandemie' in tables_dict:
-                results['pandemie'] = PandemieLoader.import_data(
-                    self.connection, tables_dict['pandemie'])
+        Returns:
+            dict: Dictionnaire des nombres de lignes ajoutées par table
+        """
+        results = {}
+        
+        if not self.connection.connect():
+            return results
+        
+        try:
+            tables_list = list(tables_dict.keys())
+            tables_dict = {table: df for table, df in tables_dict.items() if not df.empty}
             
-            if 'data' in tables_dict:
-                results['data'] = DataLoader.import_data(
-                    self.connection, tables_dict['data'])
+            if self._can_merge(tables_list):
+                results = self._merge(tables_dict, delete_missing=False)
+            else:
+                results = self._import(tables_dict)
             
-            # Vérification du nombre de lignes
             self.verify_row_counts(tables_list)
+        finally:
+            self.connection.disconnect()
+        
+        return results
+    
+    def _import(self, tables_dict):
+        """
+        Importe les tables avec la méthode configurée
+        
+        Args:
+            tables_dict (dict): Dictionnaire contenant les DataFrames à charger
+            
+        Returns:
+            dict: Dictionnaire des nombres de lignes chargées par table
+        """
+        if self.load_workers > 1:
+            return self._parallel_import(tables_dict)
+        if self.bulk_method:
+            return self._bulk_import(tables_dict)
+        return self._import_tables(tables_dict)
+    
+    def _can_merge(self, tables):
+        """
+        Indique si les tables sont chargées par fusion: mode 'merge' et clés
+        uniques de fusion présentes dans la base (sinon tables chargées comme
+        en mode 'truncate')
+        
+        Args:
+            tables (list): Tables à charger
             
+        Returns:
+            bool: True si les tables sont fusionnées, False sinon
+        """
+        if self.load_mode != 'merge':
+            return False
+        if MergeLoader.check_keys(self.connection, tables):
+            return True
+        print("Tables chargées sans fusion (mode 'truncate')")
+        return False
+    
+    def _merge(self, tables_dict, delete_missing):
+        """
+        Charge les tables dans des tables intermédiaires puis les fusionne
+        dans les tables en une seule transaction
+        
+        Les lignes de la table data gardent les ids de la base (voir
+        MergeLoader.merge_columns), différents de ceux de sql_data.csv.
+        
+        Args:
+            tables_dict (dict): Dictionnaire contenant les DataFrames à charger
+            delete_missing (bool): Supprime les lignes absentes du chargement
+            
+        Returns:
+            dict: Dictionnaire des nombres de lignes écrites par table
+        """
+        tables = [table for table in ['calendar', 'location', 'pandemie', 'data'] + ROLLUP_TABLES if table in tables_dict]
+        try:
+            for table in tables:
+                if not MergeLoader.create_staging(self.connection, table):
+                    return {}
+                with measure(self.metrics, 'db_loading', f"{table} (intermédiaire)", rows_in=len(tables_dict[table])):
+                    MergeLoader.stage_rows(
+                        self.connection, table, tables_dict[table],
+                        self.bulk_method, self.rows_per_statement)
+            
+            with measure(self.metrics, 'db_loading', 'fusion') as step:
+                results = MergeLoader.merge_tables(self.connection, tables, delete_missing) or {}
+                step['rows_out'] = sum(results.values())
+            return results
         finally:
-            # Fermeture de la connexion
+            for table in tables:
+                MergeLoader.drop_staging(self.connection, table)
+    
+    def _parallel_import(self, tables_dict):
+        """
+        Importe les tables sur plusieurs connexions en respectant les clés
+        étrangères: les tables d'un même niveau de dépendance sont chargées
+        en même temps, la table data étant découpée en plages d'ids
+        
+        Args:
+            tables_dict (dict): Dictionnaire contenant les DataFrames à charger
+            
+        Returns:
+            dict: Dictionnaire des nombres de lignes chargées par table
+        """
+        results = {}
+        
+        for level in self.scheduler.levels(list(tables_dict.keys())):
+            tasks = []
+            for table in level:
+                if table == 'data':
+                    partitions = LoadScheduler.partition_by_id(tables_dict[table], self.load_workers)
+                    for i, partition in enumerate(partitions, 1):
+                        label = f"data partition {i}/{len(partitions)}"
+                        tasks.append((table, partition, label))
+                else:
+                    tasks.append((table, tables_dict[table], table))
+            
+            print(f"Chargement en parallèle de {', '.join(label for _, _, label in tasks)}")
+            with ThreadPoolExecutor(max_workers=self.load_workers) as executor:
+                counts = list(executor.map(lambda task: self._load_task(*task), tasks))
+            
+            for (table, _, _), count in zip(tasks, counts):
+                results[table] = results.get(table, 0) + count
+        
+        return results
+    
+    def _load_task(self, table, df, label):
+        """
+        Charge une table ou une plage d'ids sur une connexion dédiée, en
+        rejouant la plage si elle n'a pas été entièrement importée
+        
+        Args:
+            table (str): Nom de la table
+            df (DataFrame): Lignes à charger
+            label (str): Libellé de la tâche pour la progression et les mesures
+            
+        Returns:
+            int: Nombre de lignes importées
+        """
+        if df.empty:
+            return 0
+        
+        connection = self.connection.checkout()
+        if connection is None:
+            print(f"{label}: aucune connexion disponible")
+            return 0
+        
+        try:
+            # Les tables d'agrégats n'ont pas d'id: elles sont chargées en une seule tâche
+            has_ids = 'id' in df.columns
+            if has_ids:
+                first_id, last_id = df['id'].min(), df['id'].max()
+                label = f"{label} (ids {first_id}-{last_id})"
+            with measure(self.metrics, 'db_loading', label, rows_in=len(df)) as step:
+                for attempt in range(connection.max_retries + 1):
+                    count = self._load_on(connection, table, df)
+                    if count == len(df) or attempt == connection.max_retries:
+                        break
+                    # Les lots déjà validés sont supprimés avant de rejouer la tâche
+                    print(f"{label}: {count}/{len(df)} lignes, nouvelle tentative {attempt + 1}/{connection.max_retries}")
+                    if not connection.is_healthy():
+                        connection.reconnect()
+                    if has_ids:
+                        connection.delete_id_range(table, first_id, last_id)
+                    else:
+                        connection.truncate_tables([table])
+                step['rows_out'] = count
+            print(f"{label}: {count}/{len(df)} lignes importées")
+            return count
+        finally:
+            connection.disconnect()
+    
+    def _load_on(self, connection, table, df):
+        """
+        Charge des lignes d'une table sur une connexion donnée
+        
+        Args:
+            connection (DBConnection): Connexion à utiliser
+            table (str): Nom de la table
+            df (DataFrame): Lignes à charger
+            
+        Returns:
+            int: Nombre de lignes importées
+        """
+        if self.bulk_method:
+            connection.begin_bulk_session()
+            try:
+                return BulkLoader.import_table(
+                    connection, table, df, self.bulk_method, self.rows_per_statement)
+            finally:
+                connection.end_bulk_session()
+        
+        if table == 'calendar':
+            return CalendrierLoader.import_data(connection, df)
+        if table == 'location':
+            return LocalisationLoader.import_data(connection, df)
+        if table == 'pandemie':
+            return PandemieLoader.import_data(connection, df)
+        if table in ROLLUP_TABLES:
+            return RollupLoader.import_data(connection, table, df, self.batch_size)
+        return DataLoader.import_data(connection, df, self.batch_size)
+    
+    def _import_tables(self, tables_dict):
+        """
+        Importe les tables avec les chargeurs spécifiques à chaque table
+        
+        Args:
+            tables_dict (dict): Dictionnaire contenant les DataFrames à charger
+            
+        Returns:
+            dict: Dictionnaire des nombres de lignes chargées par table
+        """
+        results = {}
+        
+        if 'calendar' in tables_dict:
+            with measure(self.metrics, 'db_loading', 'calendar') as step:
+                results['calendar'] = step['rows_out'] = CalendrierLoader.import_data(
+                    self.connection, tables_dict['calendar'])
+        
+        if 'location' in tables_dict:
+            with measure(self.metrics, 'db_loading', 'location') as step:
+                results['location'] = step['rows_out'] = LocalisationLoader.import_data(
+                    self.connection, tables_dict['location'])
+        
+        if 'pandemie' in tables_dict:
+            with measure(self.metrics, 'db_loading', 'pandemie') as step:
+                results['pandemie'] = step['rows_out'] = PandemieLoader.import_data(
+                    self.connection, tables_dict['pandemie'])
+        
+        if 'data' in tables_dict:
+            with measure(self.metrics, 'db_loading', 'data') as step:
+                results['data'] = step['rows_out'] = DataLoader.import_data(
+                    self.connection, tables_dict['data'], self.batch_size, self.metrics)
+        
+        for table in ROLLUP_TABLES:
+            if table in tables_dict:
+                with measure(self.metrics, 'db_loading', table) as step:
+                    results[table] = step['rows_out'] = RollupLoader.import_data(
+                        self.connection, table, tables_dict[table], self.batch_size)
+        
+        return results
+    
+    def _bulk_import(self, tables_dict):
+        """
+        Importe les tables en masse, avec une seule validation par table
+        
+        Args:
+            tables_dict (dict): Dictionnaire contenant les DataFrames à charger
+            
+        Returns:
+            dict: Dictionnaire des nombres de lignes chargées par table
+        """
+        results = {}
+        self.connection.begin_bulk_session()
+        try:
+            for table in ['calendar', 'location', 'pandemie', 'data'] + ROLLUP_TABLES:
+                if table in tables_dict:
+                    with measure(self.metrics, 'db_loading', table) as step:
+                        results[table] = step['rows_out'] = BulkLoader.import_table(
+                            self.connection, table, tables_dict[table],
+                            self.bulk_method, self.rows_per_statement)
+        finally:
+            self.connection.end_bulk_session()
+        
+        return results
+    
+    def begin_stream(self, reference_tables, tables_list):
+        """
+        Ouvre un chargement par blocs: vide les tables et importe les tables
+        de référence, la table data étant ensuite ajoutée bloc par bloc
+        
+        Args:
+            reference_tables (dict): DataFrames calendar, location et pandemie
+            tables_list (list): Noms de toutes les tables chargées
+            
+        Returns:
+            dict: Nombre de lignes importées par table de référence, ou None
+                si la connexion a échoué
+        """
+        if not self.connection.connect():
+            return None
+        
+        results = {}
+        try:
+            for table in tables_list:
+                self.connection.verify_table_structure(table)
+            
+            if self._can_merge(tables_list):
+                # Les tables sont remplies dans des tables intermédiaires, fusionnées par end_stream
+                self._staged = [table for table in list(reference_tables.keys()) + ['data'] if table in tables_list]
+                for table in self._staged:
+                    if not MergeLoader.create_staging(self.connection, table):
+                        raise RuntimeError(f"Table intermédiaire de {table} indisponible")
+                for table, df in reference_tables.items():
+                    results[table] = MergeLoader.stage_rows(
+                        self.connection, table, df, self.bulk_method, self.rows_per_statement)
+                return results
+            
+            self.connection.truncate_tables(tables_list)
+            
+            if self.bulk_method:
+                results = self._bulk_import(reference_tables)
+            else:
+                results = self._import_tables(reference_tables)
+        except Exception:
+            for table in self._staged:
+                MergeLoader.drop_staging(self.connection, table)
+            self._staged = []
             self.connection.disconnect()
+            raise
         
         return results
     
+    def append_data(self, df_chunk):
+        """
+        Ajoute un bloc de lignes à la table data pendant un chargement par blocs
+        
+        Args:
+            df_chunk (DataFrame): Bloc de la table data
+            
+        Returns:
+            int: Nombre de lignes importées
+        """
+        if df_chunk.empty:
+            return 0
+        if self._staged:
+            return MergeLoader.stage_rows(
+                self.connection, 'data', df_chunk, self.bulk_method, self.rows_per_statement)
+        if self.bulk_method:
+            return self._bulk_import({'data': df_chunk})['data']
+        return DataLoader.import_data(self.connection, df_chunk, self.batch_size)
+    
+    def end_stream(self, tables_list):
+        """
+        Termine un chargement par blocs réussi (en fusionnant les tables
+        intermédiaires en mode 'merge') et ferme la connexion; un chargement
+        interrompu est abandonné par abort_stream
+        
+        Args:
+            tables_list (list): Noms des tables à vérifier
+            
+        Returns:
+            dict: Dictionnaire des nombres de lignes par table
+        """
+        try:
+            if self._staged:
+                with measure(self.metrics, 'db_loading', 'fusion') as step:
+                    merged = MergeLoader.merge_tables(self.connection, self._staged, delete_missing=True) or {}
+                    step['rows_out'] = sum(merged.values())
+            return self.verify_row_counts(tables_list)
+        finally:
+            self._close_stream()
+    
+    def abort_stream(self):
+        """
+        Abandonne un chargement par blocs interrompu par une erreur: les
+        tables intermédiaires sont supprimées sans être fusionnées (en mode
+        'merge', les tables gardent leur contenu précédent) et la connexion
+        est fermée
+        """
+        if self._staged:
+            print("Chargement par blocs interrompu: tables intermédiaires supprimées sans fusion")
+        self._close_stream()
+    
+    def _close_stream(self):
+        """Supprime les tables intermédiaires d'un chargement par blocs et ferme la connexion"""
+        try:
+            for table in self._staged:
+                MergeLoader.drop_staging(self.connection, table)
+        finally:
+            self._staged = []
+            self.connection.disconnect()
+    
     def verify_row_counts(self, tables):
         """
         Vérifie le nombre de lignes dans chaque table
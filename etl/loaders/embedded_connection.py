@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de connexion à une base embarquée (SQLite ou DuckDB) ayant le schéma epiviz
+"""
+
+import re
+import sqlite3
+import itertools
+from etl.loaders.db_errors import DatabaseError, NotSupportedError
+from etl.loaders.db_connection import DBConnection
+from etl.utils.config import DEFAULT_SCHEMA_FILE
+from etl.loaders.merge_loader import MERGE_KEYS
+
+# Bases embarquées disponibles (clé backend de la configuration database)
+EMBEDDED_BACKENDS = ('sqlite', 'duckdb')
+
+# Numéros des bases SQLite en mémoire partagées entre connexions
+_memory_ids = itertools.count(1)
+
+def schema_statements(schema_file=None, backend='sqlite'):
+    """
+    Traduit les instructions CREATE TABLE du schéma MySQL pour une base embarquée
+    
+    Les types entiers deviennent INTEGER (SQLite) ou BIGINT (DuckDB), les
+    types caractères TEXT ou VARCHAR; les clés KEY et UNIQUE KEY deviennent
+    des index. Les clés étrangères ne sont conservées que pour SQLite, qui
+    ne les vérifie pas par défaut (DuckDB interdit de vider une table référencée).
+    
+    Args:
+        schema_file (str): Chemin du script SQL (epiviz.sql par défaut)
+        backend (str): 'sqlite' ou 'duckdb'
+    
+    Returns:
+        list: Instructions CREATE TABLE et CREATE INDEX
+    """
+    with open(schema_file or DEFAULT_SCHEMA_FILE, 'r', encoding='utf-8') as f:
+        sql = f.read()
+    
+    integer_type = 'INTEGER' if backend == 'sqlite' else 'BIGINT'
+    text_type = 'TEXT' if backend == 'sqlite' else 'VARCHAR'
+    statements = []
+    indexes = []
+    for match in re.finditer(r'CREATE TABLE[^`]*`(\w+)`\s*\((.*?)\)\s*ENGINE', sql, re.DOTALL | re.IGNORECASE):
+        table, body = match.group(1), match.group(2).replace('`', '')
+        definitions = []
+        for line in body.split('\n'):
+            line = line.strip().rstrip(',')
+            if not line:
+                continue
+            key = re.match(r'(UNIQUE\s+)?KEY\s+(\w+)\s*\(([^)]*)\)', line, re.IGNORECASE)
+            if key:
+                unique = 'UNIQUE ' if key.group(1) else ''
+                # Les noms d'index sont communs à toutes les tables
+                name = key.group(2) if key.group(2).startswith(table) else f"{table}_{key.group(2)}"
+                if unique or backend == 'sqlite':
+                    indexes.append(f"CREATE {unique}INDEX IF NOT EXISTS {name} ON {table} ({key.group(3)})")
+            elif line.upper().startswith('PRIMARY KEY'):
+                definitions.append(line)
+            elif line.upper().startswith('CONSTRAINT'):
+                if backend == 'sqlite':
+                    definitions.append(re.sub(r'^CONSTRAINT\s+\w+\s+|\s+ON\s+(DELETE|UPDATE)\s+NO\s+ACTION', '', line, flags=re.IGNORECASE))
+            else:
+                column = re.sub(r'\b(big)?int\(\d+\)', integer_type, line, flags=re.IGNORECASE)
+                column = re.sub(r'\b(var)?char\(\d+\)', text_type, column, flags=re.IGNORECASE)
+                definitions.append(re.sub(r'\s+AUTO_INCREMENT', '', column, flags=re.IGNORECASE))
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)})")
+    return statements + indexes
+
+class _EmbeddedCursor:
+    """Curseur traduisant les requêtes MySQL des chargeurs pour la base embarquée"""
+    
+    def __init__(self, cursor, backend, module):
+        self._cursor = cursor
+        self._backend = backend
+        self._module = module
+        self._rowcount = -1
+    
+    @property
+    def rowcount(self):
+        return self._rowcount
+    
+    def _translate(self, query):
+        """
+        Traduit une requête MySQL
+        
+        Args:
+            query (str): Requête MySQL
+        
+        Returns:
+            str: Requête traduite, ou None si elle est sans objet (SET)
+        """
+        query = query.strip()
+        if query.upper().startswith('SET '):
+            return None
+        if query.upper().startswith('LOAD DATA'):
+            raise NotSupportedError(msg=f"LOAD DATA LOCAL INFILE non disponible avec {self._backend}")
+        match = re.match(r'DESCRIBE\s+(\w+)', query, re.IGNORECASE)
+        if match and self._backend == 'sqlite':
+            return f"SELECT name, type FROM pragma_table_info('{match.group(1)}')"
+        match = re.match(r'TRUNCATE\s+TABLE\s+(\w+)', query, re.IGNORECASE)
+        if match:
+            return f"DELETE FROM {match.group(1)}"
+        match = re.match(r'CREATE\s+TABLE\s+(\w+)\s+LIKE\s+(\w+)', query, re.IGNORECASE)
+        if match:
+            return f"CREATE TABLE {match.group(1)} AS SELECT * FROM {match.group(2)} LIMIT 0"
+        match = re.match(r'INSERT\s+INTO\s+(\w+)', query, re.IGNORECASE)
+        if match and 'ON DUPLICATE KEY UPDATE' in query:
+            keys = ', '.join(MERGE_KEYS[match.group(1)])
+            query = re.sub(r'VALUES\((\w+)\)', r'excluded.\1', query)
+            query = query.replace('ON DUPLICATE KEY UPDATE', f"ON CONFLICT ({keys}) DO UPDATE SET")
+        null_safe_equal = 'IS' if self._backend == 'sqlite' else 'IS NOT DISTINCT FROM'
+        return query.replace('<=>', null_safe_equal).replace('%s', '?')
+    
+    def execute(self, query, params=None):
+        upsert = 'ON DUPLICATE KEY UPDATE' in query
+        query = self._translate(query)
+        if query is None:
+            return
+        try:
+            self._cursor.execute(query, params or ())
+        except self._module.Error as e:
+            raise DatabaseError(msg=str(e)) from e
+        
+        if self._backend == 'sqlite':
+            # MySQL compte 2 lignes affectées par ligne mise à jour par ON DUPLICATE KEY UPDATE
+            self._rowcount = self._cursor.rowcount * (2 if upsert else 1)
+        elif re.match(r'(INSERT|UPDATE|DELETE)\b', query, re.IGNORECASE):
+            # DuckDB retourne le nombre de lignes modifiées comme résultat
+            self._rowcount = self._cursor.fetchone()[0]
+        else:
+            self._rowcount = -1
+    
+    def executemany(self, query, seq_params):
+        try:
+            self._cursor.executemany(self._translate(query), seq_params)
+        except self._module.Error as e:
+            raise DatabaseError(msg=str(e)) from e
+    
+    def fetchall(self):
+        return self._cursor.fetchall()
+    
+    def fetchone(self):
+        return self._cursor.fetchone()
+    
+    def close(self):
+        self._cursor.close()
+
+class _EmbeddedSession:
+    """Connexion exposant l'interface de mysql.connector utilisée par les chargeurs"""
+    
+    def __init__(self, db, backend):
+        self._db = db
+        self._backend = backend
+        self.autocommit = False
+    
+    def is_connected(self):
+        return True
+    
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass
+    
+    def commit(self):
+        # DuckDB valide chaque instruction (pas de transaction ouverte implicitement)
+        if self._backend == 'sqlite':
+            self._db.commit()
+    
+    def rollback(self):
+        if self._backend == 'sqlite':
+            self._db.rollback()
+    
+    def close(self):
+        pass
+
+class EmbeddedConnection(DBConnection):
+    """Classe responsable de la connexion à une base embarquée SQLite ou DuckDB"""
+    
+    # Les chargeurs insèrent les tables par insert_frame plutôt que par INSERT multi-lignes
+    embedded = True
+    
+    def __init__(self, db_config):
+        """
+        Initialise la connexion à la base embarquée
+        
+        Args:
+            db_config (dict): Configuration de la base de données. Les clés
+                backend ('sqlite' ou 'duckdb'), path (fichier de la base,
+                ':memory:' par défaut) et schema_file (epiviz.sql par défaut)
+                choisissent la base.
+        """
+        super().__init__(db_config)
+        self.backend = db_config.get('backend', 'sqlite')
+        self.path = db_config.get('path', ':memory:')
+        self._db = None
+        self._module = None
+        # Une base en mémoire reste ouverte entre deux chargements, et partagée
+        # avec les connexions de checkout()
+        if self.path == ':memory:' and self.backend == 'sqlite':
+            self.path = f"file:epiviz_{next(_memory_ids)}?mode=memory&cache=shared"
+    
+    def _open(self):
+        """
+        Ouvre la base et crée les tables du schéma epiviz si elles n'existent pas
+        """
+        if self.backend == 'duckdb':
+            import duckdb
+            self._module = duckdb
+            self._db = duckdb.connect(self.path)
+        else:
+            self._module = sqlite3
+            self._db = sqlite3.connect(self.path, uri=self.path.startswith('file:'), check_same_thread=False, timeout=30)
+        
+        cursor = self._db.cursor()
+        for statement in schema_statements(self.db_config.get('schema_file'), self.backend):
+            cursor.execute(statement)
+        if self.backend == 'sqlite':
+            self._db.commit()
+        cursor.close()
+    
+    def connect(self):
+        """
+        Ouvre la base embarquée (créée avec le schéma epiviz au premier appel)
+        
+        Returns:
+            bool: True si la connexion a réussi, False sinon
+        """
+        try:
+            if self._db is None:
+                self._open()
+            self.conn = _EmbeddedSession(self._db, self.backend)
+            self.cursor = _EmbeddedCursor(self._db.cursor(), self.backend, self._module)
+            print(f"Connexion à la base {self.backend} établie: {self.path}")
+            return True
+        except ImportError as e:
+            print(f"Base {self.backend} indisponible ({e})")
+            return False
+        except Exception as e:
+            print(f"Erreur lors de l'ouverture de la base {self.backend}: {e}")
+            return False
+    
+    def checkout(self):
+        """
+        Ouvre une connexion supplémentaire sur la même base
+        
+        Returns:
+            EmbeddedConnection: Nouvelle connexion établie, ou None en cas d'échec
+        """
+        connection = EmbeddedConnection(self.db_config)
+        connection.path = self.path
+        if connection.connect():
+            return connection
+        return None
+    
+    def disconnect(self):
+        """Ferme le curseur; une base sur fichier est fermée, une base en mémoire reste ouverte"""
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self._db is not None and 'mode=memory' not in self.path and self.path != ':memory:':
+            self._db.close()
+            self._db = None
+            print(f"Base {self.backend} fermée")
+        self.conn = None
+        self.bulk_session = False
+    
+    def is_healthy(self):
+        return self._db is not None
+    
+    def reconnect(self):
+        return self.connect()
+    
+    def has_index(self, table_name, index_name):
+        if self.backend == 'duckdb':
+            query = "SELECT index_name FROM duckdb_indexes() WHERE table_name = ? AND index_name = ?"
+        else:
+            query = "SELECT name FROM pragma_index_list(?) WHERE name = ?"
+        return bool(self._db.execute(query, (table_name, index_name)).fetchall())
+    
+    def insert_frame(self, table_name, df, columns):
+        """
+        Insère les lignes d'un DataFrame colonne par colonne, sans construire
+        de requête par ligne (DuckDB lit directement les tableaux du DataFrame)
+        
+        Args:
+            table_name (str): Nom de la table
+            df (DataFrame): Lignes à insérer
+            columns (list): Colonnes à insérer
+        
+        Returns:
+            int: Nombre de lignes insérées
+        """
+        column_list = ', '.join(columns)
+        if self.backend == 'duckdb':
+            self._db.register('epiviz_frame', df[columns])
+            try:
+                self._db.execute(f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM epiviz_frame")
+            except self._module.Error as e:
+                raise DatabaseError(msg=str(e)) from e
+            finally:
+                self._db.unregister('epiviz_frame')
+            return len(df)
+        
+        # Colonnes numpy converties en types Python natifs en une passe chacune
+        values = []
+        for col in columns:
+            series = df[col]
+            if series.hasnans:
+                series = series.astype(object).where(series.notna(), None)
+            values.append(series.tolist())
+        placeholders = ', '.join(['?'] * len(columns))
+        try:
+            self._db.executemany(f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders})", zip(*values))
+        except sqlite3.Error as e:
+            raise DatabaseError(msg=str(e)) from e
+        return len(df)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module d'ordonnancement du chargement des tables selon leurs clés étrangères
+"""
+
+import re
+import numpy as np
+from etl.utils.config import DEFAULT_SCHEMA_FILE
+
+# Dépendances utilisées si le schéma SQL est introuvable
+DEFAULT_DEPENDENCIES = {
+    'calendar': set(),
+    'location': set(),
+    'pandemie': set(),
+    'data': {'calendar', 'location', 'pandemie'},
+    'rollup_week': {'location', 'pandemie'},
+    'rollup_month': {'location', 'pandemie'},
+    'rollup_continent': {'calendar', 'pandemie'},
+    'rollup_pandemie': {'calendar', 'pandemie'}
+}
+
+class LoadScheduler:
+    """Classe responsable de l'ordre de chargement des tables"""
+    
+    def __init__(self, schema_file=None):
+        """
+        Initialise l'ordonnanceur à partir des contraintes FOREIGN KEY du schéma SQL
+        
+        Args:
+            schema_file (str): Chemin du script SQL (epiviz.sql par défaut)
+        """
+        self.schema_file = schema_file or DEFAULT_SCHEMA_FILE
+        self.dependencies = self.parse_foreign_keys(self.schema_file)
+    
+    @staticmethod
+    def parse_foreign_keys(schema_file):
+        """
+        Extrait les dépendances entre tables des instructions CREATE TABLE
+        
+        Args:
+            schema_file (str): Chemin du script SQL
+            
+        Returns:
+            dict: Dictionnaire {table: ensemble des tables référencées}
+        """
+        try:
+            with open(schema_file, 'r', encoding='utf-8') as f:
+                sql = f.read()
+        except OSError as e:
+            print(f"Schéma SQL {schema_file} illisible ({e}), dépendances par défaut utilisées")
+            return {table: set(refs) for table, refs in DEFAULT_DEPENDENCIES.items()}
+        
+        dependencies = {}
+        for match in re.finditer(r'CREATE TABLE[^`]*`(\w+)`\s*\((.*?)\)\s*ENGINE', sql, re.DOTALL | re.IGNORECASE):
+            table, body = match.group(1), match.group(2)
+            references = re.findall(r'FOREIGN KEY\s*\([^)]*\)\s*REFERENCES\s*`(\w+)`', body, re.IGNORECASE)
+            dependencies[table] = set(references) - {table}
+        return dependencies
+    
+    def levels(self, tables):
+        """
+        Regroupe les tables par niveaux: les tables d'un même niveau ne
+        dépendent que de tables des niveaux précédents et peuvent être
+        chargées en même temps
+        
+        Args:
+            tables (list): Tables à charger
+            
+        Returns:
+            list: Liste de listes de tables, dans l'ordre de chargement
+        """
+        remaining = list(tables)
+        loaded = set()
+        levels = []
+        while remaining:
+            level = [
+                table for table in remaining
+                if not (self.dependencies.get(table, set()) & set(remaining)) - loaded
+            ]
+            if not level:
+                raise ValueError(f"Dépendance circulaire entre les tables: {', '.join(remaining)}")
+            levels.append(level)
+            loaded.update(level)
+            remaining = [table for table in remaining if table not in loaded]
+        return levels
+    
+    @staticmethod
+    def partition_by_id(df, partitions):
+        """
+        Découpe une table en plages d'ids contiguës
+        
+        Args:
+            df (DataFrame): Table à découper (colonne id)
+            partitions (int): Nombre de partitions
+            
+        Returns:
+            list: Liste de DataFrames, un par plage d'ids non vide
+        """
+        if not df['id'].is_monotonic_increasing:
+            df = df.sort_values('id')
+        bounds = np.linspace(0, len(df), min(partitions, max(len(df), 1)) + 1).astype(int)
+        return [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:]) if end > start]
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de chargement par fusion des tables (tables intermédiaires et INSERT ... ON DUPLICATE KEY UPDATE)
+"""
+
+from etl.loaders.db_errors import Error
+from etl.loaders.bulk_loader import BulkLoader, TABLE_COLUMNS
+
+# Suffixe des tables intermédiaires
+STAGING_SUFFIX = "_staging"
+
+# Clé de fusion de chaque table (clé primaire, ou clé unique pour la table data
+# dont l'id est attribué par la base pour les lignes nouvelles)
+# Limite: calendar et location sont fusionnées sur leur id, renuméroté à chaque
+# exécution complète. Une date antérieure ou un pays nouveaux décalent les ids
+# suivants: la fusion réécrit alors la plupart des lignes de ces deux tables et
+# les clés étrangères de la table data. Les exécutions incrémentales conservent
+# les ids (DimensionIndex) et n'écrivent que les lignes nouvelles.
+MERGE_KEYS = {
+    'calendar': ['id'],
+    'location': ['id'],
+    'pandemie': ['id'],
+    'data': ['id_location', 'id_pandemie', 'id_calendar'],
+    'rollup_week': ['id_location', 'id_pandemie', 'week'],
+    'rollup_month': ['id_location', 'id_pandemie', 'month'],
+    'rollup_continent': ['continent', 'id_pandemie', 'id_calendar'],
+    'rollup_pandemie': ['id_pandemie', 'id_calendar']
+}
+
+# Clés uniques requises par la fusion, absentes des bases créées avant elle
+# (voir epiviz_migration_data_unique_key.sql)
+MERGE_INDEXES = {
+    'data': 'data_location_pandemie_calendar'
+}
+MIGRATION_FILE = 'epiviz_migration_data_unique_key.sql'
+
+class MergeLoader:
+    """Classe responsable du chargement par fusion: seules les lignes nouvelles, modifiées ou disparues sont écrites"""
+    
+    @staticmethod
+    def check_keys(db_connection, tables):
+        """
+        Vérifie que les tables possèdent les clés uniques de fusion: sans
+        elles, ON DUPLICATE KEY UPDATE insère les faits en double
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            tables (list): Tables à fusionner
+        
+        Returns:
+            bool: True si la fusion est possible, False sinon
+        """
+        for table in tables:
+            index_name = MERGE_INDEXES.get(table)
+            if index_name and not db_connection.has_index(table, index_name):
+                print(f"Clé unique {index_name} absente de la table {table} (base créée avant "
+                      f"le chargement par fusion, voir {MIGRATION_FILE}): fusion impossible")
+                return False
+        return True
+    
+    @staticmethod
+    def staging_table(table_name):
+        """
+        Retourne le nom de la table intermédiaire d'une table
+        
+        Args:
+            table_name (str): Nom de la table
+        
+        Returns:
+            str: Nom de la table intermédiaire
+        """
+        return f"{table_name}{STAGING_SUFFIX}"
+    
+    @staticmethod
+    def merge_columns(table_name):
+        """
+        Retourne les colonnes écrites lors de la fusion (sans l'id de la
+        table data, attribué par la base)
+        
+        Les lignes de la table data déjà présentes gardent leur id et les
+        lignes nouvelles reçoivent l'id suivant de la base: les ids de la
+        table data fusionnée diffèrent de ceux de sql_data.csv et du stockage
+        en colonnes, renumérotés à chaque exécution. Les autres tables et les
+        clés (pays, pandémie, date) sont identiques.
+        
+        Args:
+            table_name (str): Nom de la table
+        
+        Returns:
+            list: Colonnes fusionnées
+        """
+        keys = MERGE_KEYS[table_name]
+        return [col for col in TABLE_COLUMNS[table_name] if col in keys or col != 'id']
+    
+    @staticmethod
+    def create_staging(db_connection, table_name):
+        """
+        Crée (ou recrée vide) la table intermédiaire d'une table, de même structure
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+        
+        Returns:
+            bool: True si l'opération a réussi, False sinon
+        """
+        staging = MergeLoader.staging_table(table_name)
+        try:
+            db_connection.cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+            db_connection.cursor.execute(f"CREATE TABLE {staging} LIKE {table_name}")
+            return True
+        except Error as e:
+            print(f"Erreur lors de la création de la table intermédiaire {staging}: {e}")
+            return False
+    
+    @staticmethod
+    def stage_rows(db_connection, table_name, df, method='insert', rows_per_statement=5000):
+        """
+        Ajoute des lignes à la table intermédiaire d'une table
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+            df (DataFrame): Lignes à ajouter
+            method (str): 'infile' ou 'insert' (voir BulkLoader)
+            rows_per_statement (int): Nombre de lignes par instruction INSERT
+        
+        Returns:
+            int: Nombre de lignes ajoutées
+        """
+        if df.empty:
+            return 0
+        columns = [col for col in TABLE_COLUMNS[table_name] if col in df.columns]
+        return BulkLoader.import_table(
+            db_connection, MergeLoader.staging_table(table_name), df[columns],
+            method or 'insert', rows_per_statement
+        )
+    
+    @staticmethod
+    def drop_staging(db_connection, table_name):
+        """
+        Supprime la table intermédiaire d'une table
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+        """
+        try:
+            db_connection.cursor.execute(f"DROP TABLE IF EXISTS {MergeLoader.staging_table(table_name)}")
+        except Error as e:
+            print(f"Erreur lors de la suppression de la table intermédiaire de {table_name}: {e}")
+    
+    @staticmethod
+    def merge_tables(db_connection, tables, delete_missing=True):
+        """
+        Fusionne les tables intermédiaires dans les tables, en une seule
+        transaction: les lecteurs voient les tables avant ou après la
+        fusion, jamais une table partiellement chargée
+        
+        Les lignes modifiées sont mises à jour, les lignes nouvelles
+        insérées, et (si delete_missing) les lignes absentes des tables
+        intermédiaires supprimées; les lignes identiques ne sont pas écrites.
+        Les tables calendar et location étant fusionnées sur leur id (voir
+        MERGE_KEYS), un décalage de leurs ids réécrit la plupart des lignes.
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            tables (list): Tables à fusionner, dans l'ordre des clés étrangères
+            delete_missing (bool): Supprime les lignes absentes des tables
+                intermédiaires (chargement complet)
+        
+        Returns:
+            dict: Nombre de lignes écrites (insérées, modifiées ou supprimées)
+                par table, ou None si la fusion a échoué
+        """
+        results = {}
+        try:
+            db_connection.conn.autocommit = False
+            for table in tables:
+                updated, inserted = MergeLoader._upsert(db_connection, table)
+                results[table] = updated + inserted
+                print(f"Table {table} fusionnée: {inserted} lignes insérées, {updated} lignes modifiées")
+            
+            if delete_missing:
+                # Les lignes qui référencent une ligne disparue sont supprimées avant elle
+                for table in reversed(tables):
+                    deleted = MergeLoader._delete_missing(db_connection, table)
+                    results[table] += deleted
+                    if deleted:
+                        print(f"Table {table}: {deleted} lignes absentes du chargement supprimées")
+            
+            db_connection.conn.commit()
+            return results
+        except Error as e:
+            db_connection.conn.rollback()
+            print(f"Erreur lors de la fusion des tables (annulée): {e}")
+            return None
+    
+    @staticmethod
+    def _upsert(db_connection, table_name):
+        """
+        Écrit les lignes de la table intermédiaire nouvelles ou différentes
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+        
+        Returns:
+            tuple: (lignes modifiées, lignes insérées)
+        """
+        staging = MergeLoader.staging_table(table_name)
+        keys = MERGE_KEYS[table_name]
+        columns = MergeLoader.merge_columns(table_name)
+        values = [col for col in columns if col not in keys]
+        join = ' AND '.join(f"t.{key} = s.{key}" for key in keys)
+        selected = ', '.join(f"s.{col}" for col in columns)
+        
+        updated = 0
+        if values:
+            changed = ' OR '.join(f"NOT (t.{col} <=> s.{col})" for col in values)
+            assignments = ', '.join(f"{col} = VALUES({col})" for col in values)
+            db_connection.cursor.execute(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                f"SELECT {selected} FROM {staging} s JOIN {table_name} t ON {join} "
+                f"WHERE {changed} "
+                f"ON DUPLICATE KEY UPDATE {assignments}"
+            )
+            # MySQL compte 2 lignes affectées par ligne mise à jour
+            updated = max(db_connection.cursor.rowcount, 0) // 2
+        
+        db_connection.cursor.execute(
+            f"INSERT INTO {table_name} ({', '.join(columns)}) "
+            f"SELECT {selected} FROM {staging} s LEFT JOIN {table_name} t ON {join} "
+            f"WHERE t.{keys[0]} IS NULL"
+        )
+        inserted = max(db_connection.cursor.rowcount, 0)
+        return updated, inserted
+    
+    @staticmethod
+    def _delete_missing(db_connection, table_name):
+        """
+        Supprime les lignes d'une table absentes de sa table intermédiaire
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table
+        
+        Returns:
+            int: Nombre de lignes supprimées
+        """
+        staging = MergeLoader.staging_table(table_name)
+        match = ' AND '.join(f"s.{key} = {table_name}.{key}" for key in MERGE_KEYS[table_name])
+        db_connection.cursor.execute(
+            f"DELETE FROM {table_name} WHERE NOT EXISTS (SELECT 1 FROM {staging} s WHERE {match})"
+        )
+        return max(db_connection.cursor.rowcount, 0)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de service des requêtes courantes sur les tables préparées, en mémoire
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from etl.utils.file_formats import FORMAT_EXTENSIONS, read_table
+from etl.utils.column_store import ColumnStore, HEADER_FILE
+from etl.loaders.csv_loader import DATA_STORE_DIR
+
+# Colonnes de valeurs de la table data servies par les requêtes
+VALUE_COLUMNS = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths']
+
+class QueryCache:
+    """Classe responsable du cache LRU, à durée de vie limitée, des résultats de requêtes"""
+    
+    def __init__(self, max_entries=256, ttl=300):
+        """
+        Initialise le cache
+        
+        Args:
+            max_entries (int): Nombre maximal de résultats conservés
+            ttl (float): Durée de vie d'un résultat en secondes (None pour illimitée)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """
+        Retourne un résultat du cache
+        
+        Args:
+            key (tuple): Clé de la requête
+        
+        Returns:
+            Résultat, ou None s'il est absent ou expiré
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl is not None and time.monotonic() - entry[0] > self.ttl):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key, value):
+        """
+        Enregistre un résultat et évince le moins récemment utilisé si le
+        cache est plein
+        
+        Args:
+            key (tuple): Clé de la requête
+            value: Résultat
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._entries.clear()
+
+class QueryService:
+    """Classe responsable des requêtes sur les tables calendar, location, pandemie et data chargées en mémoire"""
+    
+    def __init__(self, tables, cache_size=256, ttl=300):
+        """
+        Prépare les tableaux de recherche
+        
+        Les lignes de data sont triées par (pandémie, pays, date) dans des
+        tableaux numpy; la série d'un pays est retrouvée par recherche
+        dichotomique (np.searchsorted) sur une clé entière pandémie/pays, puis
+        sur les dates.
+        
+        Args:
+            tables (dict): DataFrames calendar, location, pandemie et data
+            cache_size (int): Nombre de résultats conservés dans le cache
+            ttl (float): Durée de vie des résultats du cache en secondes
+        """
+        self.cache = QueryCache(cache_size, ttl)
+        self._build(tables)
+    
+    @staticmethod
+    def from_output_dir(output_dir, output_format='csv', cache_size=256, ttl=300):
+        """
+        Charge les tables écrites par le pipeline dans un répertoire de sortie
+        (la table data est lue dans le stockage en colonnes s'il existe)
+        
+        Args:
+            output_dir (str): Répertoire de sortie du pipeline
+            output_format (str): Format des tables ('csv', 'parquet' ou 'feather')
+            cache_size (int): Nombre de résultats conservés dans le cache
+            ttl (float): Durée de vie des résultats du cache en secondes
+        
+        Returns:
+            QueryService: Service prêt à répondre
+        """
+        extension = FORMAT_EXTENSIONS[output_format]
+        tables = {
+            table: read_table(os.path.join(output_dir, f"sql_{table}{extension}"), output_format)
+            for table in ['calendar', 'location', 'pandemie']
+        }
+        store_dir = os.path.join(output_dir, DATA_STORE_DIR)
+        if os.path.exists(os.path.join(store_dir, HEADER_FILE)):
+            tables['data'] = ColumnStore(store_dir).read()
+        else:
+            tables['data'] = read_table(os.path.join(output_dir, f"sql_data{extension}"), output_format)
+        return QueryService(tables, cache_size, ttl)
+    
+    def _build(self, tables):
+        """
+        Construit les tableaux triés et les index des noms
+        
+        Args:
+            tables (dict): DataFrames calendar, location, pandemie et data
+        """
+        calendar = tables['calendar']
+        location = tables['location']
+        pandemie = tables['pandemie']
+        data = tables['data']
+        
+        # Date de chaque id de calendrier, pays et continent de chaque id de localisation
+        self._dates_by_id = np.zeros(int(calendar['id'].max()) + 1 if len(calendar) else 1, dtype='int32')
+        self._dates_by_id[calendar['id'].to_numpy()] = calendar['date_value'].to_numpy()
+        self.location = location.set_index('id')[['country', 'continent']]
+        self._location_ids = dict(zip(location['country'].astype(str), location['id'].astype(int)))
+        self._pandemie_ids = dict(zip(pandemie['type'].astype(str), pandemie['id'].astype(int)))
+        
+        # Clé de groupe pandémie/pays, triée avec les dates
+        self._stride = int(location['id'].max()) + 1 if len(location) else 1
+        pandemie_ids = data['id_pandemie'].to_numpy(dtype='int64')
+        location_ids = data['id_location'].to_numpy(dtype='int64')
+        dates = self._dates_by_id[data['id_calendar'].to_numpy()]
+        group_keys = pandemie_ids * self._stride + location_ids
+        order = np.lexsort((dates, group_keys))
+        
+        self._group_keys = group_keys[order]
+        self._location_ids_sorted = location_ids[order]
+        self._dates = dates[order]
+        self._values = {column: data[column].to_numpy(dtype='int64')[order] for column in VALUE_COLUMNS}
+        
+        # Premier indice de chaque groupe, pour les dernières valeurs de chaque pays
+        starts = np.flatnonzero(np.diff(self._group_keys)) + 1
+        self._group_starts = np.concatenate(([0], starts)) if len(self._group_keys) else np.empty(0, dtype='int64')
+        self._group_ends = np.concatenate((starts, [len(self._group_keys)])) if len(self._group_keys) else np.empty(0, dtype='int64')
+        print(f"Service de requêtes prêt: {len(self._group_keys)} lignes, {len(self._group_starts)} séries")
+    
+    @staticmethod
+    def _date_value(date):
+        """
+        Convertit une date (AAAAMMJJ, chaîne ou Timestamp) en entier AAAAMMJJ
+        
+        Args:
+            date: Date à convertir, ou None
+        
+        Returns:
+            int: Date AAAAMMJJ, ou None
+        """
+        if date is None or isinstance(date, (int, np.integer)):
+            return date
+        return int(pd.Timestamp(date).strftime('%Y%m%d'))
+    
+    def _cached(self, key, compute):
+        """
+        Retourne le résultat d'une requête depuis le cache, ou le calcule
+        
+        Args:
+            key (tuple): Clé de la requête
+            compute (callable): Calcul du résultat
+        
+        Returns:
+            DataFrame: Copie du résultat (le résultat en cache n'est jamais modifié)
+        """
+        result = self.cache.get(key)
+        if result is None:
+            result = compute()
+            self.cache.put(key, result)
+        return result.copy()
+    
+    def _pandemie_range(self, pandemic):
+        """
+        Retourne les indices des lignes d'une pandémie
+        
+        Args:
+            pandemic (str): Type de pandémie
+        
+        Returns:
+            tuple: (premier indice, indice de fin), ou None si la pandémie est inconnue
+        """
+        pandemie_id = self._pandemie_ids.get(pandemic)
+        if pandemie_id is None:
+            print(f"Pandémie inconnue: {pandemic}")
+            return None
+        lo = np.searchsorted(self._group_keys, pandemie_id * self._stride, side='left')
+        hi = np.searchsorted(self._group_keys, (pandemie_id + 1) * self._stride, side='left')
+        return lo, hi
+    
+    def series(self, country, pandemic, start=None, end=None):
+        """
+        Retourne la série temporelle d'un pays pour une pandémie
+        
+        Args:
+            country (str): Pays
+            pandemic (str): Type de pandémie
+            start: Première date (incluse), None pour le début
+            end: Dernière date (incluse), None pour la fin
+        
+        Returns:
+            DataFrame: Colonnes date_value, total_cases, total_deaths,
+                new_cases et new_deaths, triées par date
+        """
+        start, end = self._date_value(start), self._date_value(end)
+        return self._cached(('series', country, pandemic, start, end),
+                            lambda: self._series(country, pandemic, start, end))
+    
+    def _series(self, country, pandemic, start, end):
+        location_id = self._location_ids.get(country)
+        pandemie_id = self._pandemie_ids.get(pandemic)
+        if location_id is None or pandemie_id is None:
+            print(f"Série inconnue: {country}, {pandemic}")
+            return pd.DataFrame(columns=['date_value'] + VALUE_COLUMNS)
+        
+        key = pandemie_id * self._stride + location_id
+        lo = np.searchsorted(self._group_keys, key, side='left')
+        hi = np.searchsorted(self._group_keys, key, side='right')
+        dates = self._dates[lo:hi]
+        if start is not None:
+            lo += np.searchsorted(dates, start, side='left')
+        if end is not None:
+            hi = lo + np.searchsorted(self._dates[lo:hi], end, side='right')
+        
+        result = {'date_value': self._dates[lo:hi]}
+        result.update({column: values[lo:hi] for column, values in self._values.items()})
+        return pd.DataFrame(result)
+    
+    def latest_totals(self, pandemic):
+        """
+        Retourne les derniers cumuls de chaque pays pour une pandémie
+        
+        Args:
+            pandemic (str): Type de pandémie
+        
+        Returns:
+            DataFrame: Colonnes country, continent, date_value, total_cases et
+                total_deaths, par cumul de cas décroissant
+        """
+        return self._cached(('latest_totals', pandemic), lambda: self._latest_totals(pandemic))
+    
+    def _latest_totals(self, pandemic):
+        columns = ['country', 'continent', 'date_value', 'total_cases', 'total_deaths']
+        rows = self._pandemie_range(pandemic)
+        if rows is None:
+            return pd.DataFrame(columns=columns)
+        
+        # Dernière ligne de chaque groupe (les dates sont triées dans chaque groupe)
+        first = np.searchsorted(self._group_starts, rows[0], side='left')
+        last = np.searchsorted(self._group_starts, rows[1], side='left')
+        ends = self._group_ends[first:last] - 1
+        
+        result = self.location.loc[self._location_ids_sorted[ends]].reset_index(drop=True)
+        result['date_value'] = self._dates[ends]
+        result['total_cases'] = self._values['total_cases'][ends]
+        result['total_deaths'] = self._values['total_deaths'][ends]
+        return result.sort_values('total_cases', ascending=False, kind='stable').reset_index(drop=True)[columns]
+    
+    def top_countries(self, pandemic, n=10, column='new_cases', start=None, end=None):
+        """
+        Retourne les n pays ayant la plus grande somme d'une colonne sur une période
+        
+        Args:
+            pandemic (str): Type de pandémie
+            n (int): Nombre de pays
+            column (str): Colonne sommée ('new_cases' ou 'new_deaths')
+            start: Première date (incluse), None pour le début
+            end: Dernière date (incluse), None pour la fin
+        
+        Returns:
+            DataFrame: Colonnes country, continent et la colonne sommée, par
+                somme décroissante
+        """
+        start, end = self._date_value(start), self._date_value(end)
+        return self._cached(('top_countries', pandemic, n, column, start, end),
+                            lambda: self._top_countries(pandemic, n, column, start, end))
+    
+    def _top_countries(self, pandemic, n, column, start, end):
+        rows = self._pandemie_range(pandemic)
+        if rows is None:
+            return pd.DataFrame(columns=['country', 'continent', column])
+        
+        lo, hi = rows
+        dates = self._dates[lo:hi]
+        mask = np.ones(hi - lo, dtype=bool)
+        if start is not None:
+            mask &= dates >= start
+        if end is not None:
+            mask &= dates <= end
+        
+        totals = np.bincount(
+            self._location_ids_sorted[lo:hi][mask],
+            weights=self._values[column][lo:hi][mask],
+            minlength=self._stride
+        ).astype('int64')
+        present = np.zeros(self._stride, dtype=bool)
+        present[self._location_ids_sorted[lo:hi][mask]] = True
+        
+        location_ids = np.flatnonzero(present)
+        location_ids = location_ids[np.argsort(-totals[location_ids], kind='stable')[:n]]
+        result = self.location.loc[location_ids].reset_index(drop=True)
+        result[column] = totals[location_ids]
+        return result
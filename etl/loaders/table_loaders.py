@@ -5,7 +5,8 @@
 Module de chargement des données dans les tables spécifiques
 """
 
-from mysql.connector import Error
+from etl.loaders.db_errors import Error
+from etl.utils.metrics import measure
 
 class CalendrierLoader:
     """Classe responsable du chargement des données dans la table calendar"""
@@ -25,7 +26,7 @@ class CalendrierLoader:
         try:
             for _, row in df_calendar.iterrows():
                 query = "INSERT INTO calendar (id, date_value) VALUES (%s, %s)"
-                values = (int(row['id']), row['date_value'])
+                values = (int(row['id']), int(row['date_value']))
                 db_connection.cursor.execute(query, values)
             
             db_connection.conn.commit()
@@ -98,7 +99,7 @@ class DataLoader:
     """Classe responsable du chargement des données dans la table data"""
     
     @staticmethod
-    def import_data(db_connection, df_data, batch_size=1000):
+    def import_data(db_connection, df_data, batch_size=1000, metrics=None):
         """
         Importe les données dans la table data
         
@@ -106,6 +107,7 @@ class DataLoader:
             db_connection (DBConnection): Connexion à la base de données
             df_data (DataFrame): DataFrame contenant les données
             batch_size (int): Taille des lots pour l'importation
+            metrics (PipelineMetrics): Collecte des mesures par lot (optionnel)
             
         Returns:
             int: Nombre de lignes importées
@@ -114,33 +116,90 @@ class DataLoader:
             total_rows = len(df_data)
             
             for i in range(0, total_rows, batch_size):
-                batch = df_data.iloc[i:i+batch_size]
-                values_list = []
-                
-                for _, row in batch.iterrows():
-                    values = (
-                        int(row['id']),
-                        int(row['total_cases']),
-                        int(row['total_deaths']),
-                        int(row['new_cases']),
-                        int(row['new_deaths']),
-                        int(row['id_location']),
-                        int(row['id_pandemie']),
-                        int(row['id_calendar'])
-                    )
-                    values_list.append(values)
-                
-                query = """
-                INSERT INTO data (id, total_cases, total_deaths, new_cases, new_deaths, 
-                                 id_location, id_pandemie, id_calendar)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                db_connection.cursor.executemany(query, values_list)
-                db_connection.conn.commit()
-                print(f"Lot {i//batch_size + 1}/{(total_rows-1)//batch_size + 1} importé ({len(batch)} lignes)")
+                batch_number = i // batch_size + 1
+                with measure(metrics, 'db_loading', f"data lot {batch_number}") as step:
+                    batch = df_data.iloc[i:i+batch_size]
+                    values_list = []
+                    
+                    for _, row in batch.iterrows():
+                        values = (
+                            int(row['id']),
+                            int(row['total_cases']),
+                            int(row['total_deaths']),
+                            int(row['new_cases']),
+                            int(row['new_deaths']),
+                            int(row['id_location']),
+                            int(row['id_pandemie']),
+                            int(row['id_calendar'])
+                        )
+                        values_list.append(values)
+                    
+                    query = """
+                    INSERT INTO data (id, total_cases, total_deaths, new_cases, new_deaths, 
+                                     id_location, id_pandemie, id_calendar)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """
+                    # Les lignes du lot sont supprimées avant de le rejouer si la validation a pu aboutir
+                    replay_range = ('data', batch['id'].min(), batch['id'].max())
+                    db_connection.run_with_retry(
+                        DataLoader._insert_batch, db_connection, query, values_list, replay_range=replay_range)
+                    step['rows_out'] = len(batch)
+                print(f"Lot {batch_number}/{(total_rows-1)//batch_size + 1} importé ({len(batch)} lignes)")
             
             print(f"{total_rows} lignes importées dans data")
             return total_rows
         except Error as e:
             print(f"Erreur lors de l'importation dans data: {e}")
             return 0
+    
+    @staticmethod
+    def _insert_batch(db_connection, query, values_list):
+        """
+        Insère et valide un lot (rejouable après une reconnexion, voir run_with_retry)
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            query (str): Requête INSERT
+            values_list (list): Valeurs du lot
+        """
+        db_connection.cursor.executemany(query, values_list)
+        db_connection.commit()
+
+class RollupLoader:
+    """Classe responsable du chargement des tables d'agrégats"""
+    
+    @staticmethod
+    def import_data(db_connection, table_name, df_rollup, batch_size=1000):
+        """
+        Importe les données dans une table d'agrégats
+        
+        Args:
+            db_connection (DBConnection): Connexion à la base de données
+            table_name (str): Nom de la table d'agrégats
+            df_rollup (DataFrame): DataFrame contenant les données (colonnes de la table)
+            batch_size (int): Taille des lots pour l'importation
+            
+        Returns:
+            int: Nombre de lignes importées
+        """
+        try:
+            columns = list(df_rollup.columns)
+            query = f"""
+            INSERT INTO {table_name} ({', '.join(columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+            """
+            total_rows = len(df_rollup)
+            
+            for i in range(0, total_rows, batch_size):
+                batch = df_rollup.iloc[i:i+batch_size]
+                values_list = [
+                    tuple(value.item() if hasattr(value, 'item') else value for value in row)
+                    for row in batch.itertuples(index=False, name=None)
+                ]
+                db_connection.run_with_retry(DataLoader._insert_batch, db_connection, query, values_list)
+            
+            print(f"{total_rows} lignes importées dans {table_name}")
+            return total_rows
+        except Error as e:
+            print(f"Erreur lors de l'importation dans {table_name}: {e}")
+            return 0
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module d'exécution d'étapes en parallèle reliées par des files bornées
+"""
+
+import queue
+import threading
+
+# Marque de fin d'un fichier ou d'un flux dans une file
+END = object()
+
+class OverlappedStages:
+    """Classe responsable de threads d'étapes producteur/consommateur"""
+    
+    def __init__(self, queue_size=4):
+        """
+        Initialise les étapes
+        
+        Chaque étape est un thread qui lit une file et écrit dans d'autres;
+        les files sont bornées, de sorte qu'une étape rapide attend l'étape
+        suivante au lieu d'accumuler les blocs en mémoire. Une erreur dans
+        une étape arrête toutes les autres.
+        
+        Args:
+            queue_size (int): Nombre maximal de blocs en attente par file
+        """
+        self.queue_size = queue_size
+        self.stopped = threading.Event()
+        self.errors = []
+        self.threads = []
+    
+    def queue(self):
+        """
+        Crée une file bornée
+        
+        Returns:
+            Queue: File de blocs
+        """
+        return queue.Queue(self.queue_size)
+    
+    def put(self, q, item):
+        """
+        Ajoute un élément à une file, en attendant qu'elle ait de la place
+        
+        Args:
+            q (Queue): File
+            item: Élément à ajouter
+        
+        Returns:
+            bool: True si l'élément a été ajouté, False si les étapes sont arrêtées
+        """
+        while not self.stopped.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def get(self, q):
+        """
+        Retire un élément d'une file, en attendant qu'il y en ait un
+        
+        Args:
+            q (Queue): File
+        
+        Returns:
+            Élément retiré, ou END si les étapes sont arrêtées
+        """
+        while not self.stopped.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return END
+    
+    def items(self, q):
+        """
+        Parcourt les éléments d'une file jusqu'à la marque END
+        
+        Args:
+            q (Queue): File
+        
+        Yields:
+            Éléments de la file
+        """
+        while True:
+            item = self.get(q)
+            if item is END:
+                return
+            yield item
+    
+    def start(self, name, func, *args):
+        """
+        Lance une étape dans un thread
+        
+        Args:
+            name (str): Nom de l'étape
+            func (callable): Fonction de l'étape
+            *args: Arguments de la fonction
+        """
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"Erreur dans l'étape {name}: {e}")
+                self.errors.append(e)
+                self.stopped.set()
+        
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        self.threads.append(thread)
+        thread.start()
+    
+    def consumer(self, name, func):
+        """
+        Lance une étape qui applique une fonction à chaque élément d'une file
+        jusqu'à la marque END
+        
+        Args:
+            name (str): Nom de l'étape
+            func (callable): Fonction appliquée à chaque élément
+        
+        Returns:
+            Queue: File d'entrée de l'étape
+        """
+        q = self.queue()
+        
+        def consume():
+            for item in self.items(q):
+                func(item)
+        
+        self.start(name, consume)
+        return q
+    
+    def abort(self):
+        """
+        Arrête toutes les étapes et attend leur fin, sans relancer d'erreur
+        """
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+    
+    def join(self):
+        """
+        Attend la fin de toutes les étapes et relance la première erreur
+        """
+        for thread in self.threads:
+            thread.join()
+        if self.errors:
+            raise self.errors[0]
@@ -6,12 +6,47 @@ Module d'exécution du pipeline ETL
 """
 
 import os
+import tempfile
 import pandas as pd
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from etl.utils.metrics import PipelineMetrics
+from etl.transformers.dimension_index import DimensionIndex
+from etl.transformers.reference_tables import LocalisationTransformer
+from etl.transformers.rollup_tables import ROLLUP_TABLES, RollupTransformer
+from etl.transformers.data_validator import QUARANTINE_FILE, QUARANTINE_COLUMNS
+from etl.utils.partition_spill import PartitionSpill
+from etl.utils.manifest import Manifest
+from etl.pipeline.overlap import END, OverlappedStages
+
+# Fichier de l'index des dimensions conservé entre deux exécutions incrémentales
+INDEX_FILE = "dimension_index.npz"
+
+# Taille des blocs lus par les exécutions hors mémoire et avec recouvrement,
+# à défaut de --chunk-size
+DEFAULT_CHUNK_SIZE = 100000
+
+def _extract_and_transform(extractor, transformer, file_path):
+    """
+    Extrait et transforme un fichier (exécuté dans un processus de travail)
+    
+    Args:
+        extractor: Extracteur de données
+        transformer: Transformateur de données
+        file_path (str): Chemin du fichier CSV
+        
+    Returns:
+        tuple: (nombre de lignes extraites, liste de tuples (nom, DataFrame transformé))
+    """
+    raw_dataframes = extractor.extract_data([file_path])
+    extracted_rows = sum(len(df) for _, df in raw_dataframes)
+    return extracted_rows, transformer.transform_data(raw_dataframes)
 
 class PipelineExecutor:
     """Classe responsable de l'exécution du pipeline ETL"""
     
-    def __init__(self, extractor, transformer, schema_transformer, csv_loader, db_loader=None):
+    def __init__(self, extractor, transformer, schema_transformer, csv_loader, db_loader=None, workers=1,
+                 metrics=None, result_cache=None, overlap=False, queue_size=4, validator=None):
         """
         Initialise l'exécuteur du pipeline
         
@@ -21,14 +56,32 @@ class PipelineExecutor:
             schema_transformer: Transformateur de schéma
             csv_loader: Chargeur de fichiers CSV
             db_loader: Chargeur de base de données (optionnel)
+            workers (int): Nombre de processus pour l'extraction et la
+                transformation des fichiers (1 = exécution séquentielle)
+            metrics (PipelineMetrics): Collecte des mesures des étapes
+            result_cache (ResultCache): Cache des résultats de l'extraction, de
+                la transformation et de la préparation des tables (optionnel)
+            overlap (bool): Exécution par blocs avec lecture, transformation et
+                écriture dans des threads distincts reliés par des files bornées
+            queue_size (int): Nombre maximal de blocs en attente par file
+            validator (DataValidator): Validation des lignes transformées avant
+                la préparation des tables, avec mise en quarantaine (optionnel)
         """
         self.extractor = extractor
         self.transformer = transformer
         self.schema_transformer = schema_transformer
         self.csv_loader = csv_loader
         self.db_loader = db_loader
+        self.workers = workers
+        self.metrics = metrics or PipelineMetrics()
+        self.result_cache = result_cache
+        self.overlap = overlap
+        self.queue_size = queue_size
+        self.validator = validator
+        self.quarantine_path = None
+        self._quarantine_written = False
     
-    def run(self, input_files, output_dir, load_to_db=False):
+    def run(self, input_files, output_dir, load_to_db=False, chunk_size=None, partitions=None, spill_dir=None):
         """
         Exécute le pipeline ETL
         
@@ -36,10 +89,20 @@ class PipelineExecutor:
             input_files (list): Liste des fichiers d'entrée
             output_dir (str): Répertoire de sortie
             load_to_db (bool): Indique si les données doivent être chargées dans la base de données
+            chunk_size (int): Taille des blocs pour l'exécution en flux (None pour
+                tout charger en mémoire)
+            partitions (int): Nombre de partitions pour l'exécution hors mémoire
+                (None pour l'exécution en mémoire)
+            spill_dir (str): Répertoire des partitions (répertoire de sortie par défaut)
             
         Returns:
             dict: Résultats de l'exécution
         """
+        if partitions:
+            return self.run_out_of_core(input_files, output_dir, load_to_db, partitions, chunk_size, spill_dir)
+        if chunk_size or self.overlap:
+            return self.run_streaming(input_files, output_dir, load_to_db, chunk_size or DEFAULT_CHUNK_SIZE)
+        
         results = {
             'extraction': 0,
             'transformation': 0,
@@ -48,30 +111,821 @@ class PipelineExecutor:
             'db_loading': {}
         }
         
-        # Étape 1: Extraction
-        print("\n=== ÉTAPE 1: EXTRACTION ===")
-        raw_dataframes = self.extractor.extract_data(input_files)
-        results['extraction'] = sum(len(df) for _, df in raw_dataframes)
+        # Empreinte du contenu de chaque fichier pour le cache des résultats
+        file_hashes = {}
+        tables = None
+        if self.result_cache is not None:
+            file_hashes = {file_path: Manifest.file_hash(file_path) for file_path in input_files}
+        # Avec la validation, les tables sont toujours préparées (et la quarantaine écrite)
+        if self.result_cache is not None and self.validator is None:
+            schema_key = self.result_cache.key(
+                [(os.path.basename(f), file_hashes[f]) for f in input_files],
+                self.schema_transformer.vectorized, self.schema_transformer.rollups,
+                self.schema_transformer.compact, self._reconciliation_settings()
+            )
+            tables = self.result_cache.get('schema', schema_key)
         
-        # Étape 2: Transformation
-        print("\n=== ÉTAPE 2: TRANSFORMATION ===")
-        transformed_dataframes = self.transformer.transform_data(raw_dataframes)
-        results['transformation'] = sum(len(df) for _, df in transformed_dataframes)
-        
-        # Étape 3: Préparation selon le schéma SQL
-        print("\n=== ÉTAPE 3: PRÉPARATION SELON LE SCHÉMA SQL ===")
-        tables = self.schema_transformer.prepare_tables(transformed_dataframes)
+        if tables is not None:
+            # Étapes 1 à 3 déjà exécutées sur les mêmes fichiers
+            print("\n=== ÉTAPES 1-3: TABLES LUES DANS LE CACHE DES RÉSULTATS ===")
+            with self.metrics.measure('schema') as stage:
+                stage['rows_out'] = sum(len(df) for df in tables.values())
+        else:
+            transformed_dataframes = self._extract_and_transform_files(input_files, file_hashes, results)
+            transformed_dataframes = self._validate(transformed_dataframes, output_dir, results)
+            
+            # Étape 3: Préparation selon le schéma SQL
+            print("\n=== ÉTAPE 3: PRÉPARATION SELON LE SCHÉMA SQL ===")
+            with self.metrics.measure('schema', rows_in=results['transformation']) as stage:
+                tables = self.schema_transformer.prepare_tables(transformed_dataframes)
+                stage['rows_out'] = sum(len(df) for df in tables.values())
+            del transformed_dataframes
+            if self.schema_transformer.reconciler is not None:
+                results['reconciliation'] = self.schema_transformer.reconciler.finish()
+            if self.result_cache is not None and self.validator is None:
+                self.result_cache.put('schema', schema_key, tables)
         results['schema'] = {table: len(df) for table, df in tables.items()}
         
-        # Étape 4: Chargement dans des fichiers CSV
+        # Étape 4: Chargement dans des fichiers CSV (ou Parquet/Feather)
         print("\n=== ÉTAPE 4: CHARGEMENT DANS DES FICHIERS CSV ===")
-        csv_results = self.csv_loader.save_tables_to_csv(tables, output_dir)
+        csv_results = {}
+        with self.metrics.measure('csv_loading') as stage:
+            for table, df in tables.items():
+                with self.metrics.measure('csv_loading', table, rows_in=len(df)) as step:
+                    csv_results.update(self.csv_loader.save_tables({table: df}, output_dir))
+                    step['rows_out'] = len(df) if table in csv_results else 0
+            stage['rows_out'] = sum(len(tables[table]) for table in csv_results)
         results['csv_loading'] = {table: len(tables[table]) for table in csv_results.keys()}
         
+        # Stockage en colonnes de la table data: la suite du pipeline lit les
+        # colonnes projetées en mémoire au lieu de la table construite
+        data_store = self.csv_loader.open_data_store(output_dir, reset=True)
+        if data_store is not None and data_store.append(tables['data']):
+            print(f"Stockage en colonnes: {len(data_store)} lignes dans {data_store.directory}")
+            tables['data'] = data_store.read()
+        
         # Étape 5: Chargement dans la base de données (optionnel)
         if load_to_db and self.db_loader:
             print("\n=== ÉTAPE 5: CHARGEMENT DANS LA BASE DE DONNÉES ===")
-            db_results = self.db_loader.load_data(tables)
+            with self.metrics.measure('db_loading') as stage:
+                db_results = self.db_loader.load_data(tables)
+                stage['rows_out'] = sum(db_results.values())
             results['db_loading'] = db_results
         
         return results
+    
+    def _extract_and_transform_files(self, input_files, file_hashes, results):
+        """
+        Extrait et transforme les fichiers (étapes 1 et 2), en réutilisant
+        les résultats du cache pour les fichiers déjà traités
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+            file_hashes (dict): Empreinte du contenu de chaque fichier (vide
+                sans cache des résultats)
+            results (dict): Résultats de l'exécution à mettre à jour
+            
+        Returns:
+            list: Liste de tuples (nom, DataFrame transformé), dans l'ordre des fichiers
+        """
+        file_results = {}
+        if self.result_cache is not None:
+            for file_path in input_files:
+                cached = self.result_cache.get('transform', self._cache_key(file_path, file_hashes))
+                if cached is not None:
+                    print(f"Transformation lue dans le cache des résultats: {os.path.basename(file_path)}")
+                    file_results[file_path] = cached
+        missing_files = [f for f in input_files if f not in file_results]
+        
+        if self.workers > 1 and len(missing_files) > 1:
+            # Étapes 1 et 2: Extraction et transformation parallèles, un fichier par processus
+            print(f"\n=== ÉTAPES 1-2: EXTRACTION ET TRANSFORMATION ({self.workers} processus) ===")
+            with self.metrics.measure('extraction_transformation') as stage:
+                file_results.update(self._extract_and_transform_parallel(missing_files))
+                stage['rows_in'] = sum(file_results[f][0] for f in missing_files)
+                stage['rows_out'] = sum(len(df) for f in missing_files for _, df in file_results[f][1])
+        else:
+            # Étape 1: Extraction
+            print("\n=== ÉTAPE 1: EXTRACTION ===")
+            raw_dataframes = {}
+            with self.metrics.measure('extraction') as stage:
+                for file_path in missing_files:
+                    with self.metrics.measure('extraction', os.path.basename(file_path)) as step:
+                        raw_dataframes[file_path] = self._extract_file(file_path, file_hashes)
+                        step['rows_out'] = sum(len(df) for _, df in raw_dataframes[file_path])
+                extracted_rows = sum(len(df) for dataframes in raw_dataframes.values() for _, df in dataframes)
+                stage['rows_out'] = extracted_rows
+            
+            # Étape 2: Transformation
+            print("\n=== ÉTAPE 2: TRANSFORMATION ===")
+            with self.metrics.measure('transformation', rows_in=extracted_rows) as stage:
+                for file_path in missing_files:
+                    file_dataframes = []
+                    for df_name, df in raw_dataframes.pop(file_path):
+                        with self.metrics.measure('transformation', df_name, rows_in=len(df)) as step:
+                            transformed = self.transformer.transform_data([(df_name, df)])
+                            step['rows_out'] = sum(len(df) for _, df in transformed)
+                        file_dataframes.append((len(df), transformed))
+                    file_results[file_path] = (
+                        sum(rows for rows, _ in file_dataframes),
+                        [item for _, transformed in file_dataframes for item in transformed]
+                    )
+                stage['rows_out'] = sum(len(df) for f in missing_files for _, df in file_results[f][1])
+        
+        if self.result_cache is not None:
+            for file_path in missing_files:
+                self.result_cache.put('transform', self._cache_key(file_path, file_hashes), file_results[file_path])
+        
+        results['extraction'] = sum(file_results[f][0] for f in input_files)
+        transformed_dataframes = [item for f in input_files for item in file_results[f][1]]
+        results['transformation'] = sum(len(df) for _, df in transformed_dataframes)
+        return transformed_dataframes
+    
+    def _extract_file(self, file_path, file_hashes):
+        """
+        Extrait un fichier, en réutilisant le résultat du cache s'il existe
+        
+        Args:
+            file_path (str): Chemin du fichier CSV
+            file_hashes (dict): Empreinte du contenu de chaque fichier
+            
+        Returns:
+            list: Liste de tuples (nom, DataFrame brut)
+        """
+        if self.result_cache is None:
+            return self.extractor.extract_data([file_path])
+        
+        key = self._cache_key(file_path, file_hashes)
+        raw_dataframes = self.result_cache.get('raw', key)
+        if raw_dataframes is not None:
+            print(f"Extraction lue dans le cache des résultats: {os.path.basename(file_path)}")
+            return raw_dataframes
+        raw_dataframes = self.extractor.extract_data([file_path])
+        self.result_cache.put('raw', key, raw_dataframes)
+        return raw_dataframes
+    
+    def _cache_key(self, file_path, file_hashes):
+        """
+        Clé d'un fichier dans le cache des résultats: nom et contenu du fichier
+        
+        Args:
+            file_path (str): Chemin du fichier
+            file_hashes (dict): Empreinte du contenu de chaque fichier
+            
+        Returns:
+            str: Clé du résultat
+        """
+        return self.result_cache.key(os.path.basename(file_path), file_hashes[file_path])
+    
+    def _reconciliation_settings(self):
+        """
+        Réglages de la réconciliation des sources, pour la clé du cache des tables
+        
+        Returns:
+            tuple: (priorité des sources, règle), ou None sans réconciliation
+        """
+        reconciler = self.schema_transformer.reconciler
+        if reconciler is None:
+            return None
+        return tuple(reconciler.precedence), reconciler.rule
+    
+    def _validate(self, transformed_dataframes, output_dir, results, append=False):
+        """
+        Valide les DataFrames transformés et met les lignes en infraction en
+        quarantaine (sans validateur, les DataFrames sont retournés inchangés)
+        
+        Args:
+            transformed_dataframes (list): Liste de tuples (nom, DataFrame transformé)
+            output_dir (str): Répertoire de sortie (fichier de quarantaine)
+            results (dict): Résultats de l'exécution à mettre à jour
+            append (bool): Ajoute les lignes au fichier de quarantaine existant
+            
+        Returns:
+            list: Liste de tuples (nom, DataFrame des lignes valides)
+        """
+        if self.validator is None:
+            return transformed_dataframes
+        
+        print("\n=== VALIDATION DES DONNÉES ===")
+        rows_in = sum(len(df) for _, df in transformed_dataframes)
+        with self.metrics.measure('validation', rows_in=rows_in) as stage:
+            self._start_validation(output_dir, append)
+            validated_dataframes = []
+            for df_name, df in transformed_dataframes:
+                with self.metrics.measure('validation', df_name, rows_in=len(df)) as step:
+                    validated_dataframes.append((df_name, self._validate_frame(df_name, df)))
+                    step['rows_out'] = len(validated_dataframes[-1][1])
+            stage['rows_out'] = sum(len(df) for _, df in validated_dataframes)
+        results['validation'] = self._finish_validation()
+        return validated_dataframes
+    
+    def _start_validation(self, output_dir=None, append=False):
+        """
+        Commence une validation et choisit le fichier de quarantaine
+        
+        Args:
+            output_dir (str): Répertoire de sortie (None pour ne pas écrire de
+                fichier de quarantaine)
+            append (bool): Ajoute les lignes au fichier de quarantaine existant
+        """
+        self.validator.start()
+        self.quarantine_path = os.path.join(output_dir, QUARANTINE_FILE) if output_dir else None
+        self._quarantine_written = append and self.quarantine_path is not None and os.path.exists(self.quarantine_path)
+    
+    def _validate_frame(self, df_name, df):
+        """
+        Valide un DataFrame transformé et ajoute ses lignes en infraction au
+        fichier de quarantaine
+        
+        Args:
+            df_name (str): Nom du fichier source
+            df (DataFrame): DataFrame transformé (une source entière ou un bloc)
+            
+        Returns:
+            DataFrame: Lignes valides
+        """
+        df, quarantine = self.validator.validate(df_name, df)
+        if quarantine is not None and self.quarantine_path:
+            self.csv_loader.append_to_csv(quarantine, self.quarantine_path, header=not self._quarantine_written)
+            self._quarantine_written = True
+        return df
+    
+    def _finish_validation(self):
+        """
+        Termine une validation: écrit un fichier de quarantaine vide si
+        aucune ligne n'a été écartée
+        
+        Returns:
+            dict: Résultats de la validation (voir DataValidator.finish)
+        """
+        if self.quarantine_path and not self._quarantine_written:
+            self.csv_loader.append_to_csv(pd.DataFrame(columns=QUARANTINE_COLUMNS), self.quarantine_path, header=True)
+            self._quarantine_written = True
+        results = self.validator.finish()
+        if results['quarantined'] and self.quarantine_path:
+            print(f"Lignes mises en quarantaine: {self.quarantine_path}")
+        return results
+    
+    def _validate_chunks(self, df_name, dataframes):
+        """
+        Valide les blocs transformés d'une source au passage
+        
+        Args:
+            df_name (str): Nom du fichier source
+            dataframes (iterable): Blocs transformés
+            
+        Yields:
+            DataFrame: Lignes valides de chaque bloc
+        """
+        for df in dataframes:
+            yield df if self.validator is None else self._validate_frame(df_name, df)
+    
+    def run_incremental(self, input_files, output_dir, load_to_db, manifest):
+        """
+        Exécute le pipeline de façon incrémentale
+        
+        Seuls les fichiers modifiés depuis la dernière exécution sont lus. Ils
+        sont lus et transformés en entier (les comptes journaliers sont dérivés
+        des totaux cumulés précédents), puis seules leurs lignes postérieures à
+        la dernière date traitée pour chaque pays sont conservées: seules la
+        préparation selon le schéma et le chargement sont incrémentaux. Les
+        nouvelles dates et les nouveaux pays reçoivent des ids sans renuméroter
+        les existants, et la table data n'est complétée que des lignes nouvelles.
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+            output_dir (str): Répertoire de sortie
+            load_to_db (bool): Indique si les données doivent être chargées dans la base de données
+            manifest (Manifest): Manifeste des fichiers déjà traités
+            
+        Returns:
+            dict: Résultats de l'exécution
+        """
+        results = {
+            'extraction': 0,
+            'transformation': 0,
+            'schema': {},
+            'csv_loading': {},
+            'db_loading': {}
+        }
+        first_run = manifest.is_empty
+        
+        # Étape 1: Extraction des fichiers modifiés
+        print("\n=== ÉTAPE 1: EXTRACTION INCRÉMENTALE ===")
+        changed_files = [f for f in input_files if manifest.has_changed(f)]
+        for file_path in input_files:
+            if file_path not in changed_files:
+                print(f"Fichier inchangé, ignoré: {os.path.basename(file_path)}")
+        if not changed_files:
+            manifest.save()
+            print("Aucun fichier modifié depuis la dernière exécution")
+            return results
+        
+        with self.metrics.measure('extraction') as stage:
+            raw_dataframes = self.extractor.extract_data(changed_files)
+            results['extraction'] = sum(len(df) for _, df in raw_dataframes)
+            stage['rows_out'] = results['extraction']
+        
+        # Étape 2: Transformation complète des fichiers modifiés, puis sélection des lignes nouvelles
+        print("\n=== ÉTAPE 2: TRANSFORMATION ===")
+        with self.metrics.measure('transformation', rows_in=results['extraction']) as stage:
+            transformed_dataframes = [
+                (df_name, manifest.new_rows(df_name, df))
+                for df_name, df in self.transformer.transform_data(raw_dataframes)
+            ]
+            del raw_dataframes
+            results['transformation'] = sum(len(df) for _, df in transformed_dataframes)
+            stage['rows_out'] = results['transformation']
+        # Les lignes mises en quarantaine sont tout de même enregistrées dans le manifeste
+        validated_dataframes = self._validate(transformed_dataframes, output_dir, results, append=not first_run)
+        
+        # Étape 3: Préparation des tables à partir des tables existantes
+        print("\n=== ÉTAPE 3: PRÉPARATION INCRÉMENTALE SELON LE SCHÉMA SQL ===")
+        with self.metrics.measure('schema', rows_in=results['transformation']) as stage:
+            index_path = os.path.join(output_dir, INDEX_FILE)
+            index = None if first_run else DimensionIndex.load(index_path)
+            existing = {}
+            if index is not None:
+                existing['calendar'] = index.dates.to_frame()
+                existing['location'] = LocalisationTransformer.with_continents(index.countries.to_frame())
+            else:
+                for table in ['calendar', 'location']:
+                    path = os.path.join(output_dir, f"sql_{table}.csv")
+                    existing[table] = pd.DataFrame() if first_run or not os.path.exists(path) else self.extractor.extract_file(path)
+            tables = self.schema_transformer.prepare_incremental(
+                validated_dataframes, existing['calendar'], existing['location'], manifest.next_data_id
+            )
+            self.schema_transformer.index.save(index_path)
+            stage['rows_out'] = len(tables['data'])
+        if self.schema_transformer.reconciler is not None:
+            results['reconciliation'] = self.schema_transformer.reconciler.finish()
+        results['schema'] = {table: len(df) for table, df in tables.items()}
+        
+        # Étape 4: Réécriture des tables de référence et ajout des lignes data
+        print("\n=== ÉTAPE 4: CHARGEMENT DANS DES FICHIERS CSV ===")
+        with self.metrics.measure('csv_loading', rows_in=len(tables['data'])):
+            for table in ['calendar', 'location', 'pandemie']:
+                if self.csv_loader.save_to_csv(tables[table], os.path.join(output_dir, f"sql_{table}.csv")):
+                    results['csv_loading'][table] = len(tables[table])
+            data_path = os.path.join(output_dir, "sql_data.csv")
+            if first_run or not os.path.exists(data_path):
+                self.csv_loader.save_to_csv(tables['data'], data_path)
+            elif not tables['data'].empty:
+                self.csv_loader.append_to_csv(tables['data'], data_path)
+            results['csv_loading']['data'] = len(tables['data'])
+            
+            data_store = self.csv_loader.open_data_store(output_dir, reset=first_run)
+            if data_store is not None:
+                if len(data_store) == 0 and manifest.next_data_id > 1 and os.path.exists(data_path):
+                    # Stockage activé après la première exécution: reprise des lignes déjà écrites
+                    data_store.append(self.extractor.extract_file(data_path).iloc[:-len(tables['data']) or None])
+                data_store.append(tables['data'])
+        
+        # Étape 5: Chargement des lignes nouvelles dans la base de données
+        if load_to_db and self.db_loader:
+            print("\n=== ÉTAPE 5: CHARGEMENT INCRÉMENTAL DANS LA BASE DE DONNÉES ===")
+            with self.metrics.measure('db_loading') as stage:
+                if first_run:
+                    results['db_loading'] = self.db_loader.load_data(tables)
+                else:
+                    new_rows = {
+                        table: tables[table][~tables[table]['id'].isin(existing[table]['id'])]
+                        for table in ['calendar', 'location']
+                    }
+                    new_rows['data'] = tables['data']
+                    results['db_loading'] = self.db_loader.append_tables(new_rows)
+                stage['rows_out'] = sum(results['db_loading'].values())
+        
+        # Mise à jour du manifeste
+        for file_path in changed_files:
+            file_name = os.path.basename(file_path)
+            df = next((df for df_name, df in transformed_dataframes if df_name == file_name), None)
+            manifest.record(file_path, df)
+        if not tables['data'].empty:
+            manifest.next_data_id = int(tables['data']['id'].max()) + 1
+        manifest.save()
+        
+        return results
+    
+    def _extract_and_transform_parallel(self, input_files):
+        """
+        Extrait et transforme chaque fichier dans son propre processus
+        
+        Les résultats sont réunis dans l'ordre des fichiers d'entrée, de sorte
+        que les ids attribués ensuite aux tables de référence et à la table
+        data sont identiques à ceux d'une exécution séquentielle.
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+            
+        Returns:
+            dict: Pour chaque fichier, tuple (nombre de lignes extraites,
+                liste de tuples (nom, DataFrame transformé))
+        """
+        workers = min(self.workers, len(input_files))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            file_results = pool.map(
+                _extract_and_transform,
+                [self.extractor] * len(input_files),
+                [self.transformer] * len(input_files),
+                input_files
+            )
+            return dict(zip(input_files, file_results))
+    
+    def run_streaming(self, input_files, output_dir, load_to_db, chunk_size):
+        """
+        Exécute le pipeline ETL par blocs, la mémoire étant bornée par la
+        taille des blocs et non par celle des fichiers
+        
+        Une première lecture collecte les dates et pays pour construire les
+        tables de référence; la seconde transforme chaque bloc, construit les
+        lignes de la table data correspondantes et les ajoute aux sorties.
+        
+        Avec recouvrement (overlap), la lecture du fichier, l'écriture des
+        fichiers de sortie et le chargement en base ont chacun leur thread:
+        le bloc suivant est lu et transformé pendant que le précédent est
+        écrit et importé. Les files entre les étapes sont bornées, et les
+        blocs sont écrits dans l'ordre, avec les mêmes ids que sans recouvrement.
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+            output_dir (str): Répertoire de sortie
+            load_to_db (bool): Indique si les données doivent être chargées dans la base de données
+            chunk_size (int): Nombre de lignes par bloc
+            
+        Returns:
+            dict: Résultats de l'exécution
+        """
+        results = {
+            'extraction': 0,
+            'transformation': 0,
+            'schema': {},
+            'csv_loading': {},
+            'db_loading': {}
+        }
+        if self.schema_transformer.reconciler is not None:
+            # Le premier fait écrit est conservé: les sources prioritaires sont lues d'abord
+            input_files = self.schema_transformer.reconciler.order_files(input_files)
+        
+        # Étape 1: Collecte des clés des tables de référence
+        print(f"\n=== ÉTAPE 1: EXTRACTION PAR BLOCS ({chunk_size} lignes) ===")
+        key_columns = ['Date', 'date', 'Country/Region', 'location', 'country']
+        key_frames = []
+        stages = OverlappedStages(self.queue_size) if self.overlap else None
+        if self.validator is not None:
+            # Les lignes écartées à l'étape 4 sont aussi exclues des tables de référence
+            self._start_validation()
+        try:
+            with self.metrics.measure('reference_keys'):
+                for file_name, chunks in self._read_chunks(input_files, chunk_size, stages):
+                    with self.metrics.measure('reference_keys', file_name):
+                        keys = [
+                            df[[col for col in key_columns if col in df.columns]].drop_duplicates()
+                            for df in self._validate_chunks(file_name, self.transformer.transform_chunks(file_name, chunks))
+                        ]
+                    if keys:
+                        key_frames.append((file_name, pd.concat(keys, ignore_index=True).drop_duplicates()))
+                if stages is not None:
+                    stages.join()
+        except Exception:
+            if stages is not None:
+                stages.abort()
+            raise
+        
+        # Étape 2: Tables de référence
+        print("\n=== ÉTAPE 2: PRÉPARATION DES TABLES DE RÉFÉRENCE ===")
+        with self.metrics.measure('schema') as stage:
+            reference_tables = self.schema_transformer.prepare_reference_tables(key_frames)
+            stage['rows_out'] = sum(len(df) for df in reference_tables.values())
+        del key_frames
+        
+        # Étape 3: Sauvegarde des tables de référence
+        print("\n=== ÉTAPE 3: CHARGEMENT DES TABLES DE RÉFÉRENCE ===")
+        for table, df in reference_tables.items():
+            if self.csv_loader.save_to_csv(df, os.path.join(output_dir, f"sql_{table}.csv")):
+                results['csv_loading'][table] = len(df)
+            results['schema'][table] = len(df)
+        
+        tables_list = list(reference_tables.keys()) + ['data']
+        streaming_db = False
+        if load_to_db and self.db_loader:
+            db_results = self.db_loader.begin_stream(reference_tables, tables_list)
+            if db_results is not None:
+                results['db_loading'] = db_results
+                streaming_db = True
+        
+        # Étape 4: Transformation et chargement de la table data bloc par bloc
+        print("\n=== ÉTAPE 4: TRANSFORMATION ET CHARGEMENT PAR BLOCS ===")
+        data_path = os.path.join(output_dir, "sql_data.csv")
+        data_store = self.csv_loader.open_data_store(output_dir, reset=True)
+        data_rows = 0
+        id_counter = 1
+        written = {'csv': 0, 'db': 0}
+        
+        def write_files(df_data):
+            self.csv_loader.append_to_csv(df_data, data_path, header=(written['csv'] == 0))
+            if data_store is not None:
+                data_store.append(df_data)
+            written['csv'] += len(df_data)
+        
+        def load_db(df_data):
+            written['db'] += self.db_loader.append_data(df_data)
+        
+        outputs = [write_files] + ([load_db] if streaming_db else [])
+        stages = OverlappedStages(self.queue_size) if self.overlap else None
+        output_queues = []
+        if stages is not None:
+            # Les sorties consomment les blocs dans leurs propres threads
+            output_queues = [stages.consumer(output.__name__, output) for output in outputs]
+            outputs = [partial(stages.put, q) for q in output_queues]
+        if self.validator is not None:
+            self._start_validation(output_dir)
+        try:
+            with self.metrics.measure('streaming') as stage:
+                for file_name, chunks in self._read_chunks(input_files, chunk_size, stages):
+                    source_rows = 0
+                    with self.metrics.measure('streaming', file_name) as step:
+                        for df in self.transformer.transform_chunks(file_name, self._count_rows(chunks, results)):
+                            results['transformation'] += len(df)
+                            if self.validator is not None:
+                                df = self._validate_frame(file_name, df)
+                            df_data = self.schema_transformer.prepare_data_chunk(
+                                file_name, df, id_counter + source_rows)
+                            if df_data.empty:
+                                continue
+                            source_rows += len(df_data)
+                            data_rows += len(df_data)
+                            for output in outputs:
+                                output(df_data)
+                        step['rows_out'] = source_rows
+                    
+                    # Même progression des ids que DataTableTransformer.prepare
+                    id_counter += data_rows
+                if stages is not None:
+                    for q in output_queues:
+                        stages.put(q, END)
+                    stages.join()
+                stage['rows_in'] = results['extraction']
+                stage['rows_out'] = data_rows
+        except Exception:
+            if stages is not None:
+                stages.abort()
+            if streaming_db:
+                # Les tables intermédiaires incomplètes ne sont pas fusionnées
+                self.db_loader.abort_stream()
+            raise
+        if streaming_db:
+            self.db_loader.end_stream(tables_list)
+        
+        if data_rows == 0:
+            self.csv_loader.save_to_csv(pd.DataFrame(), data_path)
+        results['schema']['data'] = data_rows
+        results['csv_loading']['data'] = data_rows
+        if streaming_db:
+            results['db_loading']['data'] = written['db']
+        if self.validator is not None:
+            results['validation'] = self._finish_validation()
+        if self.schema_transformer.reconciler is not None:
+            results['reconciliation'] = self.schema_transformer.reconciler.finish()
+        
+        return results
+    
+    def run_out_of_core(self, input_files, output_dir, load_to_db, partitions, chunk_size=None, spill_dir=None):
+        """
+        Exécute le pipeline ETL hors mémoire, pour des sources plus grandes
+        que la mémoire disponible
+        
+        Les fichiers sont lus par blocs et leurs lignes réparties sur disque
+        en partitions par pays (hachage du nom). Toutes les lignes d'un pays
+        étant dans la même partition, chaque partition est transformée
+        (agrégation des provinces, nouveaux cas) et agrégée indépendamment;
+        seule une partition est en mémoire à la fois. Les tables de référence
+        sont construites à partir des dates et pays de toutes les partitions,
+        puis la table data est produite partition par partition et les
+        agrégats partiels sont fusionnés.
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+            output_dir (str): Répertoire de sortie
+            load_to_db (bool): Indique si les données doivent être chargées dans la base de données
+            partitions (int): Nombre de partitions
+            chunk_size (int): Nombre de lignes lues par bloc
+            spill_dir (str): Répertoire où créer le répertoire temporaire des
+                partitions (répertoire de sortie par défaut)
+            
+        Returns:
+            dict: Résultats de l'exécution
+        """
+        results = {
+            'extraction': 0,
+            'transformation': 0,
+            'schema': {},
+            'csv_loading': {},
+            'db_loading': {}
+        }
+        os.makedirs(spill_dir or output_dir, exist_ok=True)
+        spill = PartitionSpill(tempfile.mkdtemp(prefix="spill_", dir=spill_dir or output_dir), partitions)
+        registry = self.transformer.registry
+        file_names = []
+        if self.schema_transformer.reconciler is not None:
+            input_files = self.schema_transformer.reconciler.order_files(input_files)
+        
+        try:
+            # Étape 1: Répartition des lignes brutes en partitions sur disque
+            print(f"\n=== ÉTAPE 1: EXTRACTION ET RÉPARTITION ({partitions} partitions) ===")
+            with self.metrics.measure('extraction') as stage:
+                for i, (file_name, chunks) in enumerate(
+                        self.extractor.extract_data_chunks(input_files, chunk_size or DEFAULT_CHUNK_SIZE)):
+                    file_names.append(file_name)
+                    with self.metrics.measure('extraction', file_name) as step:
+                        rows = 0
+                        partition_column = None
+                        for j, chunk in enumerate(chunks):
+                            if j == 0:
+                                partition_column = registry.get(registry.detect(file_name, chunk.columns), 'partition_column')
+                            if partition_column in chunk.columns:
+                                rows += spill.split(f"raw{i}", chunk, partition_column)
+                            else:
+                                # Source sans clé de partition: une seule partition
+                                spill.write(f"raw{i}", 0, chunk)
+                                rows += len(chunk)
+                        step['rows_out'] = rows
+                    results['extraction'] += rows
+                stage['rows_out'] = results['extraction']
+            
+            # Étape 2: Transformation de chaque partition
+            print("\n=== ÉTAPE 2: TRANSFORMATION PAR PARTITION ===")
+            key_columns = ['Date', 'date', 'Country/Region', 'location', 'country']
+            key_frames = []
+            if self.validator is not None:
+                self._start_validation(output_dir)
+            with self.metrics.measure('transformation', rows_in=results['extraction']) as stage:
+                for i, file_name in enumerate(file_names):
+                    keys = []
+                    with self.metrics.measure('transformation', file_name) as step:
+                        rows = 0
+                        for partition in range(partitions):
+                            df = spill.read(f"raw{i}", partition)
+                            if df.empty:
+                                continue
+                            for _, df_transformed in self.transformer.transform_data([(file_name, df)]):
+                                rows += len(df_transformed)
+                                if self.validator is not None:
+                                    df_transformed = self._validate_frame(file_name, df_transformed)
+                                spill.write(f"transformed{i}", partition, df_transformed)
+                                keys.append(df_transformed[[col for col in key_columns if col in df_transformed.columns]].drop_duplicates())
+                        step['rows_out'] = rows
+                    spill.clear(f"raw{i}")
+                    if keys:
+                        key_frames.append((file_name, pd.concat(keys, ignore_index=True).drop_duplicates()))
+                    results['transformation'] += rows
+                stage['rows_out'] = results['transformation']
+            if self.validator is not None:
+                results['validation'] = self._finish_validation()
+            
+            # Étape 3: Tables de référence
+            print("\n=== ÉTAPE 3: PRÉPARATION DES TABLES DE RÉFÉRENCE ===")
+            with self.metrics.measure('schema') as stage:
+                reference_tables = self.schema_transformer.prepare_reference_tables(key_frames)
+                stage['rows_out'] = sum(len(df) for df in reference_tables.values())
+            del key_frames
+            for table, df in reference_tables.items():
+                if self.csv_loader.save_to_csv(df, os.path.join(output_dir, f"sql_{table}.csv")):
+                    results['csv_loading'][table] = len(df)
+                results['schema'][table] = len(df)
+            
+            rollups = self.schema_transformer.rollups
+            tables_list = list(reference_tables.keys()) + ['data'] + (ROLLUP_TABLES if rollups else [])
+            streaming_db = False
+            if load_to_db and self.db_loader:
+                db_results = self.db_loader.begin_stream(reference_tables, tables_list)
+                if db_results is not None:
+                    results['db_loading'] = db_results
+                    streaming_db = True
+            
+            # Étape 4: Table data partition par partition
+            print("\n=== ÉTAPE 4: PRÉPARATION ET CHARGEMENT DE LA TABLE DATA PAR PARTITION ===")
+            data_path = os.path.join(output_dir, "sql_data.csv")
+            data_store = self.csv_loader.open_data_store(output_dir, reset=True)
+            data_rows = 0
+            db_rows = 0
+            id_counter = 1
+            try:
+                with self.metrics.measure('schema', 'data', rows_in=results['transformation']) as stage:
+                    for i, file_name in enumerate(file_names):
+                        source_rows = 0
+                        for partition in range(partitions):
+                            df = spill.read(f"transformed{i}", partition)
+                            if df.empty:
+                                continue
+                            df_data = self.schema_transformer.prepare_data_chunk(
+                                file_name, df, id_counter + source_rows)
+                            if df_data.empty:
+                                continue
+                            source_rows += len(df_data)
+                            
+                            self.csv_loader.append_to_csv(df_data, data_path, header=(data_rows == 0))
+                            if data_store is not None:
+                                data_store.append(df_data)
+                            if rollups:
+                                spill.write("data", partition, df_data)
+                            data_rows += len(df_data)
+                            if streaming_db:
+                                db_rows += self.db_loader.append_data(df_data)
+                        spill.clear(f"transformed{i}")
+                        
+                        # Même progression des ids que DataTableTransformer.prepare
+                        id_counter += data_rows
+                    stage['rows_out'] = data_rows
+            except Exception:
+                if streaming_db:
+                    # Les tables intermédiaires incomplètes ne sont pas fusionnées
+                    self.db_loader.abort_stream()
+                raise
+            if streaming_db:
+                self.db_loader.end_stream(tables_list)
+            
+            if data_rows == 0:
+                self.csv_loader.save_to_csv(pd.DataFrame(), data_path)
+            results['schema']['data'] = data_rows
+            results['csv_loading']['data'] = data_rows
+            if streaming_db:
+                results['db_loading']['data'] = db_rows
+            if self.schema_transformer.reconciler is not None:
+                results['reconciliation'] = self.schema_transformer.reconciler.finish()
+            
+            # Étape 5: Agrégats partiels de chaque partition, puis fusion
+            if rollups:
+                print("\n=== ÉTAPE 5: TABLES D'AGRÉGATS PAR PARTITION ===")
+                with self.metrics.measure('schema', 'rollups', rows_in=data_rows) as stage:
+                    rollup_tables = RollupTransformer.merge([
+                        RollupTransformer.prepare_partial(
+                            spill.read("data", partition),
+                            reference_tables['calendar'],
+                            reference_tables['location']
+                        )
+                        for partition in range(partitions)
+                    ])
+                    stage['rows_out'] = sum(len(df) for df in rollup_tables.values())
+                for table, df in rollup_tables.items():
+                    if self.csv_loader.save_to_csv(df, os.path.join(output_dir, f"sql_{table}.csv")):
+                        results['csv_loading'][table] = len(df)
+                    results['schema'][table] = len(df)
+                if streaming_db:
+                    results['db_loading'].update(self.db_loader.append_tables(rollup_tables))
+        finally:
+            spill.clear()
+        
+        return results
+    
+    def _read_chunks(self, input_files, chunk_size, stages=None):
+        """
+        Lit les fichiers par blocs, dans un thread de lecture si des étapes
+        avec recouvrement sont données
+        
+        Les blocs de chaque fichier doivent être parcourus entièrement avant
+        de passer au fichier suivant.
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+            chunk_size (int): Nombre de lignes par bloc
+            stages (OverlappedStages): Étapes avec recouvrement (optionnel)
+            
+        Yields:
+            tuple: (nom_fichier, itérateur de blocs)
+        """
+        if stages is None:
+            yield from self.extractor.extract_data_chunks(input_files, chunk_size)
+            return
+        
+        chunk_queue = stages.queue()
+        
+        def read():
+            for file_name, chunks in self.extractor.extract_data_chunks(input_files, chunk_size):
+                if not stages.put(chunk_queue, file_name):
+                    return
+                for chunk in chunks:
+                    if not stages.put(chunk_queue, chunk):
+                        return
+                stages.put(chunk_queue, END)
+            stages.put(chunk_queue, END)
+        
+        stages.start('lecture', read)
+        for file_name in stages.items(chunk_queue):
+            yield file_name, stages.items(chunk_queue)
+    
+    @staticmethod
+    def _count_rows(chunks, results):
+        """
+        Compte les lignes extraites au passage des blocs
+        
+        Args:
+            chunks (iterable): Blocs de DataFrame bruts
+            results (dict): Résultats de l'exécution à mettre à jour
+            
+        Yields:
+            DataFrame: Bloc inchangé
+        """
+        for chunk in chunks:
+            results['extraction'] += len(chunk)
+            yield chunk
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de réduction des types des tables préparées (entiers étroits, catégories)
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from etl.utils.config import DEFAULT_SCHEMA_FILE
+
+# Intervalle de chaque type entier MySQL (la largeur d'affichage, int(30), ne change pas l'intervalle)
+SQL_INTEGER_LIMITS = {
+    'tinyint': (-2**7, 2**7 - 1),
+    'smallint': (-2**15, 2**15 - 1),
+    'mediumint': (-2**23, 2**23 - 1),
+    'int': (-2**31, 2**31 - 1),
+    'bigint': (-2**63, 2**63 - 1)
+}
+
+# Types numpy essayés, du plus étroit au plus large
+INTEGER_DTYPES = ['int8', 'int16', 'int32', 'int64']
+
+# Colonnes de texte répétitif stockées en catégories
+CATEGORY_COLUMNS = ('country', 'continent', 'type')
+
+# Intervalles lus dans epiviz.sql, par table et colonne
+_column_limits = {}
+
+class CompactTables:
+    """Classe responsable de la représentation compacte des tables préparées"""
+    
+    @staticmethod
+    def column_limits(schema_file=None):
+        """
+        Lit l'intervalle autorisé de chaque colonne entière du schéma SQL
+        
+        Args:
+            schema_file (str): Chemin du script SQL (epiviz.sql par défaut)
+        
+        Returns:
+            dict: Dictionnaire {table: {colonne: (minimum, maximum)}}
+        """
+        schema_file = schema_file or DEFAULT_SCHEMA_FILE
+        if schema_file not in _column_limits:
+            limits = {}
+            try:
+                with open(schema_file, 'r', encoding='utf-8') as f:
+                    sql = f.read()
+                for match in re.finditer(r'CREATE TABLE[^`]*`(\w+)`\s*\((.*?)\)\s*ENGINE', sql, re.DOTALL | re.IGNORECASE):
+                    limits[match.group(1)] = {
+                        column: SQL_INTEGER_LIMITS[sql_type.lower()]
+                        for column, sql_type in re.findall(r'`(\w+)`\s+(tinyint|smallint|mediumint|bigint|int)\b', match.group(2), re.IGNORECASE)
+                    }
+            except OSError as e:
+                print(f"Schéma SQL {schema_file} illisible ({e}), intervalles des colonnes non vérifiés")
+            _column_limits[schema_file] = limits
+        return _column_limits[schema_file]
+    
+    @staticmethod
+    def compact(df, table_name, schema_file=None):
+        """
+        Réduit les types d'une table: chaque colonne entière prend le type
+        le plus étroit qui contient ses valeurs, les colonnes de texte
+        répétitif deviennent des catégories
+        
+        Une colonne dont les valeurs dépassent l'intervalle de son type SQL
+        garde son type et est signalée: elle ne pourrait pas être chargée
+        dans la base.
+        
+        Args:
+            df (DataFrame): Table préparée
+            table_name (str): Nom de la table
+            schema_file (str): Chemin du script SQL (epiviz.sql par défaut)
+        
+        Returns:
+            DataFrame: Table aux types réduits (les valeurs sont inchangées)
+        """
+        if df.empty:
+            return df
+        limits = CompactTables.column_limits(schema_file).get(table_name, {})
+        columns = {}
+        for column in df.columns:
+            values = df[column]
+            if column in CATEGORY_COLUMNS:
+                columns[column] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+            elif pd.api.types.is_integer_dtype(values.dtype):
+                low, high = int(values.min()), int(values.max())
+                sql_low, sql_high = limits.get(column, SQL_INTEGER_LIMITS['bigint'])
+                if low < sql_low or high > sql_high:
+                    outside = int(((values < sql_low) | (values > sql_high)).sum())
+                    print(f"Table {table_name}: {outside} valeurs de {column} hors de l'intervalle du type SQL ({sql_low}, {sql_high})")
+                    columns[column] = values
+                    continue
+                dtype = next(d for d in INTEGER_DTYPES if np.iinfo(d).min <= low and high <= np.iinfo(d).max)
+                columns[column] = values.astype(dtype, copy=False)
+            else:
+                columns[column] = values
+        result = pd.DataFrame(columns, index=df.index)
+        result.attrs = df.attrs
+        return result
+    
+    @staticmethod
+    def compact_tables(tables, schema_file=None):
+        """
+        Réduit les types de toutes les tables préparées
+        
+        Args:
+            tables (dict): Dictionnaire des DataFrames préparés
+            schema_file (str): Chemin du script SQL (epiviz.sql par défaut)
+        
+        Returns:
+            dict: Dictionnaire des DataFrames aux types réduits
+        """
+        return {table: CompactTables.compact(df, table, schema_file) for table, df in tables.items()}
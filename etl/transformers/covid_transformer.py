@@ -7,6 +7,13 @@ Module de transformation des données COVID-19
 
 import pandas as pd
 import numpy as np
+from etl.transformers.read_schemas import ensure_datetime
+
+# Colonnes quotidiennes calculées à partir des cumuls (cumul -> nouveaux)
+DAILY_COUNT_COLUMNS = {
+    'Confirmed': 'New cases',
+    'Deaths': 'New deaths'
+}
 
 class CovidTransformer:
     """Classe responsable de la transformation des données COVID-19"""
@@ -26,14 +33,14 @@ class CovidTransformer:
         df_transformed = df.copy()
         
         # Conversion des colonnes de dates
-        df_transformed['Date'] = pd.to_datetime(df_transformed['Date'])
+        df_transformed['Date'] = ensure_datetime(df_transformed['Date'])
         
         # Remplacement des valeurs manquantes par 0
         for col in ['Confirmed', 'Deaths', 'Recovered', 'Active']:
             df_transformed[col] = df_transformed[col].fillna(0).astype(int)
         
         # Agrégation par pays et date
-        df_agg = df_transformed.groupby(['Country/Region', 'Date']).agg({
+        df_agg = df_transformed.groupby(['Country/Region', 'Date'], observed=True).agg({
             'Confirmed': 'sum',
             'Deaths': 'sum',
             'Recovered': 'sum',
@@ -43,6 +50,67 @@ class CovidTransformer:
         print(f"Transformation COVID Clean Complete: {len(df_agg)} lignes")
         return df_agg
     
+    @staticmethod
+    def derive_daily_counts(df, previous_totals=None, clip_negative=True):
+        """
+        Calcule les nouveaux cas et décès quotidiens de chaque pays par
+        différence entre deux cumuls successifs
+        
+        La première date d'un pays reçoit son cumul, ou la différence avec le
+        dernier cumul connu si le bloc prolonge des données déjà traitées.
+        
+        Args:
+            df (DataFrame): Données agrégées par pays et date (Confirmed, Deaths)
+            previous_totals (DataFrame): Derniers cumuls connus, indexés par pays
+            clip_negative (bool): Ramène à 0 les corrections négatives des cumuls
+            
+        Returns:
+            DataFrame: Données avec les colonnes New cases et New deaths
+        """
+        df_derived = df.copy()
+        if df_derived.empty:
+            for new_col in DAILY_COUNT_COLUMNS.values():
+                df_derived[new_col] = pd.Series(dtype='int64')
+            return df_derived
+        
+        # Tri par date dans chaque pays, seulement si nécessaire
+        by_country = df_derived.groupby('Country/Region', observed=True, sort=False)
+        if not by_country['Date'].is_monotonic_increasing.all():
+            df_derived = df_derived.sort_values(['Country/Region', 'Date'], kind='stable', ignore_index=True)
+            by_country = df_derived.groupby('Country/Region', observed=True, sort=False)
+        
+        for total_col, new_col in DAILY_COUNT_COLUMNS.items():
+            new_values = by_country[total_col].diff()
+            first = new_values.isna()
+            new_values[first] = df_derived.loc[first, total_col]
+            if previous_totals is not None and len(previous_totals):
+                previous = df_derived.loc[first, 'Country/Region'].astype(object).map(previous_totals[total_col])
+                known = previous.notna()
+                new_values[known.index[known]] = df_derived.loc[known.index[known], total_col] - previous[known]
+            if clip_negative:
+                new_values = new_values.clip(lower=0)
+            df_derived[new_col] = new_values.astype('int64')
+        
+        return df_derived
+    
+    @staticmethod
+    def last_totals(df, previous_totals=None):
+        """
+        Retourne le dernier cumul de chaque pays
+        
+        Args:
+            df (DataFrame): Données traitées (Country/Region, Date, cumuls)
+            previous_totals (DataFrame): Cumuls connus avant ces données
+            
+        Returns:
+            DataFrame: Derniers cumuls indexés par pays
+        """
+        last = df.sort_values('Date', kind='stable').groupby('Country/Region', observed=True).tail(1)
+        last = last.set_index(last['Country/Region'].astype(object))[list(DAILY_COUNT_COLUMNS.keys())]
+        if previous_totals is None:
+            return last
+        return pd.concat([previous_totals[~previous_totals.index.isin(last.index)], last])
+    
     @staticmethod
     def transform_worldometer_covid(df):
         """
@@ -58,7 +126,7 @@ class CovidTransformer:
         df_transformed = df.copy()
         
         # Conversion des colonnes de dates
-        df_transformed['date'] = pd.to_datetime(df_transformed['date'])
+        df_transformed['date'] = ensure_datetime(df_transformed['date'])
         
         # Renommage des colonnes pour correspondre au format standard
         df_transformed = df_transformed.rename(columns={
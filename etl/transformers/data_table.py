@@ -7,12 +7,20 @@ Module de préparation de la table de données principale
 
 import pandas as pd
 import numpy as np
+from etl.transformers.dimension_index import DimensionIndex, to_day_offsets
+from etl.transformers.source_registry import SourceRegistry
+
+DATA_COLUMNS = [
+    'id', 'total_cases', 'total_deaths', 'new_cases', 'new_deaths',
+    'id_location', 'id_pandemie', 'id_calendar'
+]
 
 class DataTableTransformer:
     """Classe responsable de la préparation de la table data"""
     
     @staticmethod
-    def prepare(dataframes, df_calendar, df_location, df_pandemie):
+    def prepare(dataframes, df_calendar, df_location, df_pandemie, vectorized=True, start_id=1, registry=None,
+                reconciler=None):
         """
         Prépare les données pour la table data
         
@@ -21,10 +29,21 @@ class DataTableTransformer:
             df_calendar (DataFrame): DataFrame de la table calendar
             df_location (DataFrame): DataFrame de la table location
             df_pandemie (DataFrame): DataFrame de la table pandemie
+            vectorized (bool): Utilise la construction par colonnes au lieu
+                du traitement ligne par ligne
+            start_id (int): ID de la première ligne (exécutions incrémentales)
+            registry (SourceRegistry): Registre des sources (sources connues par défaut)
+            reconciler (SourceReconciler): Réconciliation des faits donnés par
+                plusieurs sources (optionnel)
             
         Returns:
             DataFrame: DataFrame pour la table data
         """
+        registry = registry or SourceRegistry()
+        if vectorized:
+            return DataTableTransformer._prepare_vectorized(
+                dataframes, df_calendar, df_location, start_id, registry, reconciler)
+        
         # Création des dictionnaires pour les lookups
         date_to_id = dict(zip(df_calendar['date_value'], df_calendar['id']))
         country_to_id = dict(zip(df_location['country'], df_location['id']))
@@ -32,25 +51,31 @@ class DataTableTransformer:
         
         # Préparation des données
         data_rows = []
-        id_counter = 1
+        sources = []
+        id_counter = start_id
         
         for df_name, df in dataframes:
-            # Détermination du type de pandémie
-            pandemie_id = 1  # COVID-19 par défaut
-            if 'monkeypox' in df_name.lower():
-                pandemie_id = 2  # Monkeypox
+            # Détermination de la source et du type de pandémie
+            source = DataTableTransformer._get_source(registry, df_name, df)
+            pandemie_id = registry.get(source, 'pandemie_id') or 1  # COVID-19 par défaut
             
             # Traitement des données selon le format du DataFrame
-            data_rows.extend(
-                DataTableTransformer._process_dataframe(
-                    df, df_name, pandemie_id, date_to_id, country_to_id, id_counter
-                )
-            )
+            row_processor = registry.get(source, 'row_processor')
+            if row_processor:
+                source_rows = row_processor(df, pandemie_id, date_to_id, country_to_id, id_counter)
+                data_rows.extend(source_rows)
+                sources.append((source, len(source_rows)))
             id_counter += len(data_rows)
         
         # Création du DataFrame data
         if data_rows:
             df_data = pd.DataFrame(data_rows)
+            if reconciler is not None:
+                bounds = np.cumsum([0] + [rows for _, rows in sources])
+                df_data = pd.concat(reconciler.reconcile([
+                    (source, df_data.iloc[bounds[i]:bounds[i + 1]])
+                    for i, (source, _) in enumerate(sources)
+                ]), ignore_index=True)
             print(f"Préparation table data réussie: {len(df_data)} lignes")
             return df_data
         else:
@@ -58,33 +83,149 @@ class DataTableTransformer:
             return pd.DataFrame()
     
     @staticmethod
-    def _process_dataframe(df, df_name, pandemie_id, date_to_id, country_to_id, start_id):
+    def _prepare_vectorized(dataframes, df_calendar, df_location, start_id=1, registry=None, reconciler=None):
         """
-        Traite un DataFrame pour extraire les données pour la table data
+        Prépare la table data par opérations sur colonnes entières
+        
+        Produit le même résultat que le traitement ligne par ligne, y compris
+        la numérotation des ids entre les sources.
+        
+        Args:
+            dataframes (list): Liste de tuples (nom, DataFrame)
+            df_calendar (DataFrame): DataFrame de la table calendar
+            df_location (DataFrame): DataFrame de la table location
+            start_id (int): ID de la première ligne
+            registry (SourceRegistry): Registre des sources
+            reconciler (SourceReconciler): Réconciliation des faits donnés par
+                plusieurs sources (optionnel)
+            
+        Returns:
+            DataFrame: DataFrame pour la table data
+        """
+        registry = registry or SourceRegistry()
+        frames = []
+        sources = []
+        total_rows = 0
+        id_counter = start_id
+        index = DimensionIndex.from_tables(df_calendar, df_location)
+        
+        for df_name, df in dataframes:
+            source = DataTableTransformer._get_source(registry, df_name, df)
+            pandemie_id = registry.get(source, 'pandemie_id') or 1  # COVID-19 par défaut
+            
+            spec = registry.get(source, 'data_columns')
+            if spec is not None:
+                df_part = DataTableTransformer._build_frame(
+                    df, spec, pandemie_id, index, id_counter
+                )
+                if len(df_part):
+                    frames.append(df_part)
+                    sources.append(source)
+                    total_rows += len(df_part)
+            
+            # Même progression des ids que le traitement ligne par ligne
+            id_counter += total_rows
+        
+        if reconciler is not None:
+            # Les ids sont attribués avant la réconciliation: ceux des lignes conservées ne changent pas
+            frames = reconciler.reconcile(list(zip(sources, frames)))
+        
+        if frames:
+            df_data = pd.concat(frames, ignore_index=True)
+            print(f"Préparation table data réussie: {len(df_data)} lignes")
+            return df_data
+        else:
+            print("Aucune donnée à préparer pour la table data")
+            return pd.DataFrame()
+    
+    @staticmethod
+    def prepare_chunk(df_name, df, index, start_id, registry=None):
+        """
+        Prépare les lignes de la table data pour un bloc d'une source
+        
+        Args:
+            df_name (str): Nom du fichier source
+            df (DataFrame): Bloc transformé
+            index (DimensionIndex): Index des tables calendar et location
+            start_id (int): ID de la première ligne du bloc
+            registry (SourceRegistry): Registre des sources (sources connues par défaut)
+            
+        Returns:
+            DataFrame: Lignes de la table data pour ce bloc
+        """
+        registry = registry or SourceRegistry()
+        source = DataTableTransformer._get_source(registry, df_name, df)
+        spec = registry.get(source, 'data_columns')
+        if spec is None:
+            return pd.DataFrame(columns=DATA_COLUMNS)
+        return DataTableTransformer._build_frame(
+            df, spec, registry.get(source, 'pandemie_id') or 1, index, start_id
+        )
+    
+    @staticmethod
+    def _get_source(registry, df_name, df):
+        """
+        Retourne la source d'un DataFrame transformé: celle identifiée lors de
+        la transformation, ou à défaut celle du nom du fichier
+        
+        Args:
+            registry (SourceRegistry): Registre des sources
+            df_name (str): Nom du fichier source
+            df (DataFrame): DataFrame transformé
+            
+        Returns:
+            str: Nom de la source ou None si elle est inconnue
+        """
+        return df.attrs.get('source') or registry.detect(df_name)
+    
+    @staticmethod
+    def _build_frame(df, spec, pandemie_id, index, start_id):
+        """
+        Construit les lignes de la table data pour une source
         
         Args:
             df (DataFrame): DataFrame à traiter
-            df_name (str): Nom du DataFrame
+            spec (dict): Colonnes de la source (data_columns du registre des sources)
             pandemie_id (int): ID de la pandémie
-            date_to_id (dict): Dictionnaire de mapping date -> id_calendar
-            country_to_id (dict): Dictionnaire de mapping pays -> id_location
+            index (DimensionIndex): Index des tables calendar et location
             start_id (int): ID de départ pour les lignes
             
         Returns:
-            list: Liste de dictionnaires pour la table data
+            DataFrame: Lignes de la table data pour cette source
         """
-        data_rows = []
-        id_counter = start_id
+        date_col = spec['date']
+        country_col = spec['country']
+        required = [date_col, country_col]
+        if not spec['string_dates']:
+            required += [spec['total_cases'], spec['total_deaths']]
+        if any(col not in df.columns for col in required) or not len(index.dates) or not len(index.countries):
+            return pd.DataFrame(columns=DATA_COLUMNS)
         
-        # Détermination des colonnes selon le format du DataFrame
-        if 'covid_19_clean_complete' in df_name.lower():
-            return DataTableTransformer._process_covid_clean(df, pandemie_id, date_to_id, country_to_id, id_counter)
-        elif 'monkeypox' in df_name.lower():
-            return DataTableTransformer._process_monkeypox(df, pandemie_id, date_to_id, country_to_id, id_counter)
-        elif 'worldometer' in df_name.lower():
-            return DataTableTransformer._process_worldometer(df, pandemie_id, date_to_id, country_to_id, id_counter)
+        dates = df[date_col]
+        if spec['string_dates']:
+            # Seules les dates lues comme chaînes de caractères sont retenues
+            if pd.api.types.is_numeric_dtype(dates) or pd.api.types.is_datetime64_any_dtype(dates):
+                return pd.DataFrame(columns=DATA_COLUMNS)
         
-        return data_rows
+        # Recherche des ids par codes entiers (jours depuis l'époque, codes de pays)
+        calendar_ids = index.dates.lookup(to_day_offsets(dates))
+        location_ids = index.countries.lookup(df[country_col])
+        mask = (calendar_ids >= 0) & (location_ids >= 0)
+        
+        row_count = int(mask.sum())
+        df_part = pd.DataFrame({'id': np.arange(start_id, start_id + row_count, dtype='int64')})
+        for target in ['total_cases', 'total_deaths', 'new_cases', 'new_deaths']:
+            col = spec[target]
+            if col is not None and col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy()[mask]
+                df_part[target] = pd.Series(values).fillna(0).astype('int64')
+            else:
+                df_part[target] = np.zeros(row_count, dtype='int64')
+        df_part['id_location'] = location_ids[mask]
+        df_part['id_pandemie'] = np.full(row_count, pandemie_id, dtype='int64')
+        df_part['id_calendar'] = calendar_ids[mask]
+        
+        return df_part
     
     @staticmethod
     def _process_covid_clean(df, pandemie_id, date_to_id, country_to_id, start_id):
@@ -107,9 +248,9 @@ class DataTableTransformer:
                     total_cases = int(row['Confirmed']) if not pd.isna(row['Confirmed']) else 0
                     total_deaths = int(row['Deaths']) if not pd.isna(row['Deaths']) else 0
                     
-                    # Calcul des nouveaux cas/décès (non disponible directement)
-                    new_cases = 0
-                    new_deaths = 0
+                    # Nouveaux cas/décès calculés par CovidTransformer.derive_daily_counts
+                    new_cases = int(row['New cases']) if 'New cases' in row and not pd.isna(row['New cases']) else 0
+                    new_deaths = int(row['New deaths']) if 'New deaths' in row and not pd.isna(row['New deaths']) else 0
                     
                     data_rows.append({
                         'id': id_counter,
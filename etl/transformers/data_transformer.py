@@ -6,19 +6,23 @@ Module de transformation des données brutes
 """
 
 import pandas as pd
-from etl.transformers.covid_transformer import CovidTransformer
-from etl.transformers.monkeypox_transformer import MonkeypoxTransformer
+from etl.transformers.source_registry import SourceRegistry
 
 class DataTransformer:
     """Classe responsable de la transformation des données brutes"""
     
-    def __init__(self):
-        """Initialise le transformateur de données"""
-        self.transformers = {
-            'covid_19_clean_complete.csv': CovidTransformer.transform_covid_clean_complete,
-            'worldometer_coronavirus_daily_data.csv': CovidTransformer.transform_worldometer_covid,
-            'owid-monkeypox-data.csv': MonkeypoxTransformer.transform_monkeypox_data
-        }
+    def __init__(self, clip_negative_corrections=True, registry=None):
+        """
+        Initialise le transformateur de données
+        
+        Args:
+            clip_negative_corrections (bool): Ramène à 0 les nouveaux cas et
+                décès négatifs calculés lors d'une correction des cumuls
+            registry (SourceRegistry): Registre des sources (sources connues par défaut)
+        """
+        # Transformation, schéma de lecture et calcul des nouveaux cas de chaque source
+        self.registry = registry or SourceRegistry()
+        self.clip_negative_corrections = clip_negative_corrections
     
     def transform_data(self, dataframes):
         """
@@ -33,12 +37,17 @@ class DataTransformer:
         transformed_dataframes = []
         
         for df_name, df in dataframes:
-            # Recherche du transformateur approprié
-            transformer_func = self._get_transformer(df_name)
+            # Identification de la source (nom du fichier, puis en-tête)
+            source = self.registry.detect(df_name, df.columns)
+            transformer_func = self.registry.get(source, 'transform')
             
             if transformer_func:
                 # Transformation des données
                 transformed_df = transformer_func(df)
+                derive_func = self.registry.get(source, 'daily_counts')
+                if derive_func:
+                    transformed_df = derive_func(transformed_df, clip_negative=self.clip_negative_corrections)
+                transformed_df.attrs['source'] = source
                 transformed_dataframes.append((df_name, transformed_df))
                 print(f"Transformation réussie pour {df_name}")
             else:
@@ -48,23 +57,85 @@ class DataTransformer:
         
         return transformed_dataframes
     
-    def _get_transformer(self, df_name):
+    def transform_chunks(self, df_name, chunks):
+        """
+        Transforme un fichier lu par blocs
+        
+        Les lignes portant la dernière date d'un bloc sont reportées sur le
+        bloc suivant, afin qu'une agrégation par pays et date ne soit jamais
+        coupée entre deux blocs (les sources sont triées par date).
+        
+        Args:
+            df_name (str): Nom du fichier
+            chunks (iterable): Blocs de DataFrame bruts
+            
+        Yields:
+            DataFrame: Bloc transformé
+        """
+        source = None
+        transformer_func = None
+        previous_totals = None
+        
+        def transform(chunk):
+            nonlocal previous_totals
+            if not transformer_func:
+                return chunk
+            df_transformed = transformer_func(chunk)
+            derive_func = self.registry.get(source, 'daily_counts')
+            if derive_func:
+                # Les cumuls du bloc précédent servent de point de départ aux différences
+                df_transformed = derive_func(df_transformed, previous_totals, self.clip_negative_corrections)
+                previous_totals = self.registry.get(source, 'last_totals')(df_transformed, previous_totals)
+            df_transformed.attrs['source'] = source
+            return df_transformed
+        
+        carry = None
+        for i, chunk in enumerate(chunks):
+            if i == 0:
+                # La source est identifiée sur le premier bloc
+                source = self.registry.detect(df_name, chunk.columns)
+                transformer_func = self.registry.get(source, 'transform')
+                if not transformer_func:
+                    print(f"Aucun transformateur trouvé pour {df_name}, utilisation des données brutes")
+            
+            if carry is not None:
+                chunk = pd.concat([carry, chunk], ignore_index=True)
+                carry = None
+            
+            date_col = 'Date' if 'Date' in chunk.columns else 'date' if 'date' in chunk.columns else None
+            if date_col is not None and len(chunk):
+                tail = chunk[date_col] == chunk[date_col].iloc[-1]
+                carry = chunk[tail]
+                chunk = chunk[~tail]
+                if chunk.empty:
+                    continue
+            
+            yield transform(chunk)
+        
+        if carry is not None and len(carry):
+            yield transform(carry)
+    
+    def get_read_schema(self, file_path):
+        """
+        Récupère le schéma de lecture d'un fichier source
+        
+        Args:
+            file_path (str): Chemin (ou nom) du fichier
+            
+        Returns:
+            dict: Arguments de lecture (usecols, dtype, parse_dates) ou None
+        """
+        return self.registry.get(self.registry.detect_file(file_path), 'read_schema')
+    
+    def _get_transformer(self, df_name, columns=None):
         """
         Récupère la fonction de transformation appropriée pour un fichier
         
         Args:
             df_name (str): Nom du fichier
+            columns (iterable): Colonnes du fichier (optionnel)
             
         Returns:
             function: Fonction de transformation ou None si aucune n'est trouvée
         """
-        # Recherche directe par nom de fichier
-        if df_name in self.transformers:
-            return self.transformers[df_name]
-        
-        # Recherche par correspondance partielle
-        for pattern, transformer in self.transformers.items():
-            if pattern in df_name:
-                return transformer
-        
-        return None
+        return self.registry.get(self.registry.detect(df_name, columns), 'transform')
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de validation des données transformées (règles vectorisées et mise en quarantaine)
+"""
+
+import numpy as np
+import pandas as pd
+from etl.transformers.source_registry import SourceRegistry
+from etl.transformers.dimension_index import MISSING_DAY, to_day_offsets
+
+# Règles de validation, dans l'ordre des codes de motif écrits en quarantaine
+#   negative_count: cumul ou nouveaux cas/décès négatif
+#   total_decrease: cumul inférieur à un cumul antérieur du même pays
+#   date_out_of_range: date invalide ou hors de l'intervalle [min_date, max_date]
+#   unknown_country: pays absent, vide ou hors de la liste known_countries
+#   duplicate_key: (pays, date) déjà vu pour la même source (donc la même pandémie)
+VALIDATION_RULES = ('negative_count', 'total_decrease', 'date_out_of_range', 'unknown_country', 'duplicate_key')
+
+# Fichier des lignes mises en quarantaine, dans le répertoire de sortie
+QUARANTINE_FILE = "quarantine.csv"
+
+# Première date acceptée par défaut (premiers cas de COVID-19)
+DEFAULT_MIN_DATE = '2019-12-01'
+
+# Colonnes des DataFrames transformés, à défaut des colonnes data_columns du registre
+TRANSFORMED_COLUMNS = {
+    'date': 'Date',
+    'country': 'Country/Region',
+    'total_cases': 'Confirmed',
+    'total_deaths': 'Deaths',
+    'new_cases': 'New cases',
+    'new_deaths': 'New deaths'
+}
+
+COUNT_COLUMNS = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths']
+TOTAL_COLUMNS = ['total_cases', 'total_deaths']
+QUARANTINE_COLUMNS = ['source', 'reason', 'country', 'date'] + COUNT_COLUMNS
+
+class DataValidator:
+    """Classe responsable de la validation des lignes transformées avant la préparation des tables"""
+    
+    def __init__(self, rules=None, min_date=DEFAULT_MIN_DATE, max_date=None, known_countries=None, registry=None):
+        """
+        Initialise le validateur
+        
+        Args:
+            rules (list): Règles appliquées (toutes les règles de VALIDATION_RULES par défaut)
+            min_date (str): Première date acceptée
+            max_date (str): Dernière date acceptée (date du jour par défaut)
+            known_countries (list): Pays acceptés (None pour accepter tout pays non vide)
+            registry (SourceRegistry): Registre des sources (sources connues par défaut)
+        """
+        rules = list(VALIDATION_RULES if rules is None else rules)
+        for rule in rules:
+            if rule not in VALIDATION_RULES:
+                print(f"Règle de validation inconnue ignorée: {rule}")
+        self.rules = [rule for rule in VALIDATION_RULES if rule in rules]
+        self.min_date = min_date
+        self.max_date = max_date
+        self.known_countries = None if known_countries is None else pd.Index(known_countries)
+        self.registry = registry or SourceRegistry()
+        self.start()
+    
+    def start(self):
+        """
+        Commence une validation: remet à zéro les compteurs et l'état
+        conservé entre les blocs d'une même source
+        """
+        self.rows = 0
+        self.quarantined = 0
+        self.counts = {rule: 0 for rule in self.rules}
+        self._min_day = to_day_offsets([self.min_date])[0] if self.min_date else None
+        self._max_day = to_day_offsets([self.max_date or pd.Timestamp.today().normalize()])[0]
+        # Par source: plus grand cumul de chaque pays et clés (pays, date) déjà vues
+        self._max_totals = {}
+        self._seen_keys = {}
+        self._pending_keys = {}
+    
+    def validate(self, df_name, df):
+        """
+        Valide un DataFrame transformé (une source entière ou un bloc)
+        
+        Chaque règle est évaluée sur des colonnes entières. Les lignes qui
+        enfreignent au moins une règle sont retirées du DataFrame et
+        retournées avec leurs codes de motif (colonnes QUARANTINE_COLUMNS),
+        pour être écrites dans le fichier de quarantaine par l'appelant. Les
+        blocs d'une même source doivent être validés dans l'ordre des dates
+        de chaque pays: les cumuls et les clés déjà vus sont conservés d'un
+        bloc à l'autre.
+        
+        Args:
+            df_name (str): Nom du fichier source
+            df (DataFrame): DataFrame transformé
+        
+        Returns:
+            tuple: (lignes valides, le DataFrame lui-même si toutes le sont;
+                lignes mises en quarantaine, ou None si aucune)
+        """
+        source = df.attrs.get('source') or self.registry.detect(df_name)
+        columns = self._columns(df, self.registry.get(source, 'data_columns') or {})
+        if df.empty or 'date' not in columns or 'country' not in columns:
+            return df, None
+        
+        # Pays codés une fois: les règles sur les noms ne portent que sur les pays distincts
+        codes, uniques = pd.factorize(df[columns['country']])
+        uniques = pd.Index(uniques).astype('string')
+        days = to_day_offsets(df[columns['date']])
+        counts = {
+            target: pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            for target, col in columns.items() if target in COUNT_COLUMNS
+        }
+        
+        violations = {}
+        for rule in self.rules:
+            if rule == 'negative_count':
+                mask = np.zeros(len(df), dtype=bool)
+                for values in counts.values():
+                    mask |= values < 0
+            elif rule == 'total_decrease':
+                mask = self._total_decreases(source, codes, uniques, days, counts)
+            elif rule == 'date_out_of_range':
+                mask = (days == MISSING_DAY) | (days > self._max_day)
+                if self._min_day is not None:
+                    mask |= days < self._min_day
+            elif rule == 'unknown_country':
+                unknown = (uniques.str.strip() == '').to_numpy(dtype=bool, na_value=True)
+                if self.known_countries is not None:
+                    unknown = unknown | ~uniques.isin(self.known_countries)
+                # Code -1 (pays absent): dernier élément, toujours inconnu
+                mask = np.append(unknown, True)[codes]
+            else:
+                mask = self._duplicate_keys(source, codes, uniques, days)
+            violations[rule] = mask
+            self.counts[rule] += int(mask.sum())
+        
+        self.rows += len(df)
+        invalid = np.logical_or.reduce(list(violations.values())) if violations else np.zeros(len(df), dtype=bool)
+        if not invalid.any():
+            return df, None
+        
+        self.quarantined += int(invalid.sum())
+        return df[~invalid], self._quarantine(source or df_name, df, columns, violations, invalid)
+    
+    @staticmethod
+    def _columns(df, spec):
+        """
+        Retourne les colonnes validées présentes dans un DataFrame transformé
+        
+        Args:
+            df (DataFrame): DataFrame transformé
+            spec (dict): Colonnes de la source (data_columns du registre des sources)
+        
+        Returns:
+            dict: Dictionnaire {colonne de la table data: colonne du DataFrame}
+        """
+        columns = {}
+        for target, default in TRANSFORMED_COLUMNS.items():
+            col = next((c for c in [spec.get(target), default] if c is not None and c in df.columns), None)
+            if col is not None:
+                columns[target] = col
+        return columns
+    
+    def _total_decreases(self, source, codes, uniques, days, counts):
+        """
+        Repère les cumuls inférieurs au plus grand cumul antérieur du même pays
+        
+        Les lignes sont triées par pays et par date; le plus grand cumul
+        antérieur est le maximum cumulé décalé d'une ligne dans chaque pays,
+        complété par celui des blocs précédents de la source.
+        
+        Args:
+            source (str): Nom de la source
+            codes (ndarray): Code de chaque pays (-1 pour un pays absent)
+            uniques (Index): Pays distincts
+            days (ndarray): Jours depuis l'époque
+            counts (dict): Valeurs des colonnes de comptage
+        
+        Returns:
+            ndarray: Masque des lignes en infraction
+        """
+        mask = np.zeros(len(days), dtype=bool)
+        if not len(uniques):
+            return mask
+        order = np.lexsort((days, codes))
+        sorted_codes = codes[order]
+        known = sorted_codes >= 0
+        # Première et dernière ligne de chaque pays dans l'ordre trié
+        starts = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+        ends = np.r_[starts[1:], True] & known
+        previous_totals = self._max_totals.setdefault(source, {})
+        
+        for target in TOTAL_COLUMNS:
+            if target not in counts:
+                continue
+            values = counts[target][order]
+            running = pd.Series(np.where(np.isnan(values), -np.inf, values)).groupby(sorted_codes).cummax().to_numpy()
+            previous = np.r_[np.nan, running[:-1]]
+            previous[starts] = np.nan
+            if target in previous_totals:
+                prior = previous_totals[target].reindex(uniques).to_numpy(dtype='float64')
+                previous = np.fmax(previous, prior[sorted_codes])
+            mask[order[known & (values < previous)]] = True
+            
+            group_max = pd.Series(running[ends], index=uniques[sorted_codes[ends]])
+            if target in previous_totals:
+                group_max = pd.concat([previous_totals[target], group_max]).groupby(level=0).max()
+            previous_totals[target] = group_max
+        return mask
+    
+    def _duplicate_keys(self, source, codes, uniques, days):
+        """
+        Repère les clés (pays, date) déjà vues dans la source, dans ce bloc ou
+        dans un bloc précédent (la première occurrence est conservée)
+        
+        Args:
+            source (str): Nom de la source
+            codes (ndarray): Code de chaque pays (-1 pour un pays absent)
+            uniques (Index): Pays distincts
+            days (ndarray): Jours depuis l'époque
+        
+        Returns:
+            ndarray: Masque des lignes en infraction
+        """
+        # Empreinte 64 bits de chaque clé, indépendante des codes propres au bloc
+        country_hashes = np.append(pd.util.hash_array(uniques.to_numpy(dtype=object)), np.uint64(0))[codes]
+        keys = (country_hashes * np.uint64(0x100000001B3)) ^ pd.util.hash_array(days)
+        mask = pd.Series(keys).duplicated().to_numpy()
+        # Les clés d'un bloc ne sont ajoutées au tableau trié des clés vues qu'à
+        # l'arrivée du bloc suivant: une source lue d'un seul tenant n'en a pas besoin
+        seen = self._seen_keys.get(source)
+        pending = self._pending_keys.pop(source, None)
+        if pending is not None:
+            seen = np.unique(pending) if seen is None else np.union1d(seen, pending)
+            self._seen_keys[source] = seen
+        if seen is not None and len(seen):
+            positions = np.minimum(np.searchsorted(seen, keys), len(seen) - 1)
+            mask = mask | (seen[positions] == keys)
+        self._pending_keys[source] = keys
+        return mask
+    
+    def _quarantine(self, source, df, columns, violations, invalid):
+        """
+        Construit les lignes de quarantaine des lignes en infraction
+        
+        Args:
+            source (str): Nom de la source
+            df (DataFrame): DataFrame transformé
+            columns (dict): Colonnes validées du DataFrame
+            violations (dict): Masque des lignes en infraction de chaque règle
+            invalid (ndarray): Masque des lignes en infraction d'au moins une règle
+        
+        Returns:
+            DataFrame: Lignes mises en quarantaine (colonnes QUARANTINE_COLUMNS)
+        """
+        rules = list(violations.keys())
+        flags = np.column_stack([violations[rule][invalid] for rule in rules])
+        quarantine = pd.DataFrame({
+            'source': source,
+            'reason': ['|'.join(rule for rule, flag in zip(rules, row) if flag) for row in flags],
+            'country': df[columns['country']].to_numpy()[invalid],
+            'date': df[columns['date']].to_numpy()[invalid]
+        })
+        for target in COUNT_COLUMNS:
+            quarantine[target] = df[columns[target]].to_numpy()[invalid] if target in columns else np.nan
+        return quarantine
+    
+    def finish(self):
+        """
+        Termine une validation et affiche le nombre d'infractions par règle
+        
+        Returns:
+            dict: Lignes validées, lignes mises en quarantaine et nombre
+                d'infractions de chaque règle
+        """
+        print(f"Validation: {self.rows} lignes, {self.quarantined} mises en quarantaine")
+        for rule, count in self.counts.items():
+            print(f"  {rule}: {count}")
+        return {'rows': self.rows, 'quarantined': self.quarantined, **self.counts}
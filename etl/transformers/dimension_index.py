@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module d'indexation des dimensions calendar et location par codes entiers denses
+"""
+
+import numpy as np
+import pandas as pd
+
+# Code des dates manquantes ou invalides
+MISSING_DAY = np.iinfo('int64').min
+
+# Version du format du fichier d'index
+INDEX_VERSION = 1
+
+def to_day_offsets(values):
+    """
+    Convertit des dates en nombre de jours depuis le 1970-01-01
+    
+    Args:
+        values (Series): Dates (datetime ou chaînes de caractères)
+    
+    Returns:
+        ndarray: Jours depuis l'époque (int64), MISSING_DAY pour les dates invalides
+    """
+    dates = pd.Series(values)
+    if not pd.api.types.is_datetime64_dtype(dates.dtype):
+        dates = pd.to_datetime(dates, errors='coerce')
+    offsets = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype('int64')
+    offsets[dates.isna().to_numpy()] = MISSING_DAY
+    return offsets
+
+def day_offsets_to_date_values(offsets):
+    """
+    Convertit des jours depuis l'époque en entiers au format YYYYMMDD
+    
+    Args:
+        offsets (ndarray): Jours depuis l'époque
+    
+    Returns:
+        ndarray: Dates au format YYYYMMDD (int64)
+    """
+    dates = pd.DatetimeIndex(np.asarray(offsets, dtype='int64').astype('datetime64[D]'))
+    return (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(dtype='int64')
+
+def date_values_to_day_offsets(date_values):
+    """
+    Convertit des entiers au format YYYYMMDD en jours depuis l'époque
+    
+    Args:
+        date_values (array-like): Dates au format YYYYMMDD
+    
+    Returns:
+        ndarray: Jours depuis l'époque (int64)
+    """
+    return to_day_offsets(pd.to_datetime(pd.Series(date_values).astype(str), format='%Y%m%d', errors='coerce'))
+
+class DateIndex:
+    """Index des dates de la table calendar: jours depuis l'époque -> id"""
+    
+    def __init__(self, day_offsets=None, ids=None):
+        """
+        Initialise l'index
+        
+        Args:
+            day_offsets (ndarray): Jours depuis l'époque
+            ids (ndarray): Ids correspondants
+        """
+        day_offsets = np.asarray(day_offsets if day_offsets is not None else [], dtype='int64')
+        ids = np.asarray(ids if ids is not None else [], dtype='int64')
+        # Les dates sont gardées triées pour la recherche dichotomique
+        order = np.argsort(day_offsets, kind='stable')
+        self.day_offsets = day_offsets[order]
+        self.ids = ids[order]
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    @classmethod
+    def from_frame(cls, df_calendar):
+        """
+        Construit l'index à partir d'une table calendar
+        
+        Args:
+            df_calendar (DataFrame): Table calendar (id, date_value)
+        
+        Returns:
+            DateIndex: Index des dates
+        """
+        if df_calendar is None or df_calendar.empty:
+            return cls()
+        return cls(date_values_to_day_offsets(df_calendar['date_value']), df_calendar['id'].to_numpy())
+    
+    def add(self, offsets):
+        """
+        Ajoute les dates absentes de l'index, avec des ids croissants dans
+        l'ordre chronologique qui prolongent les ids existants
+        
+        Args:
+            offsets (ndarray): Jours depuis l'époque
+        
+        Returns:
+            int: Nombre de dates ajoutées
+        """
+        offsets = np.asarray(offsets, dtype='int64')
+        new_offsets = np.setdiff1d(offsets[offsets != MISSING_DAY], self.day_offsets)
+        if len(new_offsets):
+            start_id = int(self.ids.max()) + 1 if len(self.ids) else 1
+            new_ids = np.arange(start_id, start_id + len(new_offsets), dtype='int64')
+            self.__init__(np.concatenate([self.day_offsets, new_offsets]), np.concatenate([self.ids, new_ids]))
+        return len(new_offsets)
+    
+    def lookup(self, offsets):
+        """
+        Retourne l'id de chaque date
+        
+        Args:
+            offsets (ndarray): Jours depuis l'époque
+        
+        Returns:
+            ndarray: Ids (int64), -1 pour les dates absentes de l'index
+        """
+        offsets = np.asarray(offsets, dtype='int64')
+        if not len(self.day_offsets):
+            return np.full(len(offsets), -1, dtype='int64')
+        positions = np.searchsorted(self.day_offsets, offsets).clip(0, len(self.day_offsets) - 1)
+        found = self.day_offsets[positions] == offsets
+        return np.where(found, self.ids[positions], -1)
+    
+    def to_frame(self):
+        """
+        Retourne la table calendar correspondant à l'index
+        
+        Returns:
+            DataFrame: Table calendar (id, date_value) triée par id
+        """
+        order = np.argsort(self.ids, kind='stable')
+        return pd.DataFrame({
+            'id': self.ids[order],
+            'date_value': day_offsets_to_date_values(self.day_offsets[order])
+        })
+
+class CountryIndex:
+    """Index des pays de la table location: code de catégorie -> id"""
+    
+    def __init__(self, countries=None, ids=None):
+        """
+        Initialise l'index
+        
+        Args:
+            countries (array-like): Noms des pays
+            ids (array-like): Ids correspondants
+        """
+        self.countries = pd.Index(countries if countries is not None else [], dtype=object)
+        self.ids = np.asarray(ids if ids is not None else [], dtype='int64')
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    @classmethod
+    def from_frame(cls, df_location):
+        """
+        Construit l'index à partir d'une table location
+        
+        Args:
+            df_location (DataFrame): Table location (id, country, ...)
+        
+        Returns:
+            CountryIndex: Index des pays
+        """
+        if df_location is None or df_location.empty:
+            return cls()
+        return cls(df_location['country'].to_numpy(), df_location['id'].to_numpy())
+    
+    def add(self, values):
+        """
+        Ajoute les pays absents de l'index, avec des ids croissants dans
+        l'ordre alphabétique qui prolongent les ids existants
+        
+        Args:
+            values (array-like): Noms des pays (les valeurs manquantes sont ignorées)
+        
+        Returns:
+            int: Nombre de pays ajoutés
+        """
+        present = np.asarray(pd.Series(values).dropna().unique(), dtype=object)
+        new_countries = pd.Index(present, dtype=object).difference(self.countries).sort_values()
+        if len(new_countries):
+            start_id = int(self.ids.max()) + 1 if len(self.ids) else 1
+            new_ids = np.arange(start_id, start_id + len(new_countries), dtype='int64')
+            self.countries = self.countries.append(new_countries)
+            self.ids = np.concatenate([self.ids, new_ids])
+        return len(new_countries)
+    
+    def lookup(self, values):
+        """
+        Retourne l'id de chaque pays
+        
+        Les valeurs catégorielles sont résolues une fois par catégorie puis
+        par leurs codes.
+        
+        Args:
+            values (array-like): Noms des pays
+        
+        Returns:
+            ndarray: Ids (int64), -1 pour les pays absents de l'index
+        """
+        values = pd.Series(values)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            category_ids = self.lookup(values.cat.categories)
+            codes = values.cat.codes.to_numpy()
+            return np.where(codes >= 0, np.append(category_ids, -1)[codes], -1)
+        positions = self.countries.get_indexer(values)
+        return np.where(positions >= 0, np.append(self.ids, -1)[positions], -1)
+    
+    def to_frame(self):
+        """
+        Retourne les colonnes id et country de la table location
+        
+        Returns:
+            DataFrame: Table location (id, country) triée par id
+        """
+        order = np.argsort(self.ids, kind='stable')
+        return pd.DataFrame({
+            'id': self.ids[order],
+            'country': self.countries.to_numpy()[order]
+        })
+
+class DimensionIndex:
+    """Index des tables calendar et location, sauvegardable entre deux exécutions"""
+    
+    def __init__(self, dates=None, countries=None):
+        """
+        Initialise l'index
+        
+        Args:
+            dates (DateIndex): Index des dates
+            countries (CountryIndex): Index des pays
+        """
+        self.dates = dates if dates is not None else DateIndex()
+        self.countries = countries if countries is not None else CountryIndex()
+    
+    @classmethod
+    def from_tables(cls, df_calendar, df_location):
+        """
+        Construit l'index à partir des tables calendar et location
+        
+        Args:
+            df_calendar (DataFrame): Table calendar
+            df_location (DataFrame): Table location
+        
+        Returns:
+            DimensionIndex: Index des dimensions
+        """
+        return cls(DateIndex.from_frame(df_calendar), CountryIndex.from_frame(df_location))
+    
+    def save(self, path):
+        """
+        Sauvegarde l'index dans un fichier .npz
+        
+        Args:
+            path (str): Chemin du fichier
+        
+        Returns:
+            bool: True si la sauvegarde a réussi, False sinon
+        """
+        try:
+            with open(path, 'wb') as f:
+                np.savez(
+                    f,
+                    version=np.array(INDEX_VERSION),
+                    day_offsets=self.dates.day_offsets,
+                    date_ids=self.dates.ids,
+                    countries=self.countries.countries.to_numpy(dtype=str),
+                    country_ids=self.countries.ids
+                )
+            print(f"Index des dimensions sauvegardé: {path}")
+            return True
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde de l'index {path}: {e}")
+            return False
+    
+    @staticmethod
+    def load(path):
+        """
+        Charge un index sauvegardé
+        
+        Args:
+            path (str): Chemin du fichier
+        
+        Returns:
+            DimensionIndex: Index chargé, ou None si le fichier est absent,
+                illisible ou d'une autre version
+        """
+        try:
+            with np.load(path, allow_pickle=False) as content:
+                if int(content['version']) != INDEX_VERSION:
+                    print(f"Version de l'index {path} incompatible, index ignoré")
+                    return None
+                return DimensionIndex(
+                    DateIndex(content['day_offsets'], content['date_ids']),
+                    CountryIndex(content['countries'].astype(object), content['country_ids'])
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Erreur lors du chargement de l'index {path}: {e}")
+            return None
@@ -5,8 +5,8 @@
 Module de transformation des données de la variole du singe (Monkeypox)
 """
 
-import pandas as pd
 import numpy as np
+from etl.transformers.read_schemas import ensure_datetime
 
 class MonkeypoxTransformer:
     """Classe responsable de la transformation des données de la variole du singe"""
@@ -26,7 +26,7 @@ class MonkeypoxTransformer:
         df_transformed = df.copy()
         
         # Conversion des colonnes de dates
-        df_transformed['date'] = pd.to_datetime(df_transformed['date'])
+        df_transformed['date'] = ensure_datetime(df_transformed['date'])
         
         # Renommage des colonnes pour correspondre au format standard
         df_transformed = df_transformed.rename(columns={
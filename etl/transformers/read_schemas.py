@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Schémas de lecture des fichiers sources: colonnes utiles, types compacts et dates
+"""
+
+import pandas as pd
+
+# Schéma de lecture de covid_19_clean_complete.csv
+COVID_CLEAN_SCHEMA = {
+    'usecols': ['Country/Region', 'Date', 'Confirmed', 'Deaths', 'Recovered', 'Active'],
+    'dtype': {
+        'Country/Region': 'category',
+        'Confirmed': 'Int32',
+        'Deaths': 'Int32',
+        'Recovered': 'Int32',
+        'Active': 'Int32'
+    },
+    'parse_dates': ['Date']
+}
+
+# Schéma de lecture de worldometer_coronavirus_daily_data.csv
+WORLDOMETER_SCHEMA = {
+    'usecols': [
+        'date', 'country', 'cumulative_total_cases', 'daily_new_cases',
+        'cumulative_total_deaths', 'daily_new_deaths'
+    ],
+    'dtype': {
+        'country': 'category',
+        'cumulative_total_cases': 'Int64',
+        'daily_new_cases': 'Int32',
+        'cumulative_total_deaths': 'Int32',
+        'daily_new_deaths': 'Int32'
+    },
+    'parse_dates': ['date']
+}
+
+# Schéma de lecture de owid-monkeypox-data.csv (seules 6 colonnes sur plusieurs dizaines sont utilisées)
+MONKEYPOX_SCHEMA = {
+    'usecols': ['location', 'date', 'total_cases', 'total_deaths', 'new_cases', 'new_deaths'],
+    'dtype': {
+        'location': 'category',
+        'total_cases': 'Int32',
+        'total_deaths': 'Int32',
+        'new_cases': 'Int32',
+        'new_deaths': 'Int32'
+    },
+    'parse_dates': ['date']
+}
+
+def ensure_datetime(series):
+    """
+    Convertit une colonne en dates si elle n'a pas déjà été lue comme telle
+    
+    Args:
+        series (Series): Colonne de dates
+        
+    Returns:
+        Series: Colonne de type datetime64
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series)
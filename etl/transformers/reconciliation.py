@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de réconciliation des sources qui donnent les mêmes faits (même pays, date et pandémie)
+"""
+
+import numpy as np
+import pandas as pd
+from etl.transformers.source_registry import SourceRegistry
+
+# Règles de réconciliation
+#   precedence: le fait de la source prioritaire est conservé tel quel
+#   max: le fait de la source prioritaire prend, pour chaque compte, le
+#       maximum des sources (exécution complète et incrémentale uniquement)
+RECONCILIATION_RULES = ('precedence', 'max')
+
+# Clé d'un fait de la table data
+KEY_COLUMNS = ['id_pandemie', 'id_location', 'id_calendar']
+METRIC_COLUMNS = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths']
+
+class SourceReconciler:
+    """Classe responsable de la réconciliation des lignes de la table data entre sources"""
+    
+    def __init__(self, precedence=None, rule='precedence', registry=None):
+        """
+        Initialise la réconciliation
+        
+        Args:
+            precedence (list): Sources par priorité décroissante; les sources
+                absentes suivent, dans l'ordre du registre des sources
+            rule (str): Règle de réconciliation ('precedence' ou 'max')
+            registry (SourceRegistry): Registre des sources (sources connues par défaut)
+        """
+        if rule not in RECONCILIATION_RULES:
+            print(f"Règle de réconciliation inconnue: {rule}, règle 'precedence' utilisée")
+            rule = 'precedence'
+        self.rule = rule
+        self.registry = registry or SourceRegistry()
+        self.precedence = list(precedence or [])
+        self.start()
+    
+    def rank(self, source):
+        """
+        Retourne le rang de priorité d'une source (0 pour la plus prioritaire)
+        
+        Args:
+            source (str): Nom de la source
+        
+        Returns:
+            int: Rang de la source
+        """
+        order = self.precedence + [name for name in self.registry.sources if name not in self.precedence]
+        return order.index(source) if source in order else len(order)
+    
+    def order_files(self, input_files):
+        """
+        Trie les fichiers d'entrée par priorité de leur source, pour les
+        exécutions par blocs où le premier fait écrit est conservé
+        
+        Args:
+            input_files (list): Liste des fichiers d'entrée
+        
+        Returns:
+            list: Fichiers triés (ordre d'origine à priorité égale)
+        """
+        return sorted(input_files, key=lambda file_path: self.rank(self.registry.detect_file(file_path)))
+    
+    def start(self):
+        """Remet à zéro les clés vues et les compteurs"""
+        self.rows = 0
+        self.duplicates = {}
+        # Clés conservées de chaque source, et index des clés des autres sources
+        self._keys = {}
+        self._other_keys = {}
+    
+    @staticmethod
+    def keys(df_data):
+        """
+        Calcule l'empreinte 64 bits de la clé (pandémie, pays, date) de chaque ligne
+        
+        Args:
+            df_data (DataFrame): Lignes de la table data
+        
+        Returns:
+            ndarray: Empreintes (uint64)
+        """
+        return pd.util.hash_pandas_object(df_data[KEY_COLUMNS], index=False).to_numpy()
+    
+    def _index_other_keys(self, source):
+        """
+        Retourne l'index des clés déjà conservées pour les autres sources,
+        reconstruit seulement si elles ont changé (changement de source)
+        
+        Args:
+            source (str): Nom de la source
+        
+        Returns:
+            Index: Clés uniques des autres sources
+        """
+        arrays = [keys for name, parts in self._keys.items() if name != source for keys in parts]
+        count = sum(len(keys) for keys in arrays)
+        cached = self._other_keys.get(source)
+        if cached is None or cached[0] != count:
+            values = pd.unique(np.concatenate(arrays)) if arrays else np.empty(0, dtype='uint64')
+            self._other_keys[source] = (count, pd.Index(values))
+        return self._other_keys[source][1]
+    
+    def _duplicates(self, source, df_data):
+        """
+        Repère les lignes dont le fait a déjà été donné par une autre source
+        et enregistre les clés des autres lignes
+        
+        Args:
+            source (str): Nom de la source
+            df_data (DataFrame): Lignes de la table data de la source
+        
+        Returns:
+            tuple: (masque des lignes en double, empreintes des clés)
+        """
+        keys = self.keys(df_data)
+        other = self._index_other_keys(source)
+        duplicate = other.get_indexer(keys) >= 0 if len(other) else np.zeros(len(keys), dtype=bool)
+        self._keys.setdefault(source, []).append(keys[~duplicate])
+        self.rows += len(df_data)
+        if duplicate.any():
+            self.duplicates[source] = self.duplicates.get(source, 0) + int(duplicate.sum())
+        return duplicate, keys
+    
+    def reconcile_chunk(self, source, df_data):
+        """
+        Réconcilie un bloc de la table data: les faits déjà donnés par une
+        autre source sont retirés (les sources doivent arriver par priorité
+        décroissante, voir order_files)
+        
+        Args:
+            source (str): Nom de la source
+            df_data (DataFrame): Lignes de la table data du bloc
+        
+        Returns:
+            DataFrame: Lignes conservées
+        """
+        if df_data.empty:
+            return df_data
+        duplicate, _ = self._duplicates(source, df_data)
+        return df_data[~duplicate] if duplicate.any() else df_data
+    
+    def reconcile(self, parts):
+        """
+        Réconcilie les lignes de la table data de toutes les sources: un seul
+        fait par clé (pandémie, pays, date), celui de la source prioritaire
+        
+        Les sources sont parcourues par priorité, quel que soit leur ordre;
+        chaque clé est cherchée dans un index (table de hachage) des clés des
+        sources déjà parcourues. Les ids des lignes conservées sont inchangés.
+        
+        Args:
+            parts (list): Liste de tuples (source, lignes de la table data)
+        
+        Returns:
+            list: Lignes conservées de chaque source, dans l'ordre de parts
+        """
+        self.start()
+        results = [df_data for _, df_data in parts]
+        dropped = []
+        for i in sorted(range(len(parts)), key=lambda i: self.rank(parts[i][0])):
+            source, df_data = parts[i]
+            if df_data.empty:
+                continue
+            duplicate, keys = self._duplicates(source, df_data)
+            if duplicate.any():
+                results[i] = df_data[~duplicate]
+                dropped.append(df_data[METRIC_COLUMNS][duplicate].assign(key=keys[duplicate]))
+        
+        if self.rule == 'max' and dropped:
+            best = pd.concat(dropped, ignore_index=True).groupby('key')[METRIC_COLUMNS].max()
+            results = [self._merge_max(df_data, best) for df_data in results]
+        return results
+    
+    def _merge_max(self, df_data, best):
+        """
+        Applique la règle 'max': chaque compte d'un fait conservé prend le
+        maximum de ceux des faits retirés de même clé
+        
+        Args:
+            df_data (DataFrame): Lignes conservées d'une source
+            best (DataFrame): Plus grands comptes des lignes retirées, par empreinte de clé
+        
+        Returns:
+            DataFrame: Lignes conservées aux comptes fusionnés
+        """
+        if df_data.empty:
+            return df_data
+        positions = best.index.get_indexer(self.keys(df_data))
+        found = positions >= 0
+        if not found.any():
+            return df_data
+        df_data = df_data.copy()
+        for col in METRIC_COLUMNS:
+            values = df_data[col].to_numpy()
+            others = best[col].to_numpy()[np.where(found, positions, 0)]
+            df_data[col] = np.where(found, np.maximum(values, others), values).astype(values.dtype)
+        return df_data
+    
+    def finish(self):
+        """
+        Affiche le nombre de faits retirés par source
+        
+        Returns:
+            dict: Lignes examinées, lignes retirées et lignes retirées par source
+        """
+        removed = sum(self.duplicates.values())
+        print(f"Réconciliation des sources: {self.rows} lignes, {removed} faits déjà donnés par une source prioritaire retirés")
+        for source, count in self.duplicates.items():
+            print(f"  {source}: {count}")
+        return {'rows': self.rows, 'duplicates': removed, 'by_source': dict(self.duplicates)}
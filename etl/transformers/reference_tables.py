@@ -5,8 +5,31 @@
 Module de préparation des tables de référence
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from etl.transformers.dimension_index import DateIndex, CountryIndex, to_day_offsets
+
+# Mapping simple des continents
+CONTINENT_MAPPING = {
+    'US': 'North America',
+    'China': 'Asia',
+    'United Kingdom': 'Europe',
+    'France': 'Europe',
+    'Germany': 'Europe',
+    'Italy': 'Europe',
+    'Spain': 'Europe',
+    'Russia': 'Europe',
+    'Brazil': 'South America',
+    'India': 'Asia',
+    'Japan': 'Asia',
+    'South Korea': 'Asia',
+    'Australia': 'Oceania',
+    'Canada': 'North America',
+    'Mexico': 'North America',
+    'South Africa': 'Africa',
+    'Nigeria': 'Africa',
+    'Egypt': 'Africa'
+}
 
 class CalendrierTransformer:
     """Classe responsable de la préparation de la table calendar"""
@@ -18,36 +41,53 @@ class CalendrierTransformer:
         
         Args:
             dataframes (list): Liste de tuples (nom, DataFrame)
-            
+        
         Returns:
             DataFrame: DataFrame pour la table calendar
         """
-        # Extraction des dates uniques
-        all_dates = []
+        return CalendrierTransformer.extend(None, dataframes)
+    
+    @staticmethod
+    def extend(df_existing, dataframes):
+        """
+        Ajoute à une table calendar existante les dates nouvelles, sans
+        renuméroter les dates déjà présentes
+        
+        Args:
+            df_existing (DataFrame): Table calendar existante (peut être vide ou None)
+            dataframes (list): Liste de tuples (nom, DataFrame)
+        
+        Returns:
+            DataFrame: Table calendar complétée
+        """
+        index = DateIndex.from_frame(df_existing)
+        added = index.add(CalendrierTransformer.collect_day_offsets(dataframes))
         
+        df_calendar = index.to_frame()
+        if df_existing is None or df_existing.empty:
+            print(f"Préparation table calendar réussie: {len(df_calendar)} lignes")
+        elif added:
+            print(f"{added} nouvelles valeurs de date_value ajoutées")
+        return df_calendar
+    
+    @staticmethod
+    def collect_day_offsets(dataframes):
+        """
+        Rassemble les dates de toutes les sources en jours depuis l'époque
+        
+        Args:
+            dataframes (list): Liste de tuples (nom, DataFrame)
+        
+        Returns:
+            ndarray: Jours depuis l'époque de chaque ligne
+        """
+        offsets = []
         for df_name, df in dataframes:
             if 'Date' in df.columns:
-                all_dates.extend(df['Date'].dt.date.unique())
+                offsets.append(to_day_offsets(df['Date']))
             elif 'date' in df.columns:
-                all_dates.extend(df['date'].dt.date.unique())
-        
-        # Suppression des doublons
-        unique_dates = sorted(list(set(all_dates)))
-        
-        # Création du DataFrame calendar
-        calendar_data = []
-        for i, date in enumerate(unique_dates, start=1):
-            date_obj = pd.Timestamp(date)
-            # Convertir la date en entier au format YYYYMMDD
-            date_value = int(date_obj.strftime('%Y%m%d'))
-            calendar_data.append({
-                'id': i,
-                'date_value': date_value
-            })
-        
-        df_calendar = pd.DataFrame(calendar_data)
-        print(f"Préparation table calendar réussie: {len(df_calendar)} lignes")
-        return df_calendar
+                offsets.append(to_day_offsets(df['date']))
+        return np.concatenate(offsets) if offsets else np.array([], dtype='int64')
 
 class LocalisationTransformer:
     """Classe responsable de la préparation de la table location"""
@@ -59,58 +99,53 @@ class LocalisationTransformer:
         
         Args:
             dataframes (list): Liste de tuples (nom, DataFrame)
-            
+        
         Returns:
             DataFrame: DataFrame pour la table location
         """
-        # Extraction des pays uniques
-        all_countries = []
+        return LocalisationTransformer.extend(None, dataframes)
+    
+    @staticmethod
+    def extend(df_existing, dataframes):
+        """
+        Ajoute à une table location existante les pays nouveaux, sans
+        renuméroter les pays déjà présents
         
+        Args:
+            df_existing (DataFrame): Table location existante (peut être vide ou None)
+            dataframes (list): Liste de tuples (nom, DataFrame)
+        
+        Returns:
+            DataFrame: Table location complétée
+        """
+        index = CountryIndex.from_frame(df_existing)
+        countries = []
         for df_name, df in dataframes:
-            if 'Country/Region' in df.columns:
-                all_countries.extend(df['Country/Region'].unique())
-            elif 'location' in df.columns:
-                all_countries.extend(df['location'].unique())
-            elif 'country' in df.columns:
-                all_countries.extend(df['country'].unique())
-        
-        # Suppression des doublons
-        unique_countries = sorted(list(set([c for c in all_countries if c is not None])))
-        
-        # Mapping simple des continents
-        continent_mapping = {
-            'US': 'North America',
-            'China': 'Asia',
-            'United Kingdom': 'Europe',
-            'France': 'Europe',
-            'Germany': 'Europe',
-            'Italy': 'Europe',
-            'Spain': 'Europe',
-            'Russia': 'Europe',
-            'Brazil': 'South America',
-            'India': 'Asia',
-            'Japan': 'Asia',
-            'South Korea': 'Asia',
-            'Australia': 'Oceania',
-            'Canada': 'North America',
-            'Mexico': 'North America',
-            'South Africa': 'Africa',
-            'Nigeria': 'Africa',
-            'Egypt': 'Africa'
-        }
-        
-        # Création du DataFrame location
-        location_data = []
-        for i, country in enumerate(unique_countries, start=1):
-            continent = continent_mapping.get(country, 'Unknown')
-            location_data.append({
-                'id': i,
-                'country': country,
-                'continent': continent
-            })
-        
-        df_location = pd.DataFrame(location_data)
-        print(f"Préparation table location réussie: {len(df_location)} lignes")
+            for col in ['Country/Region', 'location', 'country']:
+                if col in df.columns:
+                    countries.append(pd.Series(df[col].dropna().unique(), dtype=object))
+                    break
+        added = index.add(pd.concat(countries, ignore_index=True) if countries else [])
+        
+        df_location = LocalisationTransformer.with_continents(index.to_frame())
+        if df_existing is None or df_existing.empty:
+            print(f"Préparation table location réussie: {len(df_location)} lignes")
+        elif added:
+            print(f"{added} nouvelles valeurs de country ajoutées")
+        return df_location
+    
+    @staticmethod
+    def with_continents(df_location):
+        """
+        Ajoute la colonne continent à une table location
+        
+        Args:
+            df_location (DataFrame): Table location (id, country)
+        
+        Returns:
+            DataFrame: Table location (id, country, continent)
+        """
+        df_location['continent'] = df_location['country'].map(CONTINENT_MAPPING).fillna('Unknown')
         return df_location
 
 class PandemieTransformer:
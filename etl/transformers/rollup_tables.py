@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de préparation des tables d'agrégats (semaine, mois, continent, pandémie)
+"""
+
+import numpy as np
+import pandas as pd
+
+# Tables d'agrégats, dans l'ordre de préparation
+ROLLUP_TABLES = ['rollup_week', 'rollup_month', 'rollup_continent', 'rollup_pandemie']
+
+METRIC_COLUMNS = ['total_cases', 'total_deaths', 'new_cases', 'new_deaths']
+
+class RollupTransformer:
+    """Classe responsable de la préparation des tables d'agrégats de la table data"""
+    
+    @staticmethod
+    def prepare(df_data, df_calendar, df_location):
+        """
+        Prépare toutes les tables d'agrégats
+        
+        Args:
+            df_data (DataFrame): Table data
+            df_calendar (DataFrame): Table calendar
+            df_location (DataFrame): Table location
+        
+        Returns:
+            dict: Dictionnaire des DataFrames d'agrégats
+        """
+        if df_data.empty or df_calendar.empty:
+            print("Aucune donnée à agréger")
+            return {table: pd.DataFrame() for table in ROLLUP_TABLES}
+        
+        tables = RollupTransformer.prepare_partial(df_data, df_calendar, df_location)
+        for table, df_rollup in tables.items():
+            print(f"Préparation table {table} réussie: {len(df_rollup)} lignes")
+        return tables
+    
+    @staticmethod
+    def prepare_partial(df_data, df_calendar, df_location):
+        """
+        Prépare les tables d'agrégats d'une partie de la table data
+        
+        Args:
+            df_data (DataFrame): Lignes de la table data
+            df_calendar (DataFrame): Table calendar
+            df_location (DataFrame): Table location
+        
+        Returns:
+            dict: Dictionnaire des DataFrames d'agrégats (vides si aucune ligne)
+        """
+        if df_data.empty or df_calendar.empty:
+            return {table: pd.DataFrame() for table in ROLLUP_TABLES}
+        
+        df = RollupTransformer._with_dates(df_data, df_calendar)
+        return {
+            'rollup_week': RollupTransformer.prepare_country_period(df, 'week'),
+            'rollup_month': RollupTransformer.prepare_country_period(df, 'month'),
+            'rollup_continent': RollupTransformer.prepare_continent_day(df, df_location),
+            'rollup_pandemie': RollupTransformer.prepare_pandemie_day(df)
+        }
+    
+    @staticmethod
+    def merge(partials):
+        """
+        Fusionne les agrégats de parties de la table data disjointes par pays
+        
+        Les agrégats par pays sont complets dans leur partie et sont réunis;
+        les agrégats par continent et par pandémie sont additionnés.
+        
+        Args:
+            partials (list): Dictionnaires retournés par prepare_partial
+        
+        Returns:
+            dict: Dictionnaire des DataFrames d'agrégats
+        """
+        tables = {}
+        for table in ROLLUP_TABLES:
+            frames = [partial[table] for partial in partials if not partial[table].empty]
+            if not frames:
+                tables[table] = pd.DataFrame()
+                continue
+            df = pd.concat(frames, ignore_index=True)
+            if table in ('rollup_week', 'rollup_month'):
+                keys = ['id_location', 'id_pandemie', 'week' if table == 'rollup_week' else 'month']
+                df = df.sort_values(keys, kind='stable', ignore_index=True)
+            else:
+                keys = ['continent', 'id_pandemie', 'id_calendar'] if table == 'rollup_continent' else ['id_pandemie', 'id_calendar']
+                df = df.groupby(keys, sort=True)[[col for col in df.columns if col not in keys]].sum().reset_index()
+            tables[table] = df
+            print(f"Préparation table {table} réussie: {len(df)} lignes")
+        return tables
+    
+    @staticmethod
+    def _with_dates(df_data, df_calendar):
+        """
+        Ajoute à la table data la date de chaque ligne et ses numéros de
+        semaine ISO (YYYYWW) et de mois (YYYYMM), triés par date
+        
+        Args:
+            df_data (DataFrame): Table data
+            df_calendar (DataFrame): Table calendar
+        
+        Returns:
+            DataFrame: Colonnes utiles de la table data avec date_value, week et month
+        """
+        positions = pd.Index(df_calendar['id']).get_indexer(df_data['id_calendar'])
+        date_values = df_calendar['date_value'].to_numpy(dtype='int64')[positions]
+        
+        df = df_data[['id_location', 'id_pandemie', 'id_calendar'] + METRIC_COLUMNS].copy()
+        df['date_value'] = date_values
+        dates = pd.to_datetime(pd.Series(date_values, index=df.index).astype(str), format='%Y%m%d')
+        iso = dates.dt.isocalendar()
+        df['week'] = iso['year'].astype('int64') * 100 + iso['week'].astype('int64')
+        df['month'] = date_values // 100
+        
+        # Le dernier cumul d'une période est celui de sa dernière date
+        return df.sort_values('date_value', kind='stable')
+    
+    @staticmethod
+    def prepare_country_period(df, period):
+        """
+        Agrège la table data par pays, pandémie et période
+        
+        Args:
+            df (DataFrame): Table data avec dates (voir _with_dates)
+            period (str): 'week' ou 'month'
+        
+        Returns:
+            DataFrame: Cumuls en fin de période, nouveaux cas et décès de la
+                période et nombre de jours renseignés
+        """
+        df_rollup = df.groupby(['id_location', 'id_pandemie', period], sort=True).agg(
+            total_cases=('total_cases', 'last'),
+            total_deaths=('total_deaths', 'last'),
+            new_cases=('new_cases', 'sum'),
+            new_deaths=('new_deaths', 'sum'),
+            days=('date_value', 'nunique')
+        ).reset_index()
+        return df_rollup
+    
+    @staticmethod
+    def prepare_continent_day(df, df_location):
+        """
+        Agrège la table data par continent, pandémie et date
+        
+        Args:
+            df (DataFrame): Table data avec dates (voir _with_dates)
+            df_location (DataFrame): Table location
+        
+        Returns:
+            DataFrame: Sommes des cumuls et des nouveaux cas et décès des pays
+                de chaque continent
+        """
+        positions = pd.Index(df_location['id']).get_indexer(df['id_location'])
+        continents = np.append(df_location['continent'].to_numpy(dtype=object), 'Unknown')[positions]
+        
+        df_rollup = df.assign(continent=continents).groupby(
+            ['continent', 'id_pandemie', 'id_calendar'], sort=True
+        )[METRIC_COLUMNS].sum().reset_index()
+        return df_rollup
+    
+    @staticmethod
+    def prepare_pandemie_day(df):
+        """
+        Agrège la table data par pandémie et date, tous pays confondus
+        
+        Args:
+            df (DataFrame): Table data avec dates (voir _with_dates)
+        
+        Returns:
+            DataFrame: Sommes des cumuls et des nouveaux cas et décès, et
+                nombre de pays renseignés
+        """
+        df_rollup = df.groupby(['id_pandemie', 'id_calendar'], sort=True).agg(
+            total_cases=('total_cases', 'sum'),
+            total_deaths=('total_deaths', 'sum'),
+            new_cases=('new_cases', 'sum'),
+            new_deaths=('new_deaths', 'sum'),
+            countries=('id_location', 'nunique')
+        ).reset_index()
+        return df_rollup
@@ -5,16 +5,43 @@
 Module de préparation des données selon le schéma SQL
 """
 
+import numpy as np
 import pandas as pd
 from etl.transformers.reference_tables import CalendrierTransformer, LocalisationTransformer, PandemieTransformer
 from etl.transformers.data_table import DataTableTransformer
+from etl.transformers.dimension_index import DimensionIndex
+from etl.transformers.rollup_tables import RollupTransformer
+from etl.transformers.compact_tables import CompactTables
+from etl.utils.metrics import measure
 
 class SchemaTransformer:
     """Classe responsable de la préparation des données selon le schéma SQL"""
     
-    def __init__(self):
-        """Initialise le transformateur de schéma"""
+    def __init__(self, vectorized=True, metrics=None, rollups=False, registry=None, compact=True, reconciler=None):
+        """
+        Initialise le transformateur de schéma
+        
+        Args:
+            vectorized (bool): Construit la table data par colonnes (False pour
+                le traitement ligne par ligne d'origine)
+            metrics (PipelineMetrics): Collecte des mesures (optionnel)
+            rollups (bool): Prépare aussi les tables d'agrégats (semaine, mois,
+                continent, pandémie) à partir de la table data
+            registry (SourceRegistry): Registre des sources (celui de DataTransformer)
+            compact (bool): Réduit les types des tables préparées (entiers
+                étroits, catégories; voir CompactTables)
+            reconciler (SourceReconciler): Un seul fait par (pays, date,
+                pandémie) quand plusieurs sources le donnent (optionnel)
+        """
         self.tables = {}
+        # Index des tables calendar et location, utilisé pour les blocs et sauvegardé entre deux exécutions
+        self.index = DimensionIndex()
+        self.vectorized = vectorized
+        self.metrics = metrics
+        self.rollups = rollups
+        self.registry = registry
+        self.compact = compact
+        self.reconciler = reconciler
     
     def prepare_tables(self, dataframes):
         """
@@ -27,23 +54,132 @@ class SchemaTransformer:
             dict: Dictionnaire des DataFrames préparés
         """
         # Préparation des tables de référence
-        self.tables['calendar'] = CalendrierTransformer.prepare(dataframes)
-        self.tables['location'] = LocalisationTransformer.prepare(dataframes)
-        self.tables['pandemie'] = PandemieTransformer.prepare()
+        self.prepare_reference_tables(dataframes)
         
         # Préparation de la table de données
+        with measure(self.metrics, 'schema', 'data') as step:
+            self.tables['data'] = DataTableTransformer.prepare(
+                dataframes, 
+                self.tables['calendar'],
+                self.tables['location'],
+                self.tables['pandemie'],
+                vectorized=self.vectorized,
+                registry=self.registry,
+                reconciler=self.reconciler
+            )
+            step['rows_out'] = len(self.tables['data'])
+        
+        # Préparation des tables d'agrégats
+        if self.rollups:
+            with measure(self.metrics, 'schema', 'rollups', rows_in=len(self.tables['data'])) as step:
+                self.tables.update(RollupTransformer.prepare(
+                    self.tables['data'], self.tables['calendar'], self.tables['location']
+                ))
+                step['rows_out'] = sum(len(df) for df in self.tables.values())
+        
+        self.tables = self.compact_tables(self.tables)
+        
+        # Affichage des statistiques
+        self._print_stats()
+        
+        return self.tables
+    
+    def prepare_reference_tables(self, dataframes):
+        """
+        Prépare les tables calendar, location et pandemie
+        
+        Args:
+            dataframes (list): Liste de tuples (nom, DataFrame); seules les
+                colonnes de date et de pays sont utilisées
+            
+        Returns:
+            dict: Dictionnaire des DataFrames de référence
+        """
+        with measure(self.metrics, 'schema', 'calendar') as step:
+            self.tables['calendar'] = CalendrierTransformer.prepare(dataframes)
+            step['rows_out'] = len(self.tables['calendar'])
+        with measure(self.metrics, 'schema', 'location') as step:
+            self.tables['location'] = LocalisationTransformer.prepare(dataframes)
+            step['rows_out'] = len(self.tables['location'])
+        self.tables['pandemie'] = PandemieTransformer.prepare()
+        self.index = DimensionIndex.from_tables(self.tables['calendar'], self.tables['location'])
+        if self.reconciler is not None:
+            # Les blocs de la table data qui suivent sont réconciliés entre eux
+            self.reconciler.start()
+        return self.compact_tables({table: self.tables[table] for table in ['calendar', 'location', 'pandemie']})
+    
+    def prepare_incremental(self, dataframes, df_calendar, df_location, start_id):
+        """
+        Prépare les tables pour une exécution incrémentale: les tables de
+        référence existantes sont complétées sans renumérotation et seule la
+        partie nouvelle de la table data est construite
+        
+        Args:
+            dataframes (list): Liste de tuples (nom, DataFrame) des lignes nouvelles
+            df_calendar (DataFrame): Table calendar existante
+            df_location (DataFrame): Table location existante
+            start_id (int): ID de la première nouvelle ligne de la table data
+            
+        Returns:
+            dict: Dictionnaire des DataFrames préparés (table data = lignes nouvelles)
+        """
+        self.tables['calendar'] = CalendrierTransformer.extend(df_calendar, dataframes)
+        self.tables['location'] = LocalisationTransformer.extend(df_location, dataframes)
+        self.tables['pandemie'] = PandemieTransformer.prepare()
+        self.index = DimensionIndex.from_tables(self.tables['calendar'], self.tables['location'])
+        
         self.tables['data'] = DataTableTransformer.prepare(
-            dataframes, 
+            dataframes,
             self.tables['calendar'],
             self.tables['location'],
-            self.tables['pandemie']
+            self.tables['pandemie'],
+            vectorized=self.vectorized,
+            start_id=start_id,
+            registry=self.registry,
+            reconciler=self.reconciler
         )
+        self.tables = self.compact_tables(self.tables)
         
-        # Affichage des statistiques
         self._print_stats()
         
         return self.tables
     
+    def prepare_data_chunk(self, df_name, df, start_id):
+        """
+        Prépare un bloc de la table data à partir des tables de référence
+        
+        Args:
+            df_name (str): Nom du fichier source
+            df (DataFrame): Bloc transformé
+            start_id (int): ID de la première ligne du bloc
+            
+        Returns:
+            DataFrame: Lignes de la table data pour ce bloc
+        """
+        df_data = DataTableTransformer.prepare_chunk(
+            df_name, df, self.index, start_id, self.registry
+        )
+        if self.reconciler is not None:
+            source = df.attrs.get('source') or self.reconciler.registry.detect(df_name)
+            reconciled = self.reconciler.reconcile_chunk(source, df_data)
+            if len(reconciled) < len(df_data):
+                # Ids contigus: le bloc suivant commence après la dernière ligne conservée
+                reconciled = reconciled.assign(id=np.arange(start_id, start_id + len(reconciled), dtype='int64'))
+            df_data = reconciled
+        return CompactTables.compact(df_data, 'data') if self.compact else df_data
+    
+    def compact_tables(self, tables):
+        """
+        Réduit les types des tables si la représentation compacte est activée
+        
+        Args:
+            tables (dict): Dictionnaire des DataFrames préparés
+            
+        Returns:
+            dict: Dictionnaire des DataFrames (aux types réduits ou inchangés)
+        """
+        return CompactTables.compact_tables(tables) if self.compact else tables
+    
     def _print_stats(self):
         """Affiche les statistiques des tables préparées"""
         print("\nStatistiques des tables préparées:")
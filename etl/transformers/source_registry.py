@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de registre des sources de données (détection, schéma de lecture, transformation)
+"""
+
+import csv
+import importlib
+
+# Déclaration des sources connues. Les fonctions et les schémas sont donnés
+# par leur chemin 'module:attribut' et ne sont importés qu'à la première
+# utilisation.
+#   file_names: noms de fichiers exacts
+#   patterns: fragments du nom de fichier (en minuscules)
+#   header_signature: colonnes dont la présence dans l'en-tête identifie la source
+#   read_schema, transform, row_processor: chemins 'module:attribut'
+#   daily_counts, last_totals: calcul des nouveaux cas à partir des cumuls et
+#       derniers cumuls d'un bloc (sources qui ne donnent que des cumuls)
+#   partition_column: colonne du fichier brut qui répartit les lignes par pays
+#       (exécution hors mémoire)
+#   data_columns: colonnes lues pour la table data (None = métrique absente, vaut 0)
+#   pandemie_id: ID de la pandémie dans la table pandemie
+SOURCES = {
+    'covid_19_clean_complete': {
+        'file_names': ['covid_19_clean_complete.csv'],
+        'patterns': ['covid_19_clean_complete'],
+        'header_signature': ['Country/Region', 'Date', 'Confirmed', 'Deaths'],
+        'partition_column': 'Country/Region',
+        'read_schema': 'etl.transformers.read_schemas:COVID_CLEAN_SCHEMA',
+        'transform': 'etl.transformers.covid_transformer:CovidTransformer.transform_covid_clean_complete',
+        'daily_counts': 'etl.transformers.covid_transformer:CovidTransformer.derive_daily_counts',
+        'last_totals': 'etl.transformers.covid_transformer:CovidTransformer.last_totals',
+        'row_processor': 'etl.transformers.data_table:DataTableTransformer._process_covid_clean',
+        'data_columns': {
+            'date': 'Date',
+            'country': 'Country/Region',
+            'total_cases': 'Confirmed',
+            'total_deaths': 'Deaths',
+            'new_cases': 'New cases',
+            'new_deaths': 'New deaths',
+            'string_dates': False
+        },
+        'pandemie_id': 1
+    },
+    'worldometer': {
+        'file_names': ['worldometer_coronavirus_daily_data.csv'],
+        'patterns': ['worldometer'],
+        'header_signature': ['date', 'country', 'cumulative_total_cases', 'cumulative_total_deaths'],
+        'partition_column': 'country',
+        'read_schema': 'etl.transformers.read_schemas:WORLDOMETER_SCHEMA',
+        'transform': 'etl.transformers.covid_transformer:CovidTransformer.transform_worldometer_covid',
+        'row_processor': 'etl.transformers.data_table:DataTableTransformer._process_worldometer',
+        'data_columns': {
+            'date': 'date',
+            'country': 'country',
+            'total_cases': 'cumulative_total_cases',
+            'total_deaths': 'cumulative_total_deaths',
+            'new_cases': 'daily_new_cases',
+            'new_deaths': 'daily_new_deaths',
+            'string_dates': True
+        },
+        'pandemie_id': 1
+    },
+    'monkeypox': {
+        'file_names': ['owid-monkeypox-data.csv'],
+        'patterns': ['monkeypox'],
+        'header_signature': ['location', 'date', 'total_cases', 'total_deaths', 'new_cases', 'new_deaths'],
+        'partition_column': 'location',
+        'read_schema': 'etl.transformers.read_schemas:MONKEYPOX_SCHEMA',
+        'transform': 'etl.transformers.monkeypox_transformer:MonkeypoxTransformer.transform_monkeypox_data',
+        'row_processor': 'etl.transformers.data_table:DataTableTransformer._process_monkeypox',
+        'data_columns': {
+            'date': 'date',
+            'country': 'location',
+            'total_cases': 'total_cases',
+            'total_deaths': 'total_deaths',
+            'new_cases': 'new_cases',
+            'new_deaths': 'new_deaths',
+            'string_dates': True
+        },
+        'pandemie_id': 2
+    }
+}
+
+class SourceRegistry:
+    """Classe responsable du registre des sources de données"""
+    
+    def __init__(self, extra_sources=None):
+        """
+        Initialise le registre avec les sources connues
+        
+        Args:
+            extra_sources (dict): Sources supplémentaires {nom: déclaration}
+                (clé "sources" de la configuration), au format de SOURCES
+        """
+        self.sources = {}
+        self._resolved = {}
+        for name, declaration in SOURCES.items():
+            self.register(name, declaration)
+        for name, declaration in (extra_sources or {}).items():
+            self.register(name, declaration)
+    
+    def register(self, name, declaration):
+        """
+        Ajoute ou remplace une source
+        
+        Args:
+            name (str): Nom de la source
+            declaration (dict): Déclaration de la source (voir SOURCES)
+        """
+        self.sources[name] = dict(declaration)
+        self._resolved = {key: value for key, value in self._resolved.items() if key[0] != name}
+    
+    def detect(self, file_name, columns=None):
+        """
+        Identifie la source d'un fichier: nom exact, puis colonnes de
+        l'en-tête, puis fragment du nom
+        
+        Args:
+            file_name (str): Nom du fichier
+            columns (iterable): Colonnes de l'en-tête (optionnel)
+        
+        Returns:
+            str: Nom de la source ou None si elle est inconnue
+        """
+        for name, declaration in self.sources.items():
+            if file_name in declaration.get('file_names', []):
+                return name
+        
+        if columns is not None:
+            columns = set(columns)
+            matches = [
+                (len(declaration['header_signature']), name)
+                for name, declaration in self.sources.items()
+                if declaration.get('header_signature') and set(declaration['header_signature']) <= columns
+            ]
+            if matches:
+                # La signature la plus précise l'emporte
+                return max(matches)[1]
+        
+        lower_name = file_name.lower()
+        for name, declaration in self.sources.items():
+            if any(pattern in lower_name for pattern in declaration.get('patterns', [])):
+                return name
+        
+        return None
+    
+    def detect_file(self, file_path):
+        """
+        Identifie la source d'un fichier CSV à partir de son nom et de sa
+        première ligne
+        
+        Args:
+            file_path (str): Chemin du fichier CSV
+        
+        Returns:
+            str: Nom de la source ou None si elle est inconnue
+        """
+        file_name = file_path.replace('\\', '/').rsplit('/', 1)[-1]
+        columns = None
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                columns = next(csv.reader(f), None)
+        except (OSError, UnicodeDecodeError):
+            pass
+        return self.detect(file_name, columns)
+    
+    def get(self, name, key):
+        """
+        Retourne un élément de la déclaration d'une source, en important à
+        la demande les éléments donnés par leur chemin 'module:attribut'
+        
+        Args:
+            name (str): Nom de la source (None accepté)
+            key (str): Élément recherché (transform, read_schema, data_columns...)
+        
+        Returns:
+            Valeur de l'élément ou None
+        """
+        if name not in self.sources:
+            return None
+        value = self.sources[name].get(key)
+        if not isinstance(value, str) or ':' not in value:
+            return value
+        
+        if (name, key) not in self._resolved:
+            module_name, attribute_path = value.split(':', 1)
+            resolved = importlib.import_module(module_name)
+            for attribute in attribute_path.split('.'):
+                resolved = getattr(resolved, attribute)
+            self._resolved[(name, key)] = resolved
+        return self._resolved[(name, key)]
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de stockage en colonnes de la table data, lu par projection en mémoire
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+
+# Version du format du stockage
+STORE_VERSION = 1
+
+# Type de chaque colonne de la table data (largeur fixe)
+DATA_STORE_SCHEMA = {
+    'id': 'int64',
+    'total_cases': 'int64',
+    'total_deaths': 'int64',
+    'new_cases': 'int64',
+    'new_deaths': 'int64',
+    'id_location': 'int32',
+    'id_pandemie': 'int32',
+    'id_calendar': 'int32'
+}
+
+HEADER_FILE = "header.json"
+
+class ColumnStore:
+    """Classe responsable d'un stockage en colonnes, en ajout seul, projeté en mémoire"""
+    
+    def __init__(self, directory, schema=None):
+        """
+        Ouvre (ou prépare) un stockage en colonnes
+        
+        Chaque colonne est un fichier binaire de valeurs de largeur fixe; le
+        fichier header.json donne la version, le schéma et le nombre de lignes
+        valides. Un stockage d'une autre version ou d'un autre schéma est
+        considéré comme vide.
+        
+        Args:
+            directory (str): Répertoire du stockage
+            schema (dict): Type numpy de chaque colonne (DATA_STORE_SCHEMA par défaut)
+        """
+        self.directory = directory
+        self.schema = dict(schema or DATA_STORE_SCHEMA)
+        self.row_count = 0
+        self._load_header()
+    
+    def __len__(self):
+        return self.row_count
+    
+    def _load_header(self):
+        """Lit l'en-tête du stockage s'il existe et correspond au schéma"""
+        header_path = os.path.join(self.directory, HEADER_FILE)
+        try:
+            if os.path.exists(header_path):
+                with open(header_path, 'r') as f:
+                    header = json.load(f)
+                if header.get('version') == STORE_VERSION and header.get('columns') == self.schema:
+                    self.row_count = int(header.get('row_count', 0))
+                else:
+                    print(f"Stockage {self.directory} d'une autre version ou d'un autre schéma, ignoré")
+        except Exception as e:
+            print(f"Erreur lors de la lecture de l'en-tête {header_path}: {e}")
+    
+    def _write_header(self):
+        """Écrit l'en-tête du stockage (remplacement atomique du fichier)"""
+        header_path = os.path.join(self.directory, HEADER_FILE)
+        with open(header_path + '.tmp', 'w') as f:
+            json.dump({'version': STORE_VERSION, 'row_count': self.row_count, 'columns': self.schema}, f, indent=4)
+        os.replace(header_path + '.tmp', header_path)
+    
+    def _column_path(self, column):
+        return os.path.join(self.directory, f"{column}.bin")
+    
+    def reset(self):
+        """
+        Vide le stockage
+        
+        Returns:
+            bool: True si l'opération a réussi, False sinon
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for column in self.schema:
+                open(self._column_path(column), 'wb').close()
+            self.row_count = 0
+            self._write_header()
+            return True
+        except Exception as e:
+            print(f"Erreur lors de la réinitialisation du stockage {self.directory}: {e}")
+            return False
+    
+    def append(self, df):
+        """
+        Ajoute des lignes à la fin du stockage
+        
+        Les colonnes sont écrites avant l'en-tête: une écriture interrompue
+        laisse des octets au-delà du nombre de lignes valides, qui sont
+        écrasés par l'ajout suivant.
+        
+        Args:
+            df (DataFrame): Lignes à ajouter (toutes les colonnes du schéma)
+        
+        Returns:
+            bool: True si l'ajout a réussi, False sinon
+        """
+        if df.empty:
+            return True
+        try:
+            columns = {}
+            for column, dtype in self.schema.items():
+                values = df[column].to_numpy()
+                limits = np.iinfo(dtype)
+                if len(values) and (values.min() < limits.min or values.max() > limits.max):
+                    raise ValueError(f"valeurs de {column} hors de l'intervalle du type {dtype}")
+                columns[column] = values.astype(dtype, copy=False)
+            
+            os.makedirs(self.directory, exist_ok=True)
+            for column, values in columns.items():
+                path = self._column_path(column)
+                with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+                    f.seek(self.row_count * values.itemsize)
+                    f.truncate()
+                    f.write(values.tobytes())
+            
+            self.row_count += len(df)
+            self._write_header()
+            return True
+        except Exception as e:
+            print(f"Erreur lors de l'ajout au stockage {self.directory}: {e}")
+            return False
+    
+    def column(self, column, start=0, stop=None):
+        """
+        Retourne une colonne projetée en mémoire, en lecture seule
+        
+        Args:
+            column (str): Nom de la colonne
+            start (int): Première ligne
+            stop (int): Ligne de fin (exclue), None pour la dernière
+        
+        Returns:
+            ndarray: Valeurs de la colonne (sans copie)
+        """
+        dtype = np.dtype(self.schema[column])
+        stop = self.row_count if stop is None else min(stop, self.row_count)
+        if stop <= start:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(
+            self._column_path(column), dtype=dtype, mode='r',
+            offset=start * dtype.itemsize, shape=(stop - start,)
+        )
+    
+    def read(self, columns=None, start=0, stop=None):
+        """
+        Retourne les lignes du stockage sous forme de DataFrame, sans copie
+        
+        Args:
+            columns (list): Colonnes à lire (toutes par défaut)
+            start (int): Première ligne
+            stop (int): Ligne de fin (exclue), None pour la dernière
+        
+        Returns:
+            DataFrame: Colonnes projetées en mémoire
+        """
+        columns = columns or list(self.schema.keys())
+        return pd.DataFrame(
+            {column: self.column(column, start, stop) for column in columns},
+            copy=False
+        )
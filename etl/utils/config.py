@@ -9,6 +9,9 @@ import os
 import json
 from pathlib import Path
 
+# Schéma SQL de la base epiviz, à la racine du projet
+DEFAULT_SCHEMA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'epiviz.sql')
+
 class Config:
     """Classe de gestion de la configuration"""
     
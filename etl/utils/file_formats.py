@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module des formats de fichiers de sortie (CSV, Parquet, Feather)
+"""
+
+import pandas as pd
+
+# Extension des fichiers pour chaque format
+FORMAT_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.feather'
+}
+
+def write_table(df, output_path, output_format='csv', options=None):
+    """
+    Écrit un DataFrame dans le format demandé
+    
+    Les formats Parquet et Feather nécessitent pyarrow.
+    
+    Args:
+        df (DataFrame): DataFrame pandas à écrire
+        output_path (str): Chemin du fichier de sortie
+        output_format (str): 'csv', 'parquet' ou 'feather'
+        options (dict): Options du format (compression, row_group_size)
+    """
+    options = options or {}
+    if output_format == 'csv':
+        df.to_csv(output_path, index=False)
+    elif output_format == 'parquet':
+        df.to_parquet(
+            output_path,
+            index=False,
+            compression=options.get('compression', 'snappy'),
+            row_group_size=options.get('row_group_size')
+        )
+    elif output_format == 'feather':
+        df.reset_index(drop=True).to_feather(
+            output_path,
+            compression=options.get('compression', 'lz4')
+        )
+    else:
+        raise ValueError(f"Format de sortie inconnu: {output_format}")
+
+def read_table(input_path, output_format='csv'):
+    """
+    Lit un fichier écrit par write_table
+    
+    Args:
+        input_path (str): Chemin du fichier
+        output_format (str): 'csv', 'parquet' ou 'feather'
+        
+    Returns:
+        DataFrame: DataFrame pandas lu
+    """
+    if output_format == 'csv':
+        return pd.read_csv(input_path)
+    elif output_format == 'parquet':
+        return pd.read_parquet(input_path)
+    elif output_format == 'feather':
+        return pd.read_feather(input_path)
+    raise ValueError(f"Format de sortie inconnu: {output_format}")
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de suivi des fichiers sources traités pour les exécutions incrémentales
+"""
+
+import os
+import json
+import hashlib
+import pandas as pd
+
+class Manifest:
+    """Classe responsable du manifeste des fichiers sources déjà traités"""
+    
+    def __init__(self, manifest_path):
+        """
+        Initialise le manifeste
+        
+        Args:
+            manifest_path (str): Chemin du fichier JSON du manifeste
+        """
+        self.manifest_path = manifest_path
+        self.files = {}
+        self.next_data_id = 1
+        self.load()
+    
+    def load(self):
+        """
+        Charge le manifeste depuis le disque s'il existe
+        
+        Returns:
+            bool: True si un manifeste a été chargé, False sinon
+        """
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r') as f:
+                    content = json.load(f)
+                self.files = content.get('files', {})
+                self.next_data_id = content.get('next_data_id', 1)
+                return True
+        except Exception as e:
+            print(f"Erreur lors du chargement du manifeste {self.manifest_path}: {e}")
+        return False
+    
+    def save(self):
+        """
+        Sauvegarde le manifeste sur le disque
+        
+        Returns:
+            bool: True si la sauvegarde a réussi, False sinon
+        """
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path) or '.', exist_ok=True)
+            with open(self.manifest_path, 'w') as f:
+                json.dump({'files': self.files, 'next_data_id': self.next_data_id}, f, indent=4)
+            print(f"Manifeste sauvegardé: {self.manifest_path}")
+            return True
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde du manifeste {self.manifest_path}: {e}")
+            return False
+    
+    @property
+    def is_empty(self):
+        """bool: True si aucun fichier n'a encore été traité"""
+        return not self.files
+    
+    @staticmethod
+    def file_hash(file_path, block_size=1 << 20):
+        """
+        Calcule l'empreinte SHA-256 du contenu d'un fichier
+        
+        Args:
+            file_path (str): Chemin du fichier
+            block_size (int): Taille des blocs lus
+            
+        Returns:
+            str: Empreinte hexadécimale
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def has_changed(self, file_path):
+        """
+        Indique si un fichier a changé depuis la dernière exécution
+        
+        La taille et la date de modification sont comparées d'abord; le
+        contenu n'est haché que si elles diffèrent.
+        
+        Args:
+            file_path (str): Chemin du fichier
+            
+        Returns:
+            bool: True si le fichier est nouveau ou modifié
+        """
+        entry = self.files.get(os.path.basename(file_path))
+        if entry is None:
+            return True
+        
+        stat = os.stat(file_path)
+        if stat.st_size == entry.get('size') and stat.st_mtime == entry.get('mtime'):
+            return False
+        
+        if self.file_hash(file_path) == entry.get('sha256'):
+            # Contenu identique (fichier simplement touché): mise à jour des attributs
+            entry['size'] = stat.st_size
+            entry['mtime'] = stat.st_mtime
+            return False
+        return True
+    
+    def new_rows(self, file_name, df):
+        """
+        Filtre les lignes postérieures à la dernière date traitée pour chaque pays
+        
+        Args:
+            file_name (str): Nom du fichier source
+            df (DataFrame): DataFrame transformé (colonnes Date et Country/Region)
+            
+        Returns:
+            DataFrame: Lignes nouvelles uniquement
+        """
+        last_dates = self.files.get(file_name, {}).get('last_dates', {})
+        if not last_dates or 'Date' not in df.columns or 'Country/Region' not in df.columns:
+            return df
+        
+        last_seen = pd.to_datetime(df['Country/Region'].map(last_dates))
+        return df[last_seen.isna() | (df['Date'] > last_seen)]
+    
+    def record(self, file_path, df):
+        """
+        Enregistre un fichier traité et les dernières dates vues par pays
+        
+        Args:
+            file_path (str): Chemin du fichier source
+            df (DataFrame): Lignes transformées traitées lors de cette exécution
+        """
+        file_name = os.path.basename(file_path)
+        stat = os.stat(file_path)
+        entry = self.files.setdefault(file_name, {'last_dates': {}})
+        entry['size'] = stat.st_size
+        entry['mtime'] = stat.st_mtime
+        entry['sha256'] = self.file_hash(file_path)
+        
+        if df is not None and not df.empty and 'Date' in df.columns and 'Country/Region' in df.columns:
+            latest = df.groupby('Country/Region', observed=True)['Date'].max()
+            for country, date in latest.items():
+                date_str = pd.Timestamp(date).strftime('%Y-%m-%d')
+                if date_str > entry['last_dates'].get(country, ''):
+                    entry['last_dates'][country] = date_str
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de mesure des performances des étapes du pipeline ETL
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def _peak_rss_mb():
+    """
+    Retourne le pic de mémoire résidente du processus en Mo
+    
+    Returns:
+        float: Pic de mémoire en Mo, ou None si non disponible
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sur macOS et en kilo-octets sur Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+class PipelineMetrics:
+    """Classe responsable de la collecte des mesures de chaque étape du pipeline"""
+    
+    def __init__(self, profile_stages=(), trace_memory_stages=(), profile_dir='.'):
+        """
+        Initialise la collecte des mesures
+        
+        Args:
+            profile_stages (iterable): Étapes à profiler avec cProfile
+            trace_memory_stages (iterable): Étapes dont les allocations sont
+                suivies avec tracemalloc
+            profile_dir (str): Répertoire des fichiers .prof générés
+        """
+        self.profile_stages = set(profile_stages)
+        self.trace_memory_stages = set(trace_memory_stages)
+        self.profile_dir = profile_dir
+        self.started_at = datetime.now()
+        self.records = []
+    
+    @contextmanager
+    def measure(self, stage, step=None, rows_in=None):
+        """
+        Mesure une étape ou une sous-étape du pipeline
+        
+        Le temps écoulé, le temps CPU et l'augmentation du pic de mémoire
+        sont enregistrés; le nombre de lignes produites peut être renseigné
+        dans la mesure retournée (clé 'rows_out').
+        
+        Args:
+            stage (str): Nom de l'étape
+            step (str): Nom de la sous-étape (fichier, table, lot...)
+            rows_in (int): Nombre de lignes en entrée
+            
+        Yields:
+            dict: Mesure en cours
+        """
+        record = {
+            'stage': stage,
+            'step': step,
+            'rows_in': rows_in,
+            'rows_out': None
+        }
+        
+        # Profilage et suivi des allocations uniquement au niveau de l'étape
+        profiler = None
+        if step is None and stage in self.profile_stages:
+            profiler = cProfile.Profile()
+        trace_memory = step is None and stage in self.trace_memory_stages and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        
+        rss_before = _peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record['wall_time'] = time.perf_counter() - wall_start
+            record['cpu_time'] = time.process_time() - cpu_start
+            
+            rss_after = _peak_rss_mb()
+            record['peak_memory_delta_mb'] = (
+                rss_after - rss_before if rss_before is not None else None
+            )
+            if trace_memory:
+                record['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                tracemalloc.stop()
+            
+            rows = record['rows_out'] if record['rows_out'] is not None else record['rows_in']
+            record['rows_per_sec'] = (
+                rows / record['wall_time'] if rows is not None and record['wall_time'] > 0 else None
+            )
+            
+            if profiler:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profile_path = os.path.join(self.profile_dir, f"profile_{stage}.prof")
+                profiler.dump_stats(profile_path)
+                record['profile'] = profile_path
+            
+            self.records.append(record)
+    
+    def to_dict(self):
+        """
+        Retourne les mesures de l'exécution
+        
+        Returns:
+            dict: Mesures sérialisables en JSON
+        """
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'peak_rss_mb': _peak_rss_mb(),
+            'stages': self.records
+        }
+    
+    def save(self, output_dir):
+        """
+        Sauvegarde les mesures de l'exécution dans un fichier JSON
+        
+        Args:
+            output_dir (str): Répertoire de sortie
+            
+        Returns:
+            str: Chemin du fichier écrit, ou None en cas d'erreur
+        """
+        output_path = os.path.join(
+            output_dir, f"metrics_{self.started_at.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            with open(output_path, 'w') as f:
+                json.dump(self.to_dict(), f, indent=4)
+            print(f"Mesures sauvegardées: {output_path}")
+            return output_path
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde des mesures: {e}")
+            return None
+    
+    def print_summary(self):
+        """Affiche le temps et le débit de chaque étape principale"""
+        print("\nMesures par étape:")
+        for record in self.records:
+            if record['step'] is not None:
+                continue
+            throughput = f", {record['rows_per_sec']:.0f} lignes/s" if record['rows_per_sec'] else ""
+            print(f"  {record['stage']}: {record['wall_time']:.2f} s (CPU {record['cpu_time']:.2f} s){throughput}")
+
+def measure(metrics, stage, step=None, rows_in=None):
+    """
+    Mesure une étape si une collecte de mesures est fournie
+    
+    Args:
+        metrics (PipelineMetrics): Collecte des mesures (None pour ne rien mesurer)
+        stage (str): Nom de l'étape
+        step (str): Nom de la sous-étape
+        rows_in (int): Nombre de lignes en entrée
+        
+    Returns:
+        Gestionnaire de contexte produisant la mesure en cours (dict)
+    """
+    if metrics is None:
+        return nullcontext({})
+    return metrics.measure(stage, step, rows_in)
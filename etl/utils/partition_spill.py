@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de répartition des lignes en partitions écrites sur disque
+"""
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+class PartitionSpill:
+    """Classe responsable des partitions de lignes déversées sur disque"""
+    
+    def __init__(self, directory, partitions):
+        """
+        Prépare un répertoire de partitions
+        
+        Chaque groupe (une source, une étape) a un sous-répertoire par
+        partition; chaque écriture y ajoute un fichier pickle, relu dans
+        l'ordre d'écriture.
+        
+        Args:
+            directory (str): Répertoire des fichiers de partitions
+            partitions (int): Nombre de partitions
+        """
+        self.directory = directory
+        self.partitions = partitions
+        self._pieces = {}
+    
+    def partition_of(self, values):
+        """
+        Retourne la partition de chaque valeur (hachage stable d'une
+        exécution à l'autre, identique pour une même valeur quel que soit
+        son type: chaîne ou catégorie)
+        
+        Args:
+            values (Series): Valeurs de la clé de partition
+        
+        Returns:
+            ndarray: Numéro de partition de chaque valeur
+        """
+        values = pd.Series(values)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        return (hashes % np.uint64(self.partitions)).astype('int64')
+    
+    def _partition_dir(self, group, partition):
+        return os.path.join(self.directory, group, f"p{partition:04d}")
+    
+    def write(self, group, partition, df):
+        """
+        Ajoute des lignes à une partition
+        
+        Args:
+            group (str): Groupe de partitions
+            partition (int): Numéro de partition
+            df (DataFrame): Lignes à ajouter
+        """
+        if df.empty:
+            return
+        partition_dir = self._partition_dir(group, partition)
+        os.makedirs(partition_dir, exist_ok=True)
+        piece = self._pieces.get((group, partition), 0)
+        df.to_pickle(os.path.join(partition_dir, f"{piece:06d}.pkl"))
+        self._pieces[(group, partition)] = piece + 1
+    
+    def split(self, group, df, column):
+        """
+        Répartit des lignes entre les partitions selon une colonne
+        
+        Args:
+            group (str): Groupe de partitions
+            df (DataFrame): Lignes à répartir
+            column (str): Clé de partition
+        
+        Returns:
+            int: Nombre de lignes écrites
+        """
+        if df.empty:
+            return 0
+        partition_ids = self.partition_of(df[column])
+        for partition in np.unique(partition_ids):
+            self.write(group, int(partition), df[partition_ids == partition])
+        return len(df)
+    
+    def read(self, group, partition):
+        """
+        Relit toutes les lignes d'une partition, dans l'ordre d'écriture
+        
+        Args:
+            group (str): Groupe de partitions
+            partition (int): Numéro de partition
+        
+        Returns:
+            DataFrame: Lignes de la partition (vide si elle n'a rien reçu)
+        """
+        pieces = [
+            pd.read_pickle(os.path.join(self._partition_dir(group, partition), f"{piece:06d}.pkl"))
+            for piece in range(self._pieces.get((group, partition), 0))
+        ]
+        if not pieces:
+            return pd.DataFrame()
+        if len(pieces) == 1:
+            return pieces[0]
+        df = pd.concat(pieces, ignore_index=True)
+        df.attrs = pieces[0].attrs
+        return df
+    
+    def clear(self, group=None):
+        """
+        Supprime les fichiers d'un groupe (ou de tous les groupes)
+        
+        Args:
+            group (str): Groupe à supprimer (None pour tous)
+        """
+        path = self.directory if group is None else os.path.join(self.directory, group)
+        shutil.rmtree(path, ignore_errors=True)
+        self._pieces = {
+            key: count for key, count in self._pieces.items()
+            if group is not None and key[0] != group
+        }
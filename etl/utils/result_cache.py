@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module de cache des résultats des étapes du pipeline, adressé par contenu
+"""
+
+import os
+import json
+import pickle
+import hashlib
+
+# Étapes mises en cache
+CACHE_STAGES = ['raw', 'transform', 'schema']
+
+class ResultCache:
+    """Classe responsable du cache disque des résultats des étapes, borné en taille"""
+    
+    def __init__(self, directory, max_bytes=2 << 30, fingerprint=''):
+        """
+        Initialise le cache
+        
+        Chaque résultat est un fichier pickle nommé par l'empreinte de ses
+        entrées (contenu des fichiers sources, version du code et de la
+        configuration). La date d'accès des fichiers sert à évincer les
+        résultats les moins récemment utilisés au-delà de max_bytes.
+        
+        Args:
+            directory (str): Répertoire du cache
+            max_bytes (int): Taille maximale du cache en octets
+            fingerprint (str): Empreinte du code et de la configuration
+                (voir code_fingerprint), ajoutée à chaque clé
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+    
+    @staticmethod
+    def code_fingerprint(settings=None):
+        """
+        Calcule l'empreinte des sources du paquet etl et des paramètres qui
+        modifient les résultats
+        
+        Args:
+            settings (dict): Paramètres de configuration (sérialisables en JSON)
+        
+        Returns:
+            str: Empreinte hexadécimale
+        """
+        package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(package_dir):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for file_name in sorted(files):
+                if file_name.endswith('.py'):
+                    path = os.path.join(root, file_name)
+                    digest.update(os.path.relpath(path, package_dir).encode('utf-8'))
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+        digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def key(self, *parts):
+        """
+        Calcule la clé d'un résultat
+        
+        Args:
+            *parts: Éléments qui déterminent le résultat (empreintes des
+                fichiers, noms, paramètres)
+        
+        Returns:
+            str: Clé hexadécimale
+        """
+        content = json.dumps([self.fingerprint] + list(parts), sort_keys=True, default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    
+    def _path(self, stage, key):
+        return os.path.join(self.directory, stage, f"{key}.pkl")
+    
+    def get(self, stage, key):
+        """
+        Retourne un résultat du cache
+        
+        Args:
+            stage (str): Étape (raw, transform, schema)
+            key (str): Clé du résultat
+        
+        Returns:
+            Résultat enregistré, ou None s'il est absent ou illisible
+        """
+        path = self._path(stage, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            # Date d'accès pour l'éviction des résultats les plus anciens
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Résultat illisible dans le cache {path}: {e}")
+            return None
+    
+    def put(self, stage, key, value):
+        """
+        Enregistre un résultat puis évince les plus anciens si le cache
+        dépasse sa taille maximale
+        
+        Args:
+            stage (str): Étape (raw, transform, schema)
+            key (str): Clé du résultat
+            value: Résultat (DataFrame, liste ou dictionnaire de DataFrames)
+        
+        Returns:
+            bool: True si le résultat a été enregistré, False sinon
+        """
+        path = self._path(stage, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path + '.tmp', path)
+        except Exception as e:
+            print(f"Impossible d'enregistrer le résultat {stage} dans le cache: {e}")
+            return False
+        self.evict()
+        return True
+    
+    def _entries(self):
+        """
+        Liste les résultats du cache
+        
+        Returns:
+            list: Tuples (date d'accès, taille, chemin)
+        """
+        entries = []
+        for stage in CACHE_STAGES:
+            stage_dir = os.path.join(self.directory, stage)
+            if not os.path.isdir(stage_dir):
+                continue
+            for file_name in os.listdir(stage_dir):
+                if file_name.endswith('.pkl'):
+                    stat = os.stat(os.path.join(stage_dir, file_name))
+                    entries.append((stat.st_mtime_ns, stat.st_size, os.path.join(stage_dir, file_name)))
+        return entries
+    
+    def evict(self):
+        """
+        Supprime les résultats les moins récemment utilisés jusqu'à ce que
+        le cache ne dépasse plus sa taille maximale
+        
+        Returns:
+            int: Nombre de résultats supprimés
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            removed += 1
+        if removed:
+            print(f"Cache des résultats: {removed} résultats évincés")
+        return removed
+    
+    def clear(self, stage=None):
+        """
+        Vide le cache, ou les résultats d'une étape
+        
+        Args:
+            stage (str): Étape à vider (None pour toutes)
+        
+        Returns:
+            int: Nombre de résultats supprimés
+        """
+        removed = 0
+        for _, _, path in self._entries():
+            if stage is None or os.path.basename(os.path.dirname(path)) == stage:
+                os.remove(path)
+                removed += 1
+        print(f"Cache des résultats vidé ({stage or 'toutes les étapes'}): {removed} résultats supprimés")
+        return removed
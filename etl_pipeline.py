@@ -10,13 +10,7 @@ import sys
 import argparse
 import time
 
-from etl.extractors.csv_extractor import CSVExtractor
-from etl.transformers.data_transformer import DataTransformer
-from etl.transformers.schema_transformer import SchemaTransformer
-from etl.loaders.csv_loader import CSVLoader
-from etl.loaders.db_loader import DBLoader
 from etl.utils.config import Config
-from etl.pipeline.pipeline_executor import PipelineExecutor
 
 def main():
     """Fonction principale du pipeline ETL"""
@@ -25,11 +19,47 @@ def main():
     parser = argparse.ArgumentParser(description="Pipeline ETL pour les données de pandémie")
     parser.add_argument("--load-to-db", action="store_true", help="Charger les données dans la base de données")
     parser.add_argument("--config", type=str, default="config.json", help="Chemin vers le fichier de configuration")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Exécuter le pipeline par blocs de N lignes (mémoire bornée)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus pour l'extraction et la transformation des fichiers")
+    parser.add_argument("--incremental", action="store_true", help="Ne traiter que les fichiers et les dates nouveaux depuis la dernière exécution")
+    parser.add_argument("--output-format", choices=["csv", "parquet", "feather"], default=None, help="Format des tables écrites dans le répertoire de sortie")
+    parser.add_argument("--profile", action="append", default=[], metavar="ÉTAPE", help="Profiler une étape avec cProfile (extraction, transformation, schema, csv_loading, db_loading...)")
+    parser.add_argument("--trace-memory", action="append", default=[], metavar="ÉTAPE", help="Suivre les allocations d'une étape avec tracemalloc")
+    parser.add_argument("--data-store", action="store_true", help="Écrire aussi la table data dans un stockage en colonnes projeté en mémoire")
+    parser.add_argument("--rollups", action="store_true", help="Préparer aussi les tables d'agrégats (semaine, mois, continent, pandémie)")
+    parser.add_argument("--overlap", action="store_true", help="Exécuter par blocs en recouvrant lecture, transformation, écriture et chargement (threads reliés par des files bornées)")
+    parser.add_argument("--partitions", type=int, default=None, help="Exécuter le pipeline hors mémoire: lignes réparties par pays en N partitions écrites sur disque")
+    parser.add_argument("--result-cache", action="store_true", help="Réutiliser les résultats de l'extraction, de la transformation et des tables pour des fichiers inchangés")
+    parser.add_argument("--clear-cache", nargs="?", const="all", default=None, choices=["raw", "transform", "schema", "all"], help="Vider le cache des résultats (toutes les étapes ou une seule) avant l'exécution")
+    parser.add_argument("--validate", action="store_true", help="Valider les lignes transformées et écrire les lignes en infraction dans quarantine.csv")
+    parser.add_argument("--reconcile", action="store_true", help="Ne garder qu'un fait par (pays, date, pandémie) quand plusieurs sources le donnent, selon la priorité des sources")
+    parser.add_argument("--row-by-row", action="store_true", help="Construire la table data ligne par ligne (ancien traitement)")
     args = parser.parse_args()
     
+    # Les modules du pipeline (pandas, numpy...) ne sont importés qu'après
+    # l'analyse des arguments: --help reste immédiat
+    from etl.extractors.csv_extractor import CSVExtractor
+    from etl.transformers.data_transformer import DataTransformer
+    from etl.transformers.schema_transformer import SchemaTransformer
+    from etl.transformers.source_registry import SourceRegistry
+    from etl.loaders.csv_loader import CSVLoader
+    from etl.utils.manifest import Manifest
+    from etl.utils.metrics import PipelineMetrics
+    from etl.utils.result_cache import ResultCache
+    from etl.pipeline.pipeline_executor import PipelineExecutor
+    
     # Chargement de la configuration
     config_data = Config.load_config(args.config)
     
+    # Taille des blocs pour l'exécution en flux
+    chunk_size = args.chunk_size or config_data.get("chunk_size")
+    
+    # Nombre de partitions pour l'exécution hors mémoire
+    partitions = args.partitions or config_data.get("partitions")
+    
+    # Nombre de processus pour l'extraction et la transformation
+    workers = args.workers or config_data.get("workers", 1)
+    
     # Définition des chemins
     input_dir = config_data.get("input_dir", "data")
     output_dir = config_data.get("output_dir", "processed")
@@ -50,11 +80,84 @@ def main():
     
     print(f"Fichiers d'entrée: {', '.join(os.path.basename(f) for f in input_files)}")
     
+    # Collecte des mesures de chaque étape
+    metrics = PipelineMetrics(
+        profile_stages=args.profile or config_data.get("profile_stages", []),
+        trace_memory_stages=args.trace_memory or config_data.get("trace_memory_stages", []),
+        profile_dir=output_dir
+    )
+    
     # Initialisation des composants du pipeline
-    extractor = CSVExtractor()
-    transformer = DataTransformer()
-    schema_transformer = SchemaTransformer()
-    csv_loader = CSVLoader()
+    registry = SourceRegistry(config_data.get("sources"))
+    transformer = DataTransformer(
+        clip_negative_corrections=config_data.get("clip_negative_corrections", True),
+        registry=registry
+    )
+    extractor = CSVExtractor(
+        cache_dir=config_data.get("cache_dir"),
+        schema_provider=transformer.get_read_schema
+    )
+    rollups = args.rollups or config_data.get("rollups", False)
+    
+    # Réconciliation des sources (clé reconciliation: true, ou dictionnaire
+    # precedence, rule)
+    reconciler = None
+    reconciliation = config_data.get("reconciliation")
+    if args.reconcile or reconciliation:
+        from etl.transformers.reconciliation import SourceReconciler
+        settings = reconciliation if isinstance(reconciliation, dict) else {}
+        reconciler = SourceReconciler(
+            precedence=settings.get("precedence"),
+            rule=settings.get("rule", "precedence"),
+            registry=registry
+        )
+        if reconciler.rule == "max" and (chunk_size or partitions or args.overlap or config_data.get("overlap")):
+            print("La règle 'max' ne s'applique qu'en exécution complète ou incrémentale: les modes par blocs et hors mémoire conservent le fait de la source prioritaire")
+    
+    schema_transformer = SchemaTransformer(
+        vectorized=not args.row_by_row, metrics=metrics, rollups=rollups, registry=registry,
+        compact=config_data.get("compact_tables", True), reconciler=reconciler
+    )
+    output_format = args.output_format or config_data.get("output_format", "csv")
+    data_store = args.data_store or config_data.get("data_store", False)
+    csv_loader = CSVLoader(output_format, config_data.get(output_format, {}), data_store=data_store)
+    overlap = args.overlap or config_data.get("overlap", False)
+    if output_format != "csv" and (chunk_size or partitions or overlap or args.incremental or config_data.get("incremental")):
+        print("Les modes par blocs, hors mémoire et incrémental écrivent les tables au format CSV")
+    if rollups and not partitions and (chunk_size or overlap or args.incremental or config_data.get("incremental")):
+        print("Les tables d'agrégats ne sont préparées qu'en exécution complète ou hors mémoire, sans blocs ni mode incrémental")
+    
+    # Cache des résultats, adressé par le contenu des fichiers et la version du code
+    result_cache = None
+    result_cache_dir = config_data.get("result_cache_dir") or os.path.join(output_dir, "result_cache")
+    if args.result_cache or config_data.get("result_cache_dir") or args.clear_cache:
+        result_cache = ResultCache(
+            result_cache_dir,
+            max_bytes=int(config_data.get("result_cache_max_mb", 2048)) * 1024 * 1024,
+            fingerprint=ResultCache.code_fingerprint({
+                "clip_negative_corrections": config_data.get("clip_negative_corrections", True),
+                "sources": config_data.get("sources")
+            })
+        )
+        if args.clear_cache:
+            result_cache.clear(None if args.clear_cache == "all" else args.clear_cache)
+        if not (args.result_cache or config_data.get("result_cache_dir")):
+            result_cache = None
+    
+    # Validation des lignes transformées (clé validation: true, ou dictionnaire
+    # rules, min_date, max_date, known_countries)
+    validator = None
+    validation = config_data.get("validation")
+    if args.validate or validation:
+        from etl.transformers.data_validator import DataValidator, DEFAULT_MIN_DATE
+        settings = validation if isinstance(validation, dict) else {}
+        validator = DataValidator(
+            rules=settings.get("rules"),
+            min_date=settings.get("min_date", DEFAULT_MIN_DATE),
+            max_date=settings.get("max_date"),
+            known_countries=settings.get("known_countries"),
+            registry=registry
+        )
     
     # Initialisation du chargeur de base de données si nécessaire
     db_loader = None
@@ -63,7 +166,9 @@ def main():
         if not db_config:
             print("Configuration de la base de données manquante")
             return
-        db_loader = DBLoader(db_config)
+        # mysql.connector n'est importé que pour le chargement en base
+        from etl.loaders.db_loader import DBLoader
+        db_loader = DBLoader(db_config, metrics=metrics)
     
     # Initialisation de l'exécuteur du pipeline
     pipeline = PipelineExecutor(
@@ -71,12 +176,25 @@ def main():
         transformer, 
         schema_transformer, 
         csv_loader, 
-        db_loader
+        db_loader,
+        workers=workers,
+        metrics=metrics,
+        result_cache=result_cache,
+        overlap=overlap,
+        queue_size=config_data.get("queue_size", 4),
+        validator=validator
     )
     
     # Exécution du pipeline
     start_time = time.time()
-    results = pipeline.run(input_files, output_dir, args.load_to_db)
+    if args.incremental or config_data.get("incremental"):
+        manifest = Manifest(os.path.join(output_dir, "manifest.json"))
+        results = pipeline.run_incremental(input_files, output_dir, args.load_to_db, manifest)
+    else:
+        results = pipeline.run(
+            input_files, output_dir, args.load_to_db, chunk_size=chunk_size,
+            partitions=partitions, spill_dir=config_data.get("spill_dir")
+        )
     end_time = time.time()
     
     # Affichage des résultats
@@ -85,6 +203,11 @@ def main():
     print(f"Lignes extraites: {results['extraction']}")
     print(f"Lignes transformées: {results['transformation']}")
     
+    if 'validation' in results:
+        print(f"Lignes mises en quarantaine: {results['validation']['quarantined']}")
+    if 'reconciliation' in results:
+        print(f"Faits en double retirés: {results['reconciliation']['duplicates']}")
+    
     print("\nTables préparées:")
     for table, count in results['schema'].items():
         print(f"  {table}: {count} lignes")
@@ -98,6 +221,9 @@ def main():
         for table, count in results['db_loading'].items():
             print(f"  {table}: {count} lignes")
     
+    metrics.print_summary()
+    metrics.save(output_dir)
+    
     print("\nPipeline ETL terminé avec succès!")
 
 if __name__ == "__main__":